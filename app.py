@@ -6,21 +6,173 @@ CV analizi + AI feedback botu.
 
 import streamlit as st
 import re
-import io
-from collections import Counter
+import os
+import json
+import hashlib
+import random
+import time
+import sys
+import uuid
+import logging
+import threading
+import functools
+import atexit
+import itertools
+import contextlib
+import difflib
+import marshal
+import mmap
+import struct
+import bisect
+import html
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from groq import Groq
 
-try:
-    import pdfplumber
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
+from ayristirma import (
+    PDF_SUPPORT, DOCX_SUPPORT, AyristirmaHavuzu, AyristirmaHatasi, pdf_metni, docx_metni,
+)
 
 try:
-    from docx import Document
-    DOCX_SUPPORT = True
+    import yaml
+    YAML_SUPPORT = True
 except ImportError:
-    DOCX_SUPPORT = False
+    YAML_SUPPORT = False
+
+
+# ── OLCUM / METRIKLER ──
+# ATS_OLCUM=1 ile acilir; kapaliyken olcum() paylasilan bos context doner.
+# ATS_METRIK_DOSYASI verilirse Prometheus metni her ATS_METRIK_ARALIK_SN'de bu
+# dosyaya yazilir (node_exporter textfile collector ya da sidecar icin).
+OLCUM_AKTIF = os.environ.get("ATS_OLCUM", "") == "1"
+METRIK_DOSYASI = os.environ.get("ATS_METRIK_DOSYASI", "")
+METRIK_ARALIK_SN = float(os.environ.get("ATS_METRIK_ARALIK_SN", "15"))
+_BOS_OLCUM = contextlib.nullcontext()
+log = logging.getLogger("ats_cv")
+
+
+class MetrikKaydi:
+    """Surec genelinde asama sureleri ve sayaclar (thread-safe)."""
+
+    def __init__(self):
+        self.kilit = threading.Lock()
+        self.sureler = {}  # asama -> [adet, toplam_sn, max_sn]
+        self.sayaclar = Counter()
+
+    def sure_ekle(self, asama, saniye):
+        with self.kilit:
+            kayit = self.sureler.setdefault(asama, [0, 0.0, 0.0])
+            kayit[0] += 1
+            kayit[1] += saniye
+            kayit[2] = max(kayit[2], saniye)
+
+    def sayac_ekle(self, ad, n=1):
+        with self.kilit:
+            self.sayaclar[ad] += n
+
+    def ozet(self):
+        with self.kilit:
+            return {
+                "sureler": {
+                    a: {"adet": k[0], "toplam_ms": round(k[1] * 1000, 2),
+                        "ort_ms": round(k[1] * 1000 / k[0], 2), "max_ms": round(k[2] * 1000, 2)}
+                    for a, k in self.sureler.items()
+                },
+                "sayaclar": dict(self.sayaclar),
+            }
+
+    def prometheus(self):
+        """Prometheus text exposition formatinda cikti."""
+        with self.kilit:
+            satirlar = [
+                "# HELP ats_asama_saniye Asama basina gecen sure (saniye).",
+                "# TYPE ats_asama_saniye summary",
+            ]
+            for asama, (adet, toplam, _) in sorted(self.sureler.items()):
+                satirlar.append(f'ats_asama_saniye_count{{asama="{asama}"}} {adet}')
+                satirlar.append(f'ats_asama_saniye_sum{{asama="{asama}"}} {toplam:.6f}')
+            satirlar.append("# HELP ats_asama_saniye_max Asama basina en uzun sure (saniye).")
+            satirlar.append("# TYPE ats_asama_saniye_max gauge")
+            for asama, (_, _, en_uzun) in sorted(self.sureler.items()):
+                satirlar.append(f'ats_asama_saniye_max{{asama="{asama}"}} {en_uzun:.6f}')
+            for ad, deger in sorted(self.sayaclar.items()):
+                satirlar.append(f"# TYPE ats_{ad}_total counter")
+                satirlar.append(f"ats_{ad}_total {deger}")
+            return "\n".join(satirlar) + "\n"
+
+    def dosyaya_yaz(self, yol):
+        """Prometheus metnini dosyaya yaz; okuyan yarim dosya gormesin diye tmp + replace."""
+        gecici = f"{yol}.{os.getpid()}.tmp"
+        try:
+            with open(gecici, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+            os.replace(gecici, yol)
+        except OSError as e:
+            log.warning("Metrik dosyasi yazilamadi: %s", e)
+
+    def sifirla(self):
+        with self.kilit:
+            self.sureler.clear()
+            self.sayaclar.clear()
+
+
+@st.cache_resource
+def metrik_kaydi():
+    """Tum oturumlarin paylastigi tek metrik kaydi."""
+    if OLCUM_AKTIF and not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+    kayit = MetrikKaydi()
+    if OLCUM_AKTIF and METRIK_DOSYASI:
+        def yazici():
+            while True:
+                kayit.dosyaya_yaz(METRIK_DOSYASI)
+                time.sleep(METRIK_ARALIK_SN)
+        threading.Thread(target=yazici, daemon=True, name="ats_metrik_dosyasi").start()
+        atexit.register(kayit.dosyaya_yaz, METRIK_DOSYASI)
+    return kayit
+
+
+@contextlib.contextmanager
+def _olcum_aktif(asama):
+    baslangic = time.perf_counter()
+    try:
+        yield
+    finally:
+        sure = time.perf_counter() - baslangic
+        metrik_kaydi().sure_ekle(asama, sure)
+        log.info(json.dumps({"olay": "asama", "asama": asama, "sure_ms": round(sure * 1000, 3)}))
+
+
+def olcum(asama):
+    """Bir kod blogunun suresini olc: `with olcum("dosya_okuma"): ...`"""
+    if not OLCUM_AKTIF:
+        return _BOS_OLCUM
+    return _olcum_aktif(asama)
+
+
+def olculu(asama=None):
+    """Fonksiyon suresini olcen decorator. Kapaliyken dogrudan cagirir."""
+    def sarici(fonk):
+        ad = asama or fonk.__name__
+
+        @functools.wraps(fonk)
+        def olculen(*args, **kwargs):
+            if not OLCUM_AKTIF:
+                return fonk(*args, **kwargs)
+            with _olcum_aktif(ad):
+                return fonk(*args, **kwargs)
+        return olculen
+    return sarici
+
+
+def sayac(ad, n=1):
+    """Sayaci artir (onbellek_isabet, token, sayfa vb.)."""
+    if OLCUM_AKTIF:
+        metrik_kaydi().sayac_ekle(ad, n)
 
 
 def get_groq_client():
@@ -29,37 +181,99 @@ def get_groq_client():
     return Groq(api_key=api_key)
 
 
+@olculu()
 def parse_pdf(file_bytes):
     if not PDF_SUPPORT:
         st.error("pdfplumber yuklu degil.")
         return ""
-    text_parts = []
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        for page in pdf.pages:
-            t = page.extract_text()
-            if t:
-                text_parts.append(t)
-    return "\n".join(text_parts)
+    metin, sayfa = pdf_metni(file_bytes)
+    sayac("pdf_sayfa", sayfa)
+    return metin
 
 
+@olculu()
 def parse_docx(file_bytes):
     if not DOCX_SUPPORT:
         st.error("python-docx yuklu degil.")
         return ""
-    doc = Document(io.BytesIO(file_bytes))
-    return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+    return docx_metni(file_bytes)[0]
+
+
+# ── BELGE AYRISTIRMA HAVUZU ──
+# Yuklemeler ayri, kaynak sinirli sureclerde ayristirilir (bkz. ayristirma.py):
+# bozuk / devasa bir PDF sadece kendi surecini oldurur, oturumlari dondurmaz.
+# ATS_AYRISTIRMA_ISCI=0 ile eski davranis (ayni surecte ayristirma). POSIX disinda
+# CPU / bellek limitleri uygulanamadigindan varsayilan 0.
+AYRISTIRMA_ISCI = int(os.environ.get("ATS_AYRISTIRMA_ISCI", "2" if os.name == "posix" else "0"))
+AYRISTIRMA_CPU_SN = int(os.environ.get("ATS_AYRISTIRMA_CPU_SN", "10"))
+AYRISTIRMA_SURE_SN = float(os.environ.get("ATS_AYRISTIRMA_SURE_SN", "20"))
+AYRISTIRMA_BELLEK_MB = int(os.environ.get("ATS_AYRISTIRMA_BELLEK_MB", "512"))
+# Bos surec beklerken kuyrukta gecebilecek en uzun sure; asilirsa "mesgul"
+AYRISTIRMA_KUYRUK_SN = float(os.environ.get("ATS_AYRISTIRMA_KUYRUK_SN", "60"))
+MAX_YUKLEME_MB = float(os.environ.get("ATS_MAX_YUKLEME_MB", "10"))  # .streamlit/config.toml ile ayni
+
+AYRISTIRMA_HATALARI = {
+    "mesgul": ("Sunucu su an cok yogun, lutfen birazdan tekrar deneyin.",
+               "The server is busy, please try again shortly."),
+    "zaman_asimi": ("Dosya {sn:.0f} sn icinde okunamadi; daha sade bir PDF/DOCX deneyin.",
+                    "The file could not be read within {sn:.0f} s; try a simpler PDF/DOCX."),
+    "cpu": ("Dosya okunamadi: islem sinirini asti. Daha sade bir PDF/DOCX deneyin.",
+            "The file could not be read: processing limit exceeded. Try a simpler PDF/DOCX."),
+    "bellek": ("Dosya okunamadi: bellek sinirini asti. Daha kucuk bir dosya deneyin.",
+               "The file could not be read: memory limit exceeded. Try a smaller file."),
+    "cokme": ("Dosya okunurken hata olustu, lutfen tekrar deneyin.",
+              "An error occurred while reading the file, please try again."),
+    "bozuk": ("Dosya bozuk ya da desteklenmeyen bir bicimde.",
+              "The file is corrupt or in an unsupported format."),
+}
+
 
+@st.cache_resource
+def ayristirma_havuzu():
+    """Tum oturumlarin paylastigi on-isitilmis ayristirma surecleri; kapaliysa None."""
+    if AYRISTIRMA_ISCI <= 0:
+        return None
+    havuz = AyristirmaHavuzu(isci=AYRISTIRMA_ISCI, cpu_sn=AYRISTIRMA_CPU_SN, sure_sn=AYRISTIRMA_SURE_SN,
+                             bellek_mb=AYRISTIRMA_BELLEK_MB, kuyruk_sn=AYRISTIRMA_KUYRUK_SN)
+    atexit.register(havuz.kapat)
+    return havuz
 
-def extract_text_from_upload(uploaded_file):
-    file_bytes = uploaded_file.read()
+
+def extract_text_from_upload(uploaded_file, tr=True):
+    # Boyut kontrolu okumadan once: UploadedFile.size bellege kopyalamaz
+    if uploaded_file.size > MAX_YUKLEME_MB * 2 ** 20:
+        sayac("yukleme_reddedildi")
+        st.error(f"Dosya cok buyuk (en fazla {MAX_YUKLEME_MB:g} MB)." if tr
+                 else f"File is too large (max {MAX_YUKLEME_MB:g} MB).")
+        return ""
     name = uploaded_file.name.lower()
     if name.endswith(".pdf"):
-        return parse_pdf(file_bytes)
+        tur, destek = "pdf", PDF_SUPPORT
     elif name.endswith(".docx"):
-        return parse_docx(file_bytes)
+        tur, destek = "docx", DOCX_SUPPORT
     else:
         st.error("Desteklenmeyen dosya turu.")
         return ""
+    with olcum("dosya_okuma"):
+        file_bytes = uploaded_file.read()
+    sayac("yuklenen_bayt", len(file_bytes))
+    havuz = ayristirma_havuzu()
+    if havuz is None or not destek:
+        return parse_pdf(file_bytes) if tur == "pdf" else parse_docx(file_bytes)
+    try:
+        sonuc = havuz.ayristir(tur, file_bytes)
+    except AyristirmaHatasi as e:
+        sayac(f"ayristirma_{e.neden}")
+        log.warning(json.dumps({"olay": "ayristirma_hatasi", "tur": tur, "hata": str(e)}))
+        st.error(AYRISTIRMA_HATALARI[e.neden][0 if tr else 1].format(sn=AYRISTIRMA_SURE_SN))
+        return ""
+    if OLCUM_AKTIF:
+        kayit = metrik_kaydi()
+        kayit.sure_ekle("ayristirma_kuyruk", sonuc["kuyruk_sn"])
+        kayit.sure_ekle(f"ayristirma_{tur}", sonuc["sure_sn"])
+    if tur == "pdf":
+        sayac("pdf_sayfa", sonuc["sayfa"])
+    return sonuc["metin"]
 
 
 def temizle(text):
@@ -68,70 +282,209 @@ def temizle(text):
     return text
 
 
-# ── ESANLAMLI KELIME SOZLUGU (Turkce/Ingilizce capraz eslesme) ──
-ESANLAMLILAR = {
-    # Satis / Sales
-    "satis": ["sales", "selling", "musteri temsilcisi", "saha satis", "pazarlama", "magaza"],
-    "sales": ["satis", "musteri temsilcisi", "saha satis", "pazarlama", "selling"],
-    # Yonetim / Management
-    "yonetim": ["management", "liderlik", "supervisor", "team lead", "takim lideri", "koordinasyon"],
-    "management": ["yonetim", "liderlik", "koordinasyon", "takim lideri"],
-    "leadership": ["liderlik", "yonetim", "takim lideri", "koordinasyon"],
-    # Iletisim / Communication
-    "iletisim": ["communication", "diksiyon", "sunum", "presentation", "gorusme"],
-    "communication": ["iletisim", "diksiyon", "sunum", "gorusme"],
-    # Musteri / Customer
-    "musteri": ["customer", "client", "memnuniyet", "satisfaction", "iliskiler"],
-    "customer": ["musteri", "client", "memnuniyet", "iliskiler"],
-    # Ekip / Team
-    "ekip": ["team", "takim", "group", "calisma grubu"],
-    "team": ["ekip", "takim", "grup"],
-    # Deneyim / Experience
-    "deneyim": ["experience", "tecrube", "gecmis", "background"],
-    "experience": ["deneyim", "tecrube", "gecmis"],
-    # Ehliyet / License
-    "ehliyet": ["license", "surucubelgesi", "b sinifi", "arac kullanimi", "driving"],
-    "driving": ["ehliyet", "surucubelgesi", "b sinifi"],
-    # Bilgisayar / Computer
-    "bilgisayar": ["computer", "ms office", "excel", "word", "yazilim", "software"],
-    "computer": ["bilgisayar", "ms office", "yazilim"],
-    # Egitim / Education
-    "egitim": ["education", "training", "lisans", "mezuniyet", "okul"],
-    "education": ["egitim", "lisans", "mezuniyet", "okul"],
-    # Sorumluluk / Responsibility
-    "sorumluluk": ["responsibility", "gorev", "yukumluluk", "accountability"],
-    "responsibility": ["sorumluluk", "gorev", "yukumluluk"],
-    # Hedef / Target
-    "hedef": ["target", "goal", "kpi", "performans", "basari"],
-    "target": ["hedef", "goal", "kpi", "performans"],
-    # Insan iliskileri
-    "insan": ["people", "interpersonal", "iletisim", "iliskiler"],
-    "interpersonal": ["insan iliskileri", "iletisim", "sosyal"],
-    # Askerlik
-    "askerlik": ["military", "tecilli", "muaf", "tamamlandi"],
-    # Ikna
-    "ikna": ["persuasion", "negotiation", "musteri kazanma", "pazarlama"],
-}
+# ── ANAHTAR KELIME VERI PAKETI ──
+# Esanlamlilar, sektor keyword'leri, stopword / genel kelime / guclu fiil listeleri
+# veri/anahtar_kelimeler.json (veya .yaml) icinde surumlenir. Kaynak bir kez
+# donmus yapilara derlenip .paket dosyasina yazilir; sonraki yuklemeler bu dosyayi
+# mmap ile okur. Dosya degisince yeni surum yeniden baslatmadan devreye girer.
+# Not: bugunku ~4 KB'lik kaynakta derlenmis paketi okumak (kaynak sha1 kontrolu
+# dahil), kaynagi json ile okuyup kurmaktan sadece ~1-1.4 kat hizli; ikisi de
+# ~50 us ve paket kontrol araliginda bir kez yuklenir. Derleme kazanci ancak
+# kaynak buyudukce anlamli olur. Paket ilk veri_paketi() cagrisinda yuklenir;
+# derlenmis paket bozuksa kaynaktan bellekte kurulur, kaynak bozuksa son
+# derlenmis paket kullanilir.
+PAKET_KAYNAK = os.environ.get(
+    "ATS_VERI_PAKETI",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri", "anahtar_kelimeler.json"),
+)
+PAKET_KONTROL_SN = float(os.environ.get("ATS_PAKET_KONTROL_SN", "2"))
+PAKET_SIHIR = b"ATSPAKET"
+PAKET_FORMAT = 1
+# sihir, paket formati, marshal surumu, govde uzunlugu, kaynak sha1
+_PAKET_BASLIK = struct.Struct("<8sHHI20s")
+PAKET_ALANLARI = ("surum", "esanlamlilar", "sektor_keywordleri", "stopwords", "genel_kelimeler", "guclu_fiiller")
+
+
+def paket_yolu(kaynak):
+    """Kaynak paketin derlenmis dosya yolu."""
+    return os.path.splitext(kaynak)[0] + ".paket"
+
+
+def paket_kaynagi_oku(yol):
+    """JSON/YAML kaynak paketi oku; (veri, kaynak_sha1) dondurur."""
+    with open(yol, "rb") as f:
+        ham = f.read()
+    if yol.endswith((".yaml", ".yml")):
+        if not YAML_SUPPORT:
+            raise RuntimeError("YAML paketler icin PyYAML gerekli: pip install pyyaml")
+        veri = yaml.safe_load(ham)
+    else:
+        veri = json.loads(ham)
+    return veri, hashlib.sha1(ham).digest()
 
-# ── SEKTORE OZEL KEYWORD LISTESI ──
-SEKTOR_KEYWORDLERI = {
-    "satis": ["satis hedefi", "musteri portfoyu", "kota", "pipeline", "crm", "teklif", "sozlesme",
-              "b2b", "b2c", "saha ziyareti", "demo", "pitch", "komisyon"],
-    "it": ["python", "java", "sql", "api", "cloud", "aws", "docker", "git", "agile", "scrum",
-           "javascript", "react", "backend", "frontend", "database"],
-    "finans": ["muhasebe", "butce", "mali", "vergi", "bilanço", "excel", "erp", "sap", "fatura"],
-    "insan_kaynaklari": ["ik", "isveren", "isveren markasi", "isseveran", "bordro", "performans",
-                         "oryantasyon", "sgk", "is hukuku"],
-    "pazarlama": ["sosyal medya", "seo", "dijital", "kampanya", "marka", "analitik", "google ads",
-                  "instagram", "linkedin", "icerik"],
-}
+
+def paket_olustur(veri, kaynak_hash):
+    """Kaynak veriden eslesmede kullanilan donmus yapilari kur."""
+    eksik_alanlar = [a for a in PAKET_ALANLARI if a not in veri]
+    if eksik_alanlar:
+        raise ValueError(f"Veri paketinde eksik alanlar: {', '.join(eksik_alanlar)}")
+    return {
+        "surum": veri["surum"],
+        "kimlik": f"{veri['surum']}-{kaynak_hash.hex()[:8]}",
+        "esanlamlilar": {k: tuple(v) for k, v in veri["esanlamlilar"].items()},
+        # Liste sirasi korunur: sektor eksikleri ilk 5 ile sinirlanir
+        "sektor_keywordleri": {k: tuple(v) for k, v in veri["sektor_keywordleri"].items()},
+        "stopwords": frozenset(veri["stopwords"]),
+        "genel_kelimeler": frozenset(veri["genel_kelimeler"]),
+        "guclu_fiiller": tuple(veri["guclu_fiiller"]),
+    }
+
+
+def paket_derle(kaynak, hedef=None):
+    """Kaynak paketi derleyip hedef dosyaya atomik olarak yaz."""
+    veri, kaynak_hash = paket_kaynagi_oku(kaynak)
+    govde = marshal.dumps(paket_olustur(veri, kaynak_hash))
+    hedef = hedef or paket_yolu(kaynak)
+    gecici = f"{hedef}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(gecici, "wb") as f:
+        f.write(_PAKET_BASLIK.pack(PAKET_SIHIR, PAKET_FORMAT, marshal.version, len(govde), kaynak_hash))
+        f.write(govde)
+    os.replace(gecici, hedef)
+    return hedef
+
+
+def kaynak_hash(yol):
+    """Kaynak paket dosyasinin sha1'i (paket basligindakiyle karsilastirmak icin)."""
+    with open(yol, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def paket_yukle(yol, beklenen_hash=None):
+    """Derlenmis paketi mmap ile oku; bozuk, uyumsuz ya da beklenen kaynaktan
+    derlenmemisse ValueError."""
+    with open(yol, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _PAKET_BASLIK.size:
+            raise ValueError(f"Gecersiz paket: {yol}")
+        sihir, format_, marshal_surum, uzunluk, paket_hash = _PAKET_BASLIK.unpack_from(mm)
+        if sihir != PAKET_SIHIR or format_ != PAKET_FORMAT or marshal_surum != marshal.version:
+            raise ValueError(f"Uyumsuz paket: {yol}")
+        if beklenen_hash is not None and paket_hash != beklenen_hash:
+            raise ValueError(f"Eski paket: {yol}")
+        with memoryview(mm) as mv:
+            try:
+                return marshal.loads(mv[_PAKET_BASLIK.size:_PAKET_BASLIK.size + uzunluk])
+            except (EOFError, TypeError) as e:
+                raise ValueError(f"Bozuk paket: {yol}") from e
+
+
+class VeriPaketDeposu:
+    """Guncel paketi tutar; dosyalar degisince yeniden derleyip atomik olarak degistirir.
+
+    Kontrol en fazla kontrol_araligi saniyede bir yapilir (os.stat); dosyalar
+    degismisse derlenmis paketin basligindaki kaynak sha1'i kaynagin icerigiyle
+    karsilastirilir. Yeni surum yuklenemezse eskisi kullanilmaya devam eder.
+    """
+
+    def __init__(self, kaynak=PAKET_KAYNAK, kontrol_araligi=PAKET_KONTROL_SN):
+        self.kaynak = kaynak
+        self.derlenmis = paket_yolu(kaynak)
+        self.kontrol_araligi = kontrol_araligi
+        self._kilit = threading.Lock()
+        self._paket = None
+        self._imza = None
+        self._sonraki_kontrol = 0.0
+        self.yukleme = 0
+        self.son_hata = None
+
+    @staticmethod
+    def _dosya_imzasi(yol):
+        try:
+            bilgi = os.stat(yol)
+        except OSError:
+            return None
+        return bilgi.st_mtime_ns, bilgi.st_size, bilgi.st_ino
+
+    def guncel(self):
+        """Guncel paket (dict)."""
+        if time.monotonic() < self._sonraki_kontrol:
+            return self._paket
+        with self._kilit:
+            if time.monotonic() >= self._sonraki_kontrol:
+                self._kontrol_et()
+                self._sonraki_kontrol = time.monotonic() + self.kontrol_araligi
+        return self._paket
+
+    def _kontrol_et(self):
+        kaynak, derlenmis = self._dosya_imzasi(self.kaynak), self._dosya_imzasi(self.derlenmis)
+        if self._paket is not None and (kaynak, derlenmis) == self._imza:
+            return
+        try:
+            with olcum("paket_yukleme"):
+                paket = self._yukle(kaynak, derlenmis)
+        except Exception as e:
+            if self._paket is None:
+                raise
+            self.son_hata = str(e)
+            log.warning("Veri paketi yuklenemedi, %s kullanilmaya devam ediyor: %s", self._paket["kimlik"], e)
+        else:
+            # Tek atama: okuyucular ya eski ya yeni paketin tamamini gorur
+            self._paket = paket
+            self.yukleme += 1
+            self.son_hata = None
+            log.info("Veri paketi yuklendi: %s", paket["kimlik"])
+        self._imza = (self._dosya_imzasi(self.kaynak), self._dosya_imzasi(self.derlenmis))
+
+    def _yukle(self, kaynak, derlenmis):
+        # Derlenmis paket kaynagin guncel icerigiyle derlendiyse dogrudan kullan (ya da
+        # sadece paket dagitilmis). mtime'a guvenilmez: cp -p / rsync -t eski zaman tasir.
+        if derlenmis is not None:
+            try:
+                return paket_yukle(self.derlenmis, None if kaynak is None else kaynak_hash(self.kaynak))
+            except ValueError:
+                if kaynak is None:
+                    raise
+        if kaynak is None:
+            raise FileNotFoundError(self.kaynak)
+        try:
+            paket = paket_olustur(*paket_kaynagi_oku(self.kaynak))
+        except Exception as e:
+            # Kaynak bozuk: eski kaynaktan derlenmis paket varsa onunla devam et
+            if derlenmis is None:
+                raise
+            log.warning("Veri paketi kaynagi okunamadi (%s), derlenmis paket kullaniliyor", e)
+            return paket_yukle(self.derlenmis)
+        try:
+            paket_derle(self.kaynak, self.derlenmis)
+        except (OSError, ValueError) as e:
+            # Salt okunur dizin vb.: kaynaktan bellekte kurulan paketle devam et
+            log.warning("Veri paketi derlenemedi (%s), kaynaktan yuklendi", e)
+        return paket
+
+    def istatistik(self):
+        paket = self._paket or {}
+        return {"kimlik": paket.get("kimlik"), "kaynak": self.kaynak,
+                "yukleme": self.yukleme, "son_hata": self.son_hata}
+
+
+@st.cache_resource
+def veri_paket_deposu():
+    return VeriPaketDeposu(PAKET_KAYNAK)
+
+
+# Betik her calismada bir kez baglanir; cache_resource cagrisi sicak yol icin pahali
+_VERI_DEPOSU = veri_paket_deposu()
+
+
+def veri_paketi():
+    """Guncel anahtar kelime paketi."""
+    return _VERI_DEPOSU.guncel()
 
 
 def sektor_tespit(jd_text):
     """Is ilanindaki sektoru tespit et."""
     text = jd_text.lower()
     skor = {}
-    for sektor, kelimeler in SEKTOR_KEYWORDLERI.items():
+    for sektor, kelimeler in veri_paketi()["sektor_keywordleri"].items():
         skor[sektor] = sum(1 for k in kelimeler if k in text)
     en_iyi = max(skor, key=skor.get)
     return en_iyi if skor[en_iyi] > 0 else None
@@ -139,10 +492,11 @@ def sektor_tespit(jd_text):
 
 def esanlamli_genislet(kelimeler_seti):
     """Verilen kelime setini esanlamlilariyla genislet."""
+    esanlamlilar = veri_paketi()["esanlamlilar"]
     genisletilmis = set(kelimeler_seti)
     for kelime in list(kelimeler_seti):
-        if kelime in ESANLAMLILAR:
-            genisletilmis.update(ESANLAMLILAR[kelime])
+        if kelime in esanlamlilar:
+            genisletilmis.update(esanlamlilar[kelime])
     return genisletilmis
 
 
@@ -158,44 +512,218 @@ def bigram_cikar(text):
 
 
 def kelimeleri_cikar(text):
-    stopwords = {
-        've', 'veya', 'ile', 'bir', 'bu', 'da', 'de', 'icin', 'olan',
-        'the', 'and', 'or', 'is', 'in', 'at', 'of', 'to', 'a', 'an',
-        'for', 'on', 'with', 'as', 'by', 'be', 'are', 'was', 'were',
-        'that', 'this', 'it', 'we', 'you', 'he', 'she', 'they', 'have',
-        'has', 'had', 'will', 'would', 'can', 'could', 'should', 'may',
-        'might', 'must', 'shall', 'do', 'does', 'did', 'not', 'but',
-        'if', 'then', 'than', 'so', 'from', 'up', 'about', 'into',
-        'olan', 'icin', 'veya', 'ile', 'her', 'daha', 'cok', 'gibi',
-        'olan', 'olarak', 'olan', 'olmak', 'sahip', 'aranan'
-    }
     kelimeler = temizle(text).split()
+    stopwords = veri_paketi()["stopwords"]
     return [k for k in kelimeler if len(k) > 2 and k not in stopwords]
 
 
-def bolum_tespit(cv_text):
-    text_lower = cv_text.lower()
+# ── TOKEN KONUM INDEKSI ──
+# CV tek gecisle token'lanir; her token'in orijinal metindeki karakter araligi
+# dizilerde tutulur. Kelime / bigram setleri, vurgulu CV, bolum yogunlugu ve
+# LLM baglam secimi ayni indeksten uretilir, metin yeniden taranmaz.
+_TOKEN = re.compile(r"\w+")
+ISABET_KELIME, ISABET_ESANLAMLI, ISABET_BIGRAM = 0, 1, 2
+
+
+class KonumIndeksi:
+    """Token dizisi temizle(text).split() ile aynidir.
+
+    sozluk: token -> kimlik. kimlikler[i], baslangic[i], bitis[i]: i. token'in
+    kimligi ve metindeki [baslangic, bitis) araligi (array("I")).
+    """
+
+    __slots__ = ("metin", "sozluk", "kelimeler", "kimlikler", "baslangic", "bitis")
+
+    def __init__(self, text):
+        self.metin = text
+        kucuk = text.lower()
+        if len(kucuk) == len(text):
+            # Hizli yol (C seviyesinde): token'lar findall, araliklar ayiricilarin
+            # ve token'larin uzunluklarinin kumulatif toplami
+            tokenler = _TOKEN.findall(kucuk)
+            uzunluklar = [0] * (2 * len(tokenler))
+            uzunluklar[0::2] = map(len, _TOKEN.split(kucuk)[:-1])
+            uzunluklar[1::2] = map(len, tokenler)
+            sinirlar = list(itertools.accumulate(uzunluklar))
+            self.baslangic = array("I", sinirlar[0::2])
+            self.bitis = array("I", sinirlar[1::2])
+        else:
+            # lower() uzunlugu degistirdi (orn. "İ"): temizle gibi parcala, aralik tum kelime
+            tokenler, self.baslangic, self.bitis = [], array("I"), array("I")
+            for m in _TOKEN.finditer(text):
+                parcalar = temizle(m.group()).split()
+                tokenler.extend(parcalar)
+                self.baslangic.extend([m.start()] * len(parcalar))
+                self.bitis.extend([m.end()] * len(parcalar))
+        self.kelimeler = list(dict.fromkeys(tokenler))
+        self.sozluk = {k: i for i, k in enumerate(self.kelimeler)}
+        self.kimlikler = array("I", map(self.sozluk.__getitem__, tokenler))
+
+    def __len__(self):
+        return len(self.kimlikler)
+
+    def kelime_seti(self):
+        """set(kelimeleri_cikar(text)) ile ayni; sadece sozluk uzerinden."""
+        stopwords = veri_paketi()["stopwords"]
+        return {k for k in self.kelimeler if len(k) > 2 and k not in stopwords}
+
+    def bigram_seti(self):
+        """set(bigram_cikar(text)) ile ayni."""
+        tokenler = list(map(self.kelimeler.__getitem__, self.kimlikler))
+        return {b for b in map(" ".join, zip(tokenler, tokenler[1:])) if len(b) > 6}
+
+    def isabetler(self, kelimeler, bigramlar=()):
+        """Eslesen kelime, esanlamlisi eslesen kelime ve bigram araliklari.
+
+        Tek gecis; (baslangic, bitis, tur) listesi baslangica gore sirali.
+        """
+        esanlamlilar = veri_paketi()["esanlamlilar"]
+        turler = {}
+        for kelime, kimlik in self.sozluk.items():
+            if kelime in kelimeler:
+                turler[kimlik] = ISABET_KELIME
+            elif any(e in kelimeler for e in esanlamlilar.get(kelime, ())):
+                turler[kimlik] = ISABET_ESANLAMLI
+        ciftler = set()
+        for bigram in bigramlar:
+            a, _, b = bigram.partition(" ")
+            if a in self.sozluk and b in self.sozluk:
+                ciftler.add((self.sozluk[a], self.sozluk[b]))
+        sonuc = []
+        kimlikler, bas, bit = self.kimlikler, self.baslangic, self.bitis
+        for i, kimlik in enumerate(kimlikler):
+            if ciftler and i + 1 < len(kimlikler) and (kimlik, kimlikler[i + 1]) in ciftler:
+                sonuc.append((bas[i], bit[i + 1], ISABET_BIGRAM))
+            tur = turler.get(kimlik)
+            if tur is not None:
+                sonuc.append((bas[i], bit[i], tur))
+        return sonuc
+
+
+BOLUM_ANAHTARLARI = {
+    "experience": [
+        "experience", "deneyim", "is deneyimi", "work experience",
+        "employment", "calistim", "is gecmisi", "kariyer"
+    ],
+    "education": [
+        "education", "egitim", "university", "universite", "mezun",
+        "degree", "lisans", "lise", "yuksek okul", "mba", "onlisans"
+    ],
+    "skills": [
+        "skills", "yetenekler", "beceriler", "yetkinlikler",
+        "competencies", "technical", "bilgi", "uzmanlik"
+    ],
+    "certifications": [
+        "certification", "sertifika", "certificate", "license",
+        "belge", "kurs", "egitim sertifikasi"
+    ],
+}
+
+OZET_ANAHTARLARI = ["ozet", "profil", "summary", "objective", "hakkimda", "about me"]
+
+
+def bolum_bayraklari(terim_var):
+    """terim_var(k) -> bool ile hangi bolumlerin oldugunu belirle."""
     return {
-        "experience": any(k in text_lower for k in [
-            "experience", "deneyim", "is deneyimi", "work experience",
-            "employment", "calistim", "is gecmisi", "kariyer"
-        ]),
-        "education": any(k in text_lower for k in [
-            "education", "egitim", "university", "universite", "mezun",
-            "degree", "lisans", "lise", "yuksek okul", "mba", "onlisans"
-        ]),
-        "skills": any(k in text_lower for k in [
-            "skills", "yetenekler", "beceriler", "yetkinlikler",
-            "competencies", "technical", "bilgi", "uzmanlik"
-        ]),
-        "certifications": any(k in text_lower for k in [
-            "certification", "sertifika", "certificate", "license",
-            "belge", "kurs", "egitim sertifikasi"
-        ])
+        bolum: any(terim_var(k) for k in anahtarlar)
+        for bolum, anahtarlar in BOLUM_ANAHTARLARI.items()
     }
 
 
-def format_sorunlari_tespit(cv_text):
+@olculu()
+def bolum_tespit(cv_text):
+    text_lower = cv_text.lower()
+    return bolum_bayraklari(lambda k: k in text_lower)
+
+
+BOLUM_BASLIK_MAX = 40
+BOLUM_BASLIK_MAX_KELIME = 3   # bicimsiz (Title Case) basliklar icin
+MADDE_ISARETLERI = "-*•·▪‣–"
+# Satir bir bolum anahtariyla baslamali; anahtardan sonra sadece cogul / iyelik eki
+# gelebilir ("sertifika" -> "sertifikalar", ama "bilgi" -> "bilgisayar" degil)
+_BOLUM_BASLIKLARI = [
+    (bolum, re.compile(
+        "(?:" + "|".join(map(re.escape, sorted(anahtarlar, key=len, reverse=True))) + r")[lerasiı]{0,4}\b"
+    ))
+    for bolum, anahtarlar in [("ozet", OZET_ANAHTARLARI), *BOLUM_ANAHTARLARI.items()]
+]
+
+
+def baslik_bolumu(satir):
+    """Satir bolum basligi olabiliyorsa (bolum, bicimli_mi), degilse None.
+
+    Aday: kisa, rakamsiz, madde isaretiyle baslamayan ve bir bolum anahtariyla
+    baslayan satir. Bicimli: tamami buyuk harf ya da ':' ile biten satir.
+    """
+    temiz = satir.strip()
+    if not 0 < len(temiz) <= BOLUM_BASLIK_MAX or temiz[0] in MADDE_ISARETLERI:
+        return None
+    if "@" in temiz or any(c.isdigit() for c in temiz):
+        return None
+    kucuk = temiz.lower()
+    en_iyi, uzunluk = None, 0
+    for bolum, desen in _BOLUM_BASLIKLARI:
+        m = desen.match(kucuk)
+        if m and m.end() > uzunluk:
+            en_iyi, uzunluk = bolum, m.end()
+    if en_iyi is None:
+        return None
+    return en_iyi, temiz.endswith(":") or (temiz.isupper() and temiz != kucuk)
+
+
+def bolum_araliklari(cv_text):
+    """CV'yi baslik satirlarina gore bol: [(bolum, baslangic, bitis)].
+
+    CV'de bicimli (BUYUK HARF / ':' ile biten) baslik varsa sadece onlar sayilir;
+    yoksa bos satirdan sonra gelen, en fazla BOLUM_BASLIK_MAX_KELIME kelimelik
+    adaylar. Boylece "Technical Lead" ya da "Bilgi guvenligi" gibi icerik
+    satirlari bolum acmaz.
+    Ilk basliktan onceki kisim (isim, iletisim) "giris" olarak doner.
+    """
+    adaylar = []
+    konum, onceki_bos = 0, True
+    for satir in cv_text.splitlines(keepends=True):
+        aday = baslik_bolumu(satir)
+        if aday is not None:
+            adaylar.append((aday[0], konum, aday[1], onceki_bos and len(satir.split()) <= BOLUM_BASLIK_MAX_KELIME))
+        konum += len(satir)
+        onceki_bos = not satir.strip()
+    if any(bicimli for _, _, bicimli, _ in adaylar):
+        araliklar = [["giris", 0]] + [[bolum, bas] for bolum, bas, bicimli, _ in adaylar if bicimli]
+    else:
+        araliklar = [["giris", 0]] + [[bolum, bas] for bolum, bas, _, ayri in adaylar if ayri]
+    sonuc = []
+    for (bolum, bas), sonraki in zip(araliklar, araliklar[1:] + [[None, len(cv_text)]]):
+        if sonraki[1] > bas:
+            sonuc.append((bolum, bas, sonraki[1]))
+    return sonuc
+
+
+# Sorunlar Turkce uretilir ve oyle saklanir (LLM istemine de boyle girer);
+# Ingilizce arayuzde gosterilirken bu tablodan cevrilir.
+FORMAT_SORUNU_INGILIZCE = {
+    "CV'niz tablo veya sutun formati iceriyor. ATS sistemleri tablolari okuyamaz.":
+        "Your CV uses a table or column layout. ATS systems cannot read tables.",
+    "Cok uzun paragraflar var. Bullet point kullanmaniz onerilir.":
+        "Some paragraphs are very long. Bullet points are recommended.",
+    "'Skills/Beceriler' bolumu bulunamadi. ATS sistemleri bu bolumu arar.":
+        "No 'Skills' section found. ATS systems look for this section.",
+    "'Experience/Deneyim' bolumu bulunamadi.": "No 'Experience' section found.",
+    "CV'de email adresi bulunamadi.": "No email address found in the CV.",
+    "CV'de telefon numarasi bulunamadi.": "No phone number found in the CV.",
+    "CV'de yil/tarih bilgisi bulunamadi. Is deneyimlerinize tarih ekleyin.":
+        "No years/dates found in the CV. Add dates to your work experience.",
+    "Ozel karakterler (★, ●, ◆ vb.) ATS sistemlerinde hatali okunabilir.":
+        "Special characters (★, ●, ◆ etc.) may be misread by ATS systems.",
+}
+
+
+def format_sorunu_metni(sorun, tr=True):
+    return sorun if tr else FORMAT_SORUNU_INGILIZCE.get(sorun, sorun)
+
+
+@olculu()
+def format_sorunlari_tespit(cv_text, bolumler=None):
     sorunlar = []
     satirlar = cv_text.split('\n')
 
@@ -210,7 +738,8 @@ def format_sorunlari_tespit(cv_text):
         sorunlar.append("Cok uzun paragraflar var. Bullet point kullanmaniz onerilir.")
 
     # Bolum kontrolu
-    bolumler = bolum_tespit(cv_text)
+    if bolumler is None:
+        bolumler = bolum_tespit(cv_text)
     if not bolumler["skills"]:
         sorunlar.append("'Skills/Beceriler' bolumu bulunamadi. ATS sistemleri bu bolumu arar.")
     if not bolumler["experience"]:
@@ -235,30 +764,52 @@ def format_sorunlari_tespit(cv_text):
     return sorunlar
 
 
-def keyword_analizi(cv_text, jd_text):
-    """Gelismis keyword analizi: esanlamlilar + bigram + sektor destegi."""
+def jd_hazirla(jd_text):
+    """Is ilanina ait, CV'den bagimsiz her seyi bir kez hesapla."""
+    # Paket kimligi anahtarda: yeni paket gelince eski sonuclar kullanilmaz
+    return _jd_hazirla(jd_text, veri_paketi()["kimlik"])
+
 
-    # Tekil kelimeler
-    cv_kelimeler = set(kelimeleri_cikar(cv_text))
+@functools.lru_cache(maxsize=64)
+def _jd_hazirla(jd_text, paket_kimlik):
     jd_kelimeler = kelimeleri_cikar(jd_text)
+    kelime_seti = set(jd_kelimeler)
+    return {
+        "kelimeler": kelime_seti,
+        # JD'de cok gecen kelimeler daha fazla puan: max 3x agirlik
+        "agirlik": {kw: min(3, onem_skoru(kw, jd_text)) for kw in kelime_seti},
+        "bigramlar": set(bigram_cikar(jd_text)),
+        "onemli": {k for k, v in Counter(jd_kelimeler).items() if len(k) > 3},
+        "sektor": sektor_tespit(jd_text),
+    }
+
+
+@olculu()
+def keyword_analizi(cv_text, jd_text, indeks=None):
+    """Gelismis keyword analizi: esanlamlilar + bigram + sektor destegi."""
+    cv_lower = cv_text.lower()
+    if indeks is None:
+        indeks = KonumIndeksi(cv_text)
+    return keyword_eslestir(
+        indeks.kelime_seti(), indeks.bigram_seti(),
+        jd_hazirla(jd_text), lambda k: k in cv_lower
+    )
 
-    # Bigramlar
-    cv_bigramlar = set(bigram_cikar(cv_text))
-    jd_bigramlar = set(bigram_cikar(jd_text))
 
-    # JD'deki onemli kelimeler
-    jd_sayac = Counter(jd_kelimeler)
-    onemli_jd = {k for k, v in jd_sayac.items() if len(k) > 3}
+def keyword_eslestir(cv_kelimeler, cv_bigramlar, jd, terim_var):
+    """keyword_analizi cekirdegi; CV onceden token'lanmis olarak gelir."""
+    paket = veri_paketi()
+    onemli_jd = jd["onemli"]
 
     # CV'yi esanlamlilariyla genislet
     cv_genisletilmis = esanlamli_genislet(cv_kelimeler)
 
     # Sektore ozel kontrol
-    sektor = sektor_tespit(jd_text)
+    sektor = jd["sektor"]
     sektor_eksik = []
-    if sektor and sektor in SEKTOR_KEYWORDLERI:
-        sektor_kelimeleri = SEKTOR_KEYWORDLERI[sektor]
-        sektor_eksik = [k for k in sektor_kelimeleri if k not in cv_text.lower()][:5]
+    if sektor and sektor in paket["sektor_keywordleri"]:
+        sektor_kelimeleri = paket["sektor_keywordleri"][sektor]
+        sektor_eksik = [k for k in sektor_kelimeleri if not terim_var(k)][:5]
 
     # Eslesen ve eksik kelimeler
     eslesen = onemli_jd & cv_genisletilmis
@@ -269,14 +820,7 @@ def keyword_analizi(cv_text, jd_text):
     eslesen = eslesen | bigram_eslesen
 
     # Genel kelimeleri filtrele
-    genel = {
-        'must', 'will', 'work', 'good', 'well', 'able', 'also', 'more',
-        'than', 'our', 'your', 'their', 'have', 'been', 'they', 'from',
-        'such', 'both', 'each', 'need', 'new', 'high', 'other', 'some',
-        'what', 'when', 'where', 'which', 'while', 'how', 'all', 'any',
-        'olan', 'icin', 'veya', 'ile', 'olarak', 'sahip', 'aranan', 'olan'
-    }
-    eksik = {k for k in eksik if k not in genel and len(k) > 3}
+    eksik = {k for k in eksik if k not in paket["genel_kelimeler"] and len(k) > 3}
 
     # Sektor eksiklerini de ekle
     tum_eksik = list(eksik)[:10] + sektor_eksik[:5]
@@ -289,34 +833,44 @@ def onem_skoru(kelime, jd_text):
     return jd_text.lower().count(kelime.lower())
 
 
-def puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari):
+@olculu()
+def puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari, indeks=None):
     """Gelismis ve agirlikli puan hesaplama - %80 dogruluk hedefi."""
+    cv_lower = cv_text.lower()
+    if indeks is None:
+        indeks = KonumIndeksi(cv_text)
+    return puan_birlestir(
+        cv_text, indeks.kelime_seti(), indeks.bigram_seti(),
+        jd_hazirla(jd_text), bolumler, format_sorunlari, lambda k: k in cv_lower
+    )
+
+
+def puan_birlestir(cv_text, cv_kelimeler, cv_bigramlar, jd, bolumler, format_sorunlari, terim_var):
+    """puan_hesapla cekirdegi; CV token'lari ve terim kontrolu disaridan gelir."""
     puan = 0
     breakdown = {}
     cv_lower = cv_text.lower()
-    jd_lower = jd_text.lower()
 
     # ── 1. KEYWORD ESLESMESI (30 puan) ──
     # Hem tekil kelime hem bigram, hem esanlamli, hem onem agirlikli
-    cv_genisletilmis = esanlamli_genislet(set(kelimeleri_cikar(cv_text)))
-    jd_kelimeler = set(kelimeleri_cikar(jd_text))
-    cv_bigramlar = set(bigram_cikar(cv_text))
-    jd_bigramlar = set(bigram_cikar(jd_text))
+    cv_genisletilmis = esanlamli_genislet(cv_kelimeler)
+    # Tek metinde arama, tum bigramlarda any(kw in bg) ile ayni sonucu verir
+    bigram_metni = "\n".join(cv_bigramlar)
 
     # Agirlikli eslesme: JD'de cok gecen kelimeler daha fazla puan
     toplam_agirlik = 0
     eslesen_agirlik = 0
-    for kw in jd_kelimeler:
-        agirlik = min(3, onem_skoru(kw, jd_text))  # max 3x agirlik
+    for kw in jd["kelimeler"]:
+        agirlik = jd["agirlik"][kw]
         toplam_agirlik += agirlik
         if kw in cv_genisletilmis:
             eslesen_agirlik += agirlik
         # Bigram kontrolu
-        elif any(kw in bg for bg in cv_bigramlar):
+        elif kw in bigram_metni:
             eslesen_agirlik += agirlik * 0.7
 
     # Bigram direk eslesmesi bonus
-    bigram_bonus = len(jd_bigramlar & cv_bigramlar) * 0.5
+    bigram_bonus = len(jd["bigramlar"] & cv_bigramlar) * 0.5
 
     kw_oran = (eslesen_agirlik + bigram_bonus) / max(toplam_agirlik, 1)
     kw_puan = min(30, int(kw_oran * 55))
@@ -330,22 +884,14 @@ def puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari):
         if var:
             bolum_puan += 5
     # Ozet/profil bolumu varsa bonus
-    if any(k in cv_lower for k in ["ozet", "profil", "summary", "objective", "hakkimda", "about me"]):
+    if any(terim_var(k) for k in OZET_ANAHTARLARI):
         bolum_puan = min(20, bolum_puan + 3)
     breakdown["section_structure"] = min(20, bolum_puan)
     puan += breakdown["section_structure"]
 
     # ── 3. BULLET + GUCLU FİİL KALİTESİ (20 puan) ──
     bullet_sayisi = len(re.findall(r"(?m)^[\s]*[-*•]", cv_text))
-    guclu_fiiller = [
-        "led", "managed", "developed", "created", "achieved", "improved",
-        "implemented", "designed", "launched", "built", "drove", "increased",
-        "reduced", "delivered", "coordinated", "negotiated", "trained",
-        "yonettim", "gelistirdim", "olusturdum", "artirdim", "sagladim",
-        "koordine", "tasarladim", "kurdum", "azalttim", "teslim", "egittim",
-        "musteri kazandim", "satis yaptim", "hedef tuttum"
-    ]
-    fiil_sayisi = sum(1 for f in guclu_fiiller if f in cv_lower)
+    fiil_sayisi = sum(1 for f in veri_paketi()["guclu_fiiller"] if terim_var(f))
     bullet_puan = min(12, bullet_sayisi * 1) + min(8, fiil_sayisi * 2)
     breakdown["bullet_quality"] = min(20, bullet_puan)
     puan += breakdown["bullet_quality"]
@@ -359,7 +905,7 @@ def puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari):
     if re.search(r"[\+]?[\d\s\-\(\)]{10,}", cv_text):
         format_puan = min(15, format_puan + 1)
     # LinkedIn varsa bonus
-    if "linkedin" in cv_lower:
+    if terim_var("linkedin"):
         format_puan = min(15, format_puan + 1)
     # CV uzunlugu kontrolu (200-800 kelime ideal)
     kelime_sayisi = len(cv_text.split())
@@ -385,9 +931,508 @@ def puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari):
     return min(100, puan), breakdown
 
 
+# ── CANLI (ARTIMLI) PUANLAMA ──
+def canli_terimler():
+    """Satir bazinda sayilan alt-metin terimleri: bolum, ozet, fiil, sektor, linkedin."""
+    # Tum puanlayicilar ayni kumeyi paylasir; paket kimligi anahtarda
+    return _canli_terimler(veri_paketi()["kimlik"])
+
+
+@functools.lru_cache(maxsize=4)
+def _canli_terimler(paket_kimlik):
+    paket = veri_paketi()
+    terimler = {k for anahtarlar in BOLUM_ANAHTARLARI.values() for k in anahtarlar}
+    terimler.update(OZET_ANAHTARLARI, paket["guclu_fiiller"], ["linkedin"])
+    for kelimeler in paket["sektor_keywordleri"].values():
+        terimler.update(kelimeler)
+    return frozenset(terimler)
+
+
+class CanliPuanlayici:
+    """CV duzenlenirken sadece degisen satirlari yeniden isleyen puanlayici.
+
+    Token, bigram ve terim sayaclari satir bazinda tutulur; metin degisince
+    eski/yeni satirlar diff'lenir ve sadece etkilenen satirlar cikarilip eklenir.
+    Satirlar ve token listeleri saklanmaz: satirlar metinden bolunur, cikan satir
+    yeniden token'lanir; satir basina sadece ilk / son token (gecis bigramlari) kalir.
+    Sonuc puan_hesapla / keyword_analizi ile birebir aynidir.
+    """
+
+    def __init__(self, jd_text):
+        self.jd_text = jd_text
+        self.paket_kimlik = veri_paketi()["kimlik"]
+        self.stopwords = veri_paketi()["stopwords"]
+        self.jd = jd_hazirla(jd_text)
+        self.terimler = canli_terimler()
+        self.cv_text = ""
+        self.sinirlar = []  # her satir icin "ilk_token son_token"; bos satirda None
+        self.kelime_sayac = Counter()  # kelimeleri_cikar filtresinden gecen token'lar
+        self.bigram_sayac = Counter()  # satir ici bigramlar
+        self.terim_sayac = Counter()  # terim -> iceren satir sayisi
+        self.onceki_puan = None
+        self._son_puan = None
+        self._sonuc = None
+
+    @staticmethod
+    def _artir(sayac_, anahtar, isaret):
+        yeni = sayac_[anahtar] + isaret
+        if yeni:
+            sayac_[anahtar] = yeni
+        else:
+            del sayac_[anahtar]
+
+    def _satir_uygula(self, satir, tokenler, isaret):
+        for k in tokenler:
+            if len(k) > 2 and k not in self.stopwords:
+                self._artir(self.kelime_sayac, k, isaret)
+        for i in range(len(tokenler) - 1):
+            bigram = f"{tokenler[i]} {tokenler[i+1]}"
+            if len(bigram) > 6:
+                self._artir(self.bigram_sayac, bigram, isaret)
+        satir_lower = satir.lower()
+        for terim in self.terimler:
+            if terim in satir_lower:
+                self._artir(self.terim_sayac, terim, isaret)
+
+    def guncelle(self, cv_text):
+        """Yeni metni uygula; yeniden islenen satir sayisini dondur."""
+        if cv_text == self.cv_text:
+            return 0
+        eski, yeni = self.cv_text.split("\n") if self.sinirlar else [], cv_text.split("\n")
+        # Ortak bas/son satirlari atla, sadece ortadaki parcayi diff'le
+        bas = 0
+        while bas < len(eski) and bas < len(yeni) and eski[bas] == yeni[bas]:
+            bas += 1
+        son = 0
+        while son < len(eski) - bas and son < len(yeni) - bas and eski[-1 - son] == yeni[-1 - son]:
+            son += 1
+        orta_eski, orta_yeni = eski[bas:len(eski) - son], yeni[bas:len(yeni) - son]
+        orta_sinirlar = self.sinirlar[bas:len(eski) - son]
+
+        yeni_sinirlar = []
+        islenen = 0
+        opkodlar = difflib.SequenceMatcher(None, orta_eski, orta_yeni, autojunk=False).get_opcodes()
+        for op, i1, i2, j1, j2 in opkodlar:
+            if op == "equal":
+                yeni_sinirlar.extend(orta_sinirlar[i1:i2])
+                continue
+            for satir in orta_eski[i1:i2]:
+                self._satir_uygula(satir, temizle(satir).split(), -1)
+            for satir in orta_yeni[j1:j2]:
+                tokenler = temizle(satir).split()
+                self._satir_uygula(satir, tokenler, 1)
+                yeni_sinirlar.append(f"{tokenler[0]} {tokenler[-1]}" if tokenler else None)
+                islenen += 1
+
+        self.sinirlar = self.sinirlar[:bas] + yeni_sinirlar + self.sinirlar[len(eski) - son:]
+        self.cv_text = cv_text
+        self._sonuc = None
+        return islenen
+
+    def _bigramlar(self):
+        """Satir ici bigramlar + satir sonu/basi arasindaki gecis bigramlari."""
+        bigramlar = set(self.bigram_sayac)
+        onceki = None
+        for sinir in self.sinirlar:
+            if sinir is None:
+                continue
+            ilk, _, son = sinir.partition(" ")
+            if onceki is not None:
+                bigram = f"{onceki} {ilk}"
+                if len(bigram) > 6:
+                    bigramlar.add(bigram)
+            onceki = son
+        return bigramlar
+
+    def sonuc(self):
+        """Guncel metin icin puan, breakdown, bolumler, eslesen, eksik, format_sorunlari."""
+        if self._sonuc is not None:
+            return self._sonuc
+        terim_var = self.terim_sayac.__contains__
+        cv_kelimeler = set(self.kelime_sayac)
+        cv_bigramlar = self._bigramlar()
+        bolumler = bolum_bayraklari(terim_var)
+        eslesen, eksik = keyword_eslestir(cv_kelimeler, cv_bigramlar, self.jd, terim_var)
+        format_sorunlari = format_sorunlari_tespit(self.cv_text, bolumler)
+        puan, breakdown = puan_birlestir(
+            self.cv_text, cv_kelimeler, cv_bigramlar, self.jd, bolumler, format_sorunlari, terim_var
+        )
+        if self._son_puan is not None:
+            self.onceki_puan = self._son_puan
+        self._son_puan = puan
+        self._sonuc = {
+            "puan": puan, "breakdown": breakdown, "bolumler": bolumler,
+            "eslesen": eslesen, "eksik": eksik, "format_sorunlari": format_sorunlari,
+        }
+        return self._sonuc
+
+    def boyut(self):
+        """Yaklasik bellek (bayt); paylasilan ilan / paket / terim yapilari haric."""
+        return derin_boyut([self.cv_text, self.sinirlar, self.kelime_sayac, self.bigram_sayac,
+                            self.terim_sayac, self._sonuc])
+
+
+# Puanlayici oturuma ozeldir (CV metni, satir sinirlari, sayaclar; 1.7 KB'lik CV icin
+# ~20 KB). session_state yerine burada tutulur: sayisi sinirli, bir sure kullanilmayan
+# atilir ve boyutu icerik deposunun ATS_DEPO_MAX_MB sinirina dahildir; toplam sinir
+# asilinca once en eski puanlayicilar atilir. Atilan puanlayici bir sonraki
+# duzenlemede bastan kurulur.
+CANLI_MAX_OTURUM = int(os.environ.get("ATS_CANLI_MAX_OTURUM", "200"))
+CANLI_BOSTA_SN = int(os.environ.get("ATS_CANLI_BOSTA_SN", "600"))
+
+
+class CanliPuanlayiciDeposu:
+    """oturum_id -> CanliPuanlayici; LRU, en fazla max_oturum kayit.
+
+    depo verilirse toplam boyut depoya ek bayt olarak bildirilir ve depo ile
+    birlikte depo.max_bayt'i asmamasi icin en eski puanlayicilar atilir.
+    """
+
+    def __init__(self, depo=None, max_oturum=CANLI_MAX_OTURUM, bosta_sn=CANLI_BOSTA_SN):
+        self.depo = depo
+        self.max_oturum = max_oturum
+        self.bosta_sn = bosta_sn
+        self.kilit = threading.Lock()
+        self.kayitlar = OrderedDict()  # oturum_id -> [son_kullanim, puanlayici, bayt]
+        self.bayt = 0
+
+    def al(self, oturum_id):
+        with self.kilit:
+            kayit = self.kayitlar.get(oturum_id)
+            if kayit is None:
+                return None
+            kayit[0] = time.time()
+            self.kayitlar.move_to_end(oturum_id)
+            return kayit[1]
+
+    def koy(self, oturum_id, puanlayici):
+        """Ekle ya da guncellenen puanlayicinin boyutunu yenile."""
+        bayt = puanlayici.boyut()
+        with self.kilit:
+            eski = self.kayitlar.pop(oturum_id, None)
+            if eski is not None:
+                self.bayt -= eski[2]
+            self.kayitlar[oturum_id] = [time.time(), puanlayici, bayt]
+            self.bayt += bayt
+            self._temizle()
+
+    def sil(self, oturum_id):
+        with self.kilit:
+            kayit = self.kayitlar.pop(oturum_id, None)
+            if kayit is not None:
+                self.bayt -= kayit[2]
+            self._bildir()
+
+    def _asildi(self):
+        if len(self.kayitlar) > self.max_oturum:
+            return True
+        if next(iter(self.kayitlar.values()))[0] < time.time() - self.bosta_sn:
+            return True
+        # En yeni puanlayici her zaman kalir
+        return (self.depo is not None and len(self.kayitlar) > 1
+                and self.bayt + self.depo.bayt > self.depo.max_bayt)
+
+    def _temizle(self):
+        # LRU sirasi son kullanim sirasidir: bastan bostakileri ve fazlayi at
+        while self.kayitlar and self._asildi():
+            _, kayit = self.kayitlar.popitem(last=False)
+            self.bayt -= kayit[2]
+            sayac("canli_puanlayici_atildi")
+        self._bildir()
+
+    def _bildir(self):
+        if self.depo is not None:
+            self.depo.ek_bayt_ayarla(self.bayt)
+
+    def istatistik(self):
+        with self.kilit:
+            self._temizle()
+            return {"oturum": len(self.kayitlar), "max_oturum": self.max_oturum, "bayt": self.bayt}
+
+
+@st.cache_resource
+def canli_puanlayici_deposu():
+    """Tum oturumlarin canli puanlayicilari; boyutlari icerik deposunun sinirina dahil."""
+    return CanliPuanlayiciDeposu(icerik_deposu())
+
+
+# ── YAKIN KOPYA TESPITI (MinHash / LSH) ──
+# Ayni CV ayni ilan ve dil icin tekrar gelirse LLM feedback'i yeniden uretilmez.
+# Neredeyse ayni (duzenlenmis ya da baska birine ait) CV'ler sadece isaretlenir:
+# eski feedback eski puani ve duzeltilmis eksikleri anlatir, baska kisiye ait
+# olabilir.
+MINHASH_PERM = int(os.environ.get("ATS_MINHASH_PERM", "128"))
+MINHASH_BANT = int(os.environ.get("ATS_MINHASH_BANT", "16"))
+YAKIN_KOPYA_ESIK = float(os.environ.get("ATS_YAKIN_KOPYA_ESIK", "0.9"))
+LSH_DOSYA = os.environ.get("ATS_LSH_DOSYA", "")
+LSH_MAX_KAYIT = int(os.environ.get("ATS_LSH_MAX_KAYIT", "5000"))
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240101)
+_MINHASH_KATSAYI = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(MINHASH_PERM)]
+
+
+def metin_hash(text):
+    """Icerik adresleme icin kisa, kararli hash."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def shingle_cikar(text, k=3):
+    """kelimeleri_cikar ciktisindan k kelimelik ortusen parcalar."""
+    kelimeler = kelimeleri_cikar(text)
+    if len(kelimeler) < k:
+        return {" ".join(kelimeler)} if kelimeler else set()
+    return {" ".join(kelimeler[i:i + k]) for i in range(len(kelimeler) - k + 1)}
+
+
+@olculu()
+def minhash_imza(text):
+    """Metnin MinHash imzasi (MINHASH_PERM uzunlugunda tuple). Bos metin icin None."""
+    hashler = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingle_cikar(text)
+    ]
+    if not hashler:
+        return None
+    return tuple(min((a * h + b) % _MERSENNE for h in hashler) for a, b in _MINHASH_KATSAYI)
+
+
+def imza_benzerligi(imza1, imza2):
+    """Iki imzadan tahmini Jaccard benzerligi."""
+    return sum(1 for x, y in zip(imza1, imza2) if x == y) / len(imza1)
+
+
+class LSHIndeksi:
+    """MinHash imzalari icin bant tabanli LSH indeksi; opsiyonel kalicilik.
+
+    Dosya JSON satirlarindan olusan bir ekleme gunlugudur: her ekle() tek satir
+    yazar (indeks kilidi disinda). Satir sayisi kayit sinirinin iki katini gecince
+    gunluk arka planda guncel kayitlarla yeniden yazilir. Yuklemede bozuk satirlar
+    (yarim kalmis yazma vb.) atlanir; okunamayan dosya bos indeksle devam eder.
+    """
+
+    def __init__(self, perm=MINHASH_PERM, bant=MINHASH_BANT, dosya="", max_kayit=LSH_MAX_KAYIT):
+        self.bant = bant
+        self.satir = perm // bant
+        self.dosya = dosya
+        self.max_kayit = max_kayit
+        self.kilit = threading.Lock()
+        self.dosya_kilit = threading.Lock()
+        self.gunluk_satir = 0
+        self.sikistiriliyor = False
+        self.kovalar = [{} for _ in range(bant)]  # bant -> {bant_anahtari: set(kayit_id)}
+        self.kayitlar = {}  # kayit_id -> {"imza": tuple, "veri": dict}
+        if dosya and os.path.exists(dosya):
+            if self.yukle():
+                self.kaydet()  # bozuk satirlari temizle
+
+    def _anahtarlar(self, imza):
+        return [hash(imza[i * self.satir:(i + 1) * self.satir]) for i in range(self.bant)]
+
+    def _ekle(self, kayit_id, imza, veri):
+        if kayit_id in self.kayitlar:
+            self._sil(kayit_id)
+        self.kayitlar[kayit_id] = {"imza": imza, "veri": veri}
+        for kova, anahtar in zip(self.kovalar, self._anahtarlar(imza)):
+            kova.setdefault(anahtar, set()).add(kayit_id)
+        while len(self.kayitlar) > self.max_kayit:
+            self._sil(next(iter(self.kayitlar)))
+
+    def _sil(self, kayit_id):
+        kayit = self.kayitlar.pop(kayit_id)
+        for kova, anahtar in zip(self.kovalar, self._anahtarlar(kayit["imza"])):
+            idler = kova.get(anahtar)
+            if idler:
+                idler.discard(kayit_id)
+                if not idler:
+                    del kova[anahtar]
+
+    def ekle(self, kayit_id, imza, veri):
+        with self.kilit:
+            self._ekle(kayit_id, imza, veri)
+        if self.dosya:
+            self._gunluge_yaz(kayit_id, imza, veri)
+
+    def sorgula(self, imza, esik=YAKIN_KOPYA_ESIK):
+        """Esigi gecen adaylari [(benzerlik, kayit_id, veri)] olarak, en benzer once dondur."""
+        with self.kilit:
+            adaylar = set()
+            for kova, anahtar in zip(self.kovalar, self._anahtarlar(imza)):
+                adaylar |= kova.get(anahtar, set())
+            sonuc = []
+            for kayit_id in adaylar:
+                kayit = self.kayitlar[kayit_id]
+                benzerlik = imza_benzerligi(imza, kayit["imza"])
+                if benzerlik >= esik:
+                    sonuc.append((benzerlik, kayit_id, kayit["veri"]))
+        return sorted(sonuc, key=lambda x: -x[0])
+
+    @staticmethod
+    def _satir(kayit_id, imza, veri):
+        return json.dumps({"id": kayit_id, "imza": list(imza), "veri": veri}, ensure_ascii=False) + "\n"
+
+    def _gunluge_yaz(self, kayit_id, imza, veri):
+        satir = self._satir(kayit_id, imza, veri)
+        with self.dosya_kilit:
+            try:
+                with open(self.dosya, "a", encoding="utf-8") as f:
+                    f.write(satir)
+            except OSError as e:
+                log.warning("LSH gunlugu yazilamadi: %s", e)
+                return
+            self.gunluk_satir += 1
+            if self.gunluk_satir <= 2 * self.max_kayit or self.sikistiriliyor:
+                return
+            self.sikistiriliyor = True
+        threading.Thread(target=self.kaydet, name="lsh_sikistir", daemon=True).start()
+
+    def kaydet(self):
+        """Gunlugu guncel kayitlarla yeniden yaz (sikistirma)."""
+        with self.dosya_kilit:
+            with self.kilit:
+                kayitlar = [(k, v["imza"], v["veri"]) for k, v in self.kayitlar.items()]
+            gecici = self.dosya + ".tmp"
+            try:
+                with open(gecici, "w", encoding="utf-8") as f:
+                    f.writelines(self._satir(*kayit) for kayit in kayitlar)
+                os.replace(gecici, self.dosya)
+                self.gunluk_satir = len(kayitlar)
+            except OSError as e:
+                log.warning("LSH dosyasi yazilamadi: %s", e)
+            finally:
+                self.sikistiriliyor = False
+
+    def yukle(self):
+        """Gunlugu oku; atlanan bozuk satir varsa True."""
+        bozuk = 0
+        try:
+            with open(self.dosya, encoding="utf-8", errors="replace") as f:
+                for satir in f:
+                    self.gunluk_satir += 1
+                    try:
+                        kayit = json.loads(satir)
+                        # Eski surum: tek satirda {kayit_id: {"imza", "veri"}}
+                        kayitlar = [kayit] if "id" in kayit else [dict(v, id=k) for k, v in kayit.items()]
+                        for k in kayitlar:
+                            if len(k["imza"]) != self.bant * self.satir:
+                                raise ValueError("imza uzunlugu")
+                            self._ekle(k["id"], tuple(k["imza"]), k["veri"])
+                    except (ValueError, TypeError, KeyError, AttributeError):
+                        bozuk += 1
+        except OSError as e:
+            log.warning("LSH dosyasi okunamadi, bos indeksle devam: %s", e)
+            return False
+        if bozuk:
+            log.warning("LSH dosyasinda %d bozuk satir atlandi: %s", bozuk, self.dosya)
+        return bool(bozuk)
+
+
+@st.cache_resource
+def lsh_indeksi():
+    """Tum oturumlarin paylastigi yakin kopya indeksi."""
+    return LSHIndeksi(dosya=LSH_DOSYA)
+
+
+def yakin_kopya_bul(cv_text, jd_text, tr=True):
+    """(imza, en_iyi_eslesme) dondur. Eslesme: {"benzerlik", "ayni_ilan", "ai_feedback"} ya da None.
+
+    ai_feedback sadece birebir ayni CV, ilan ve dil icin dolu; digerleri yalnizca isaret.
+    """
+    imza = minhash_imza(cv_text)
+    if imza is None:
+        return None, None
+    jd_hash = metin_hash(jd_text)
+    adaylar = lsh_indeksi().sorgula(imza)
+    if not adaylar:
+        return imza, None
+    # Once birebir kayit, sonra ayni ilan icin analiz edilmis kopya
+    cv_hash, dil = metin_hash(cv_text), "tr" if tr else "en"
+    ayni = [a for a in adaylar if a[2].get("jd_hash") == jd_hash]
+    birebir = [a for a in ayni if a[2].get("cv_hash") == cv_hash and a[2].get("dil") == dil]
+    benzerlik, _, veri = (birebir or ayni or adaylar)[0]
+    sayac("yakin_kopya")
+    return imza, {
+        "benzerlik": benzerlik,
+        "ayni_ilan": bool(ayni),
+        "ai_feedback": veri.get("ai_feedback") if birebir else None,
+    }
+
+
+def yakin_kopya_kaydet(cv_text, jd_text, ai_feedback, tr=True, imza=None):
+    """LLM feedback'ini ayni CV / ilan / dil tekrar gelirse kullanmak icin indekse ekle."""
+    if imza is None:
+        imza = minhash_imza(cv_text)
+        if imza is None:
+            return
+    dil = "tr" if tr else "en"
+    lsh_indeksi().ekle(
+        metin_hash("\0".join((cv_text, jd_text, dil))), imza,
+        {"cv_hash": metin_hash(cv_text), "jd_hash": metin_hash(jd_text), "dil": dil, "ai_feedback": ai_feedback}
+    )
+
+
+def token_say(response):
+    """LLM cevabindaki token kullanimini sayaclara ekle."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        sayac("llm_istek")
+        sayac("llm_prompt_token", getattr(usage, "prompt_tokens", 0) or 0)
+        sayac("llm_cevap_token", getattr(usage, "completion_tokens", 0) or 0)
+
+
+ATLAMA = "[...]\n"
+CV_BAGLAMI_MIN_KESIT = 40
+
+
+def cv_baglami(cv_text, jd_text, limit, soru=""):
+    """LLM'e gidecek CV metni. Sigmiyorsa kesmek yerine ilan (ve soru) kelimelerinin
+    en yogun gectigi satirlari sec; baslik ve ilk satirlar (isim, iletisim) hep kalir.
+    Sigmayan oncelikli satir kesilir; atlama isaretleriyle birlikte cikti limit'i gecmez.
+    """
+    if len(cv_text) <= limit:
+        return cv_text
+    jd = jd_hazirla(jd_text)
+    terimler = jd["onemli"] | {k for k in kelimeleri_cikar(soru) if len(k) > 3}
+    indeks = KonumIndeksi(cv_text)
+    satirlar = cv_text.splitlines(keepends=True)
+    satir_bas = array("I", itertools.accumulate((len(x) for x in satirlar), initial=0))
+    skor = [0] * len(satirlar)
+    for bas, _, _ in indeks.isabetler(terimler, jd["bigramlar"]):
+        skor[bisect.bisect_right(satir_bas, bas) - 1] += 1
+    basliklar = {bisect.bisect_right(satir_bas, bas) - 1 for _, bas, _ in bolum_araliklari(cv_text)}
+    oncelik = sorted(
+        range(len(satirlar)),
+        key=lambda i: (i not in basliklar and i >= 3, -skor[i], i),
+    )
+    # Her satirin onune en fazla bir ATLAMA isareti (ya da tek bos satir) gelir: payi butceden dus
+    secilen, kalan = {}, limit
+    for i in oncelik:
+        satir = satirlar[i]
+        if not satir.strip():
+            continue
+        if len(satir) + len(ATLAMA) <= kalan:
+            secilen[i] = satir
+            kalan -= len(satir) + len(ATLAMA)
+        elif kalan - len(ATLAMA) > CV_BAGLAMI_MIN_KESIT:
+            # Sigmayan satiri atlamak yerine kes; tek satirlik CV / bolum bos gitmesin
+            secilen[i] = satir[:kalan - len(ATLAMA) - 1] + "\n"
+            break
+    parcalar, onceki = [], -1
+    for i in sorted(secilen):
+        atlanan = satirlar[onceki + 1:i]
+        if any(x.strip() for x in atlanan):
+            parcalar.append(ATLAMA)
+        elif atlanan:
+            parcalar.append("\n")  # arada sadece bos satir(lar) var
+        parcalar.append(secilen[i])
+        onceki = i
+    return "".join(parcalar)
+
+
+@olculu()
 def ai_feedback_olustur(cv_text, jd_text, puan, eksik, format_sorunlari, tr=True):
     """AI ile cok detayli ve CV'ye ozel feedback olustur."""
-    client = get_groq_client()
+    # Yeniden deneme / hedge AIFeedbackYoneticisi'nde; SDK'nin kendi denemeleri kapali
+    client = get_groq_client().with_options(max_retries=0, timeout=AI_ISTEK_ZAMAN_ASIMI)
     
     prompt = f"""Sen Turkiye'nin en deneyimli kariyer kocu ve CV uzmanisın. 15 yildir Fortune 500 sirketlerinde ise alim yaptin ve binlerce kisinin CV'sini degerlendirdin.
 
@@ -395,7 +1440,7 @@ Asagidaki CV'yi ve is ilanini CIDDEN dikkatlice oku. Yuzeysel, genel laflar etme
 
 ═══════════════════════════════
 CV:
-{cv_text[:3000]}
+{cv_baglami(cv_text, jd_text, 3000)}
 
 ═══════════════════════════════
 IS ILANI:
@@ -436,17 +1481,22 @@ ONEMLI: Turkce yaz. Samimi, direkt ve motive edici ol. Genel laflardan kac, CV'd
         temperature=0.7,
         max_tokens=2000,
     )
+    token_say(response)
     return response.choices[0].message.content
 
 
-def ai_soru_cevap(soru, cv_text, jd_text, mesaj_gecmisi, tr=True):
+AI_SORU_TOKEN = 1000
+
+
+@olculu()
+def ai_soru_cevap(soru, cv_text, jd_text, mesaj_gecmisi, tr=True, max_tokens=AI_SORU_TOKEN):
     """Kullanicinin sorularini AI ile cevapla."""
     client = get_groq_client()
     
     sistem_mesaji = f"""Sen bir kariyer kocu ve CV uzmanisın. Kullanicinin CV'si ve basvurdugu is ilani hakkinda {"Turkce" if tr else "English"} olarak yardimci oluyorsun.
 
 CV Ozeti:
-{cv_text[:2000]}
+{cv_baglami(cv_text, jd_text, 2000, soru)}
 
 Is Ilani Ozeti:
 {jd_text[:1000]}
@@ -461,11 +1511,825 @@ Her zaman Turkce cevap ver. Samimi, yardimci ve pratik tavsiyeler ver. Cover let
         model="llama-3.3-70b-versatile",
         messages=mesajlar,
         temperature=0.7,
-        max_tokens=1000,
+        max_tokens=max_tokens,
     )
+    token_say(response)
     return response.choices[0].message.content
 
 
+# ── AI FEEDBACK: BOLUMLU (MAP-REDUCE) ──
+# ATS_AI_BOLUMLU=1 iken uzun CV'ler tek istekte kesilerek gonderilmez: her bolum
+# (deneyim, egitim, beceriler, sertifikalar...) ayri, kisa bir istekle paralel
+# degerlendirilir, kisa bir birlestirme istegi notlardan raporu yazar. Bolum
+# notlari (bolum metni, ilan, dil) hash'iyle saklanir; degismeyen bolum yeniden
+# gonderilmez, basarisiz denemenin tamamlanan bolumleri de tekrar istenmez.
+#
+# Bedel: ilk analiz tek istek yerine en fazla AI_BOLUM_MAX_PARCA not + 1 birlestirme
+# istegi gonderir ve iki ardisik LLM turu bekler. Kapsama artar (cv_baglami ile
+# kesilen CV'nin ~%55-60'i yerine ~%90'i), ilk analizin kuyrugu ise tek istege gore
+# uzayabilir: eszamanli analizlerin notlari AI_BOLUM_ISCI'yi paylasir, en yavas
+# not birlestirmeyi bekletir. Bu yuzden kucuk bolumler tek istekte toplanir ve
+# parca sayisi sinirlanir; hedge sadece son istege (birlestirme) uygulanir, tum
+# map-reduce'a degil. Asil kazanc duzenlemelerde: sadece degisen bolumun notu ve
+# birlestirme yeniden istenir. Gecikme oncelikliyse kapali birakin.
+AI_BOLUMLU = os.environ.get("ATS_AI_BOLUMLU", "") == "1"
+AI_BOLUMLU_MIN_KARAKTER = int(os.environ.get("ATS_AI_BOLUMLU_MIN_KARAKTER", "3000"))
+AI_BOLUM_ISCI = int(os.environ.get("ATS_AI_BOLUM_ISCI", "8"))
+AI_BOLUM_MAX_KAYIT = int(os.environ.get("ATS_AI_BOLUM_MAX_KAYIT", "1000"))
+AI_BOLUM_MIN_KARAKTER = 150   # daha kisa bolumler (isim, iletisim) birlestirmeye aynen gider
+AI_BOLUM_MAX_KARAKTER = 2500
+AI_BOLUM_MAX_PARCA = int(os.environ.get("ATS_AI_BOLUM_MAX_PARCA", "4"))  # analiz basina not istegi
+AI_BOLUM_TOKEN = 300
+AI_BIRLESTIRME_TOKEN = 1000
+
+BOLUM_ADLARI = {
+    "giris": "Giris / Iletisim", "ozet": "Ozet", "experience": "Deneyim",
+    "education": "Egitim", "skills": "Beceriler", "certifications": "Sertifikalar",
+}
+
+
+def bolum_parcalari(cv_text):
+    """([(bolum, metin)] ayri degerlendirilecekler, kisa bolumlerin birlesik metni).
+
+    Ayni bolum birden fazla baslik altinda gecerse metinleri birlestirilir; istek
+    sinirini asan bolum satir sinirlarindan, tercihen bos satirlardan (is / okul
+    girdileri arasi) parcalara bolunur, sinira sigan ardisik parcalar tek istekte
+    toplanir (bolum adi "skills+certifications" gibi). Parca sayisi
+    AI_BOLUM_MAX_PARCA'yi asarsa parca boyu buyutulur; sigmayan kisim istekte
+    cv_baglami ile secilir.
+    """
+    gruplar = {}
+    for bolum, bas, bit in bolum_araliklari(cv_text):
+        gruplar.setdefault(bolum, []).append(cv_text[bas:bit])
+    kisa, uzun = [], []
+    for bolum, metinler in gruplar.items():
+        metin = "".join(metinler).strip()
+        if len(metin) >= AI_BOLUM_MIN_KARAKTER:
+            uzun.append((bolum, metin))
+        elif metin:
+            kisa.append(metin)
+
+    def bol(hedef):
+        parcalar = []
+        for bolum, metin in uzun:
+            parca = ""
+            for satir in metin.splitlines(keepends=True):
+                if parca and (len(parca) + len(satir) > hedef or (not satir.strip() and len(parca) > hedef // 2)):
+                    parcalar.append((bolum, parca.strip()))
+                    parca = ""
+                parca += satir
+            if parca.strip():
+                parcalar.append((bolum, parca.strip()))
+        # Kucuk parcalar ayni istekte: not sayisi ve kuyruk azalir
+        toplanan = []
+        for bolum, parca in parcalar:
+            if toplanan and len(toplanan[-1][1]) + len(parca) + 2 <= hedef:
+                onceki, metin = toplanan[-1]
+                if bolum not in onceki.split("+"):
+                    onceki += "+" + bolum
+                toplanan[-1] = (onceki, metin + "\n\n" + parca)
+            else:
+                toplanan.append((bolum, parca))
+        return toplanan
+
+    hedef = AI_BOLUM_MAX_KARAKTER
+    parcalar = bol(hedef)
+    while len(parcalar) > AI_BOLUM_MAX_PARCA:
+        hedef = hedef * 3 // 2
+        parcalar = bol(hedef)
+    return parcalar, "\n\n".join(kisa)
+
+
+def bolum_adi(bolum):
+    """bolum_parcalari'nin bolum adini ("skills+certifications") okunur yap."""
+    return ", ".join(BOLUM_ADLARI.get(ad, ad) for ad in bolum.split("+"))
+
+
+@olculu()
+def ai_bolum_notu(bolum, bolum_metni, jd_text, tr=True):
+    """Tek bir CV bolumunu ilana gore kisa notlarla degerlendir."""
+    client = get_groq_client().with_options(max_retries=0, timeout=AI_ISTEK_ZAMAN_ASIMI)
+    prompt = f"""Sen deneyimli bir CV uzmanisın. Asagida bir CV'nin SADECE "{bolum_adi(bolum)}" bolumu ve basvurulan is ilani var.
+
+BOLUM:
+{cv_baglami(bolum_metni, jd_text, AI_BOLUM_MAX_KARAKTER)}
+
+IS ILANI:
+{jd_text[:1500]}
+
+Bu bolumu ilana gore degerlendir ve {"Turkce" if tr else "English"} olarak kisa maddeler yaz:
+GUCLU: bolumdeki GERCEK bilgilere dayanan 1-3 guclu yon
+SORUN: 1-3 somut eksik ya da hata
+ONERI: 1-3 uygulanabilir duzeltme (mumkunse ornek cumleyle)
+Genel laf etme, bolumde olmayan bilgiyi uydurma."""
+
+    response = client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.5,
+        max_tokens=AI_BOLUM_TOKEN,
+    )
+    token_say(response)
+    return response.choices[0].message.content
+
+
+@olculu()
+def ai_feedback_birlestir(notlar, kisa_metin, jd_text, puan, eksik, format_sorunlari, tr=True):
+    """Bolum notlarini ai_feedback_olustur ile ayni basliklarda tek rapora donustur."""
+    client = get_groq_client().with_options(max_retries=0, timeout=AI_ISTEK_ZAMAN_ASIMI)
+    bolum_notlari = "\n\n".join(f"### {bolum_adi(bolum)}\n{not_}" for bolum, not_ in notlar)
+    prompt = f"""Sen Turkiye'nin en deneyimli kariyer kocu ve CV uzmanisın. Bir CV'nin her bolumu ayri ayri incelendi; notlar asagida.
+
+═══════════════════════════════
+CV'NIN KISA BOLUMLERI (isim, iletisim vb.):
+{kisa_metin or '-'}
+
+═══════════════════════════════
+BOLUM NOTLARI:
+{bolum_notlari}
+
+═══════════════════════════════
+IS ILANI:
+{jd_text[:1000]}
+
+═══════════════════════════════
+ATS PUANI: {puan}/100
+EKSIK KELIMELER: {', '.join(eksik[:10]) if eksik else 'Hic eksik yok'}
+FORMAT SORUNLARI: {', '.join(format_sorunlari[:3]) if format_sorunlari else 'Hic sorun yok'}
+
+═══════════════════════════════
+
+Notlari birlestirip tekrarlari ayikla ve asagidaki basliklarla {"TURKCE" if tr else "ENGLISH"}, o kisiye ozel ve ozlu yaz:
+
+## 👤 Sana Ozel Degerlendirme
+## ✅ Guclu Yonlerin
+## ⚠️ Mutlaka Duzeltmen Gerekenler
+## 🎯 Bu Is Icin Sana Ozel Tavsiyeler
+## 💬 Mulakat Hazirlik
+## 🚀 Bir Sonraki Adimin
+
+Notlarda olmayan bilgiyi uydurma. Samimi, direkt ve motive edici ol."""
+
+    response = client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.7,
+        max_tokens=AI_BIRLESTIRME_TOKEN,
+    )
+    token_say(response)
+    return response.choices[0].message.content
+
+
+class BolumluFeedback:
+    """Bolum notu onbellegi + tum oturumlarin paylastigi, eszamanlilik sinirli istek havuzu.
+
+    olustur() AIFeedbackYoneticisi'nin uretici'si olarak calisir; yeniden deneme ve
+    gecikme butcesi aynen gecerlidir, hedge ise yoneticide kapatilip sadece son
+    istege (birlestirme ya da kisa CV'de tek istek) uygulanir: tum map-reduce'u
+    ikilemek not isteklerini de ikiler. Bolum notu ve birlestirme istekleri anahtar
+    basina tekildir: yeniden deneme ya da baska oturum devam eden istegin
+    Future'ini bekler. Hata alan istek tablodan dusurulur.
+    """
+
+    def __init__(self, isci=AI_BOLUM_ISCI, max_kayit=AI_BOLUM_MAX_KAYIT,
+                 min_karakter=AI_BOLUMLU_MIN_KARAKTER, not_uretici=None, birlestirici=None, hedge_sn=None):
+        self.havuz = ThreadPoolExecutor(max_workers=isci, thread_name_prefix="ai_bolum")
+        # Son istekler not kuyruguna takilmasin diye ayri havuzda
+        self.son_havuz = ThreadPoolExecutor(max_workers=isci, thread_name_prefix="ai_birlestirme")
+        self.hedge_sn = hedge_sn
+        self.sureler = {"tek": deque(maxlen=200), "birlestirme": deque(maxlen=200)}
+        self.max_kayit = max_kayit
+        self.min_karakter = min_karakter
+        self.not_uretici = not_uretici or ai_bolum_notu
+        self.birlestirici = birlestirici or ai_feedback_birlestir
+        self.kilit = threading.Lock()
+        self.notlar = OrderedDict()  # hash -> Future(bolum notu); biten notlar LRU onbellek
+        self.birlestirmeler = OrderedDict()  # hash -> Future; sadece devam edenler
+        self.sayaclar = Counter()
+
+    def _say(self, ad, n=1):
+        with self.kilit:
+            self.sayaclar[ad] += n
+        sayac(f"ai_{ad}", n)
+
+    def _tekil(self, tablo, anahtar, ad, kalici, uret):
+        """Anahtar basina tek istek; ayni anahtari isteyenler ayni Future'i bekler."""
+        with self.kilit:
+            gelecek = tablo.get(anahtar)
+            sahip = gelecek is None
+            if sahip:
+                gelecek = tablo[anahtar] = Future()
+                while len(tablo) > self.max_kayit:
+                    tablo.popitem(last=False)
+            else:
+                tablo.move_to_end(anahtar)
+        if not sahip:
+            self._say(f"{ad}_onbellek" if gelecek.done() else f"{ad}_ortak")
+            return gelecek.result()
+        self._say(f"{ad}_istek")
+        try:
+            sonuc = uret()
+        except BaseException as hata:
+            self._birak(tablo, anahtar, gelecek)
+            gelecek.set_exception(hata)
+            raise
+        gelecek.set_result(sonuc)
+        if not kalici:
+            self._birak(tablo, anahtar, gelecek)
+        return sonuc
+
+    def _birak(self, tablo, anahtar, gelecek):
+        with self.kilit:
+            if tablo.get(anahtar) is gelecek:
+                del tablo[anahtar]
+
+    def _hedgeli(self, tur, uret):
+        """uret'i calistir; gozlenen p95 (ya da hedge_sn) icinde bitmezse bir kez daha
+        gonder, ilk basarili cevap kazanir. Ikisi de hata alirsa son hata yukari gider."""
+        baslangic = time.monotonic()
+        with self.kilit:
+            hedge_sn = hedge_suresi(self.sureler[tur], self.hedge_sn)
+        isler = {self.son_havuz.submit(uret)}
+        bitenler, _ = wait(isler, timeout=hedge_sn)
+        if not bitenler:
+            self._say(f"{tur}_hedge")
+            isler.add(self.son_havuz.submit(uret))
+        while True:
+            bitenler, isler = wait(isler, return_when=FIRST_COMPLETED)
+            basarili = [is_ for is_ in bitenler if is_.exception() is None]
+            if basarili:
+                with self.kilit:
+                    self.sureler[tur].append(time.monotonic() - baslangic)
+                return basarili[0].result()
+            if not isler:
+                return bitenler.pop().result()
+
+    def _not(self, bolum, metin, jd_text, tr):
+        anahtar = metin_hash("\0".join((bolum, metin, jd_text, "tr" if tr else "en")))
+        return self._tekil(self.notlar, anahtar, "bolum", True,
+                           lambda: self.not_uretici(bolum, metin, jd_text, tr))
+
+    def olustur(self, cv_text, jd_text, puan, eksik, format_sorunlari, tr=True):
+        """Kisa ya da basliksiz CV'de tek istek (ai_feedback_olustur); aksi halde map-reduce."""
+        parcalar, kisa = bolum_parcalari(cv_text) if len(cv_text) > self.min_karakter else ([], "")
+        if len(parcalar) < 2:
+            return self._hedgeli("tek", lambda: ai_feedback_olustur(cv_text, jd_text, puan, eksik,
+                                                                    format_sorunlari, tr))
+        self._say("bolumlu_rapor")
+        isler = [self.havuz.submit(self._not, bolum, metin, jd_text, tr) for bolum, metin in parcalar]
+        # Hata yukari gider (yonetici yeniden dener); tamamlanan bolumler onbellekte kalir
+        notlar = [(bolum, is_.result()) for (bolum, _), is_ in zip(parcalar, isler)]
+        anahtar = metin_hash(json.dumps([notlar, kisa, jd_text, puan, list(eksik), list(format_sorunlari), tr],
+                                        ensure_ascii=False))
+        return self._tekil(self.birlestirmeler, anahtar, "birlestirme", False, lambda: self._hedgeli(
+            "birlestirme", lambda: self.birlestirici(notlar, kisa, jd_text, puan, eksik, format_sorunlari, tr)))
+
+    def istatistik(self):
+        with self.kilit:
+            return {"kayit": len(self.notlar), "birlestirme_devam": len(self.birlestirmeler), **self.sayaclar}
+
+
+@st.cache_resource
+def bolumlu_feedback():
+    """Tum oturumlarin paylastigi bolum notu onbellegi ve istek havuzu."""
+    return BolumluFeedback(hedge_sn=AI_HEDGE_SN)
+
+
+# ── AI FEEDBACK: GECIKME BUTCESI ──
+# Analiz LLM'i en fazla AI_BUTCE_SN bekler. Cevap gozlenen basarili istek
+# surelerinin p95'i icinde gelmezse ayni istek bir kez daha gonderilir (ilk gelen
+# kazanir); boylece normal istekler degil, sadece kuyruktaki yavas istekler
+# ikilenir. Yeterli ornek yokken hedge yapilmaz. ATS_AI_HEDGE_SN verilirse sabit
+# sure kullanilir. Hata alan istek kisa bir beklemeyle yeniden denenir. Butce
+# dolarsa kural tabanli ozet gosterilir, LLM cevabi gelince onun yerine konur.
+AI_BUTCE_SN = float(os.environ.get("ATS_AI_BUTCE_SN", "8"))
+AI_HEDGE_SN = float(os.environ["ATS_AI_HEDGE_SN"]) if os.environ.get("ATS_AI_HEDGE_SN") else None
+AI_HEDGE_YUZDELIK = 95
+AI_HEDGE_MIN_ORNEK = 20
+AI_MAX_DENEME = int(os.environ.get("ATS_AI_MAX_DENEME", "3"))
+AI_ISTEK_ZAMAN_ASIMI = float(os.environ.get("ATS_AI_ISTEK_ZAMAN_ASIMI", "45"))
+AI_YOKLAMA_SN = 2.0
+# Tum denemeler bu surede biter; daha uzun bekleyen is icin yoklama birakilir
+AI_YOKLAMA_MAX_SN = AI_ISTEK_ZAMAN_ASIMI * AI_MAX_DENEME + AI_BUTCE_SN
+AI_MAX_KAYIT = 200
+
+
+def hedge_suresi(sureler, hedge_sn=None):
+    """Sabit hedge_sn ya da basarili istek surelerinin p95'i; ornek azsa None."""
+    if hedge_sn is not None:
+        return hedge_sn
+    sureler = sorted(sureler)
+    if len(sureler) < AI_HEDGE_MIN_ORNEK:
+        return None
+    return sureler[min(len(sureler) - 1, len(sureler) * AI_HEDGE_YUZDELIK // 100)]
+
+
+class AIFeedbackIsi:
+    """Tek bir feedback istegi; paralel denemelerden ilk basarili cevap kazanir."""
+
+    def __init__(self, args):
+        self.args = args
+        self.baslangic = time.monotonic()
+        self.deneme = 0
+        self.devam_eden = 0
+        self.hedge = False
+        self.metin = None
+        self.hata = None
+        self.bitti = threading.Event()
+
+
+class AIFeedbackYoneticisi:
+    """anahtar -> AIFeedbackIsi. Ayni CV/ilan icin ayni anda tek is calisir."""
+
+    def __init__(self, uretici=None, isci=8, max_kayit=AI_MAX_KAYIT,
+                 hedge_sn=AI_HEDGE_SN, max_deneme=AI_MAX_DENEME):
+        self.uretici = uretici or ai_feedback_olustur
+        self.havuz = ThreadPoolExecutor(max_workers=isci, thread_name_prefix="ai_feedback")
+        self.max_kayit = max_kayit
+        self.hedge_sn = hedge_sn
+        self.sureler = deque(maxlen=200)  # basarili deneme sureleri (sn)
+        self.max_deneme = max_deneme
+        self.kilit = threading.Lock()
+        self.isler = OrderedDict()
+
+    def baslat(self, anahtar, *args, yenile=False):
+        """Isi baslat; ayni anahtar icin devam eden ya da basarili is varsa onu dondur.
+
+        yenile=True iken basarili is yeniden kullanilmaz (devam eden is yine paylasilir).
+        """
+        with self.kilit:
+            is_ = self.isler.get(anahtar)
+            if is_ is not None and ((is_.metin is not None and not yenile) or not is_.bitti.is_set()):
+                self.isler.move_to_end(anahtar)
+                return is_
+            is_ = AIFeedbackIsi(args)
+            self.isler[anahtar] = is_
+            while len(self.isler) > self.max_kayit:
+                self.isler.popitem(last=False)
+            self._gonder(is_)
+        return is_
+
+    def al(self, anahtar):
+        with self.kilit:
+            return self.isler.get(anahtar)
+
+    def _gonder(self, is_, gecikme=0.0):
+        # kilit altinda cagrilir
+        is_.deneme += 1
+        is_.devam_eden += 1
+        self.havuz.submit(self._calistir, is_, gecikme)
+
+    def hedge_suresi(self):
+        """Hedge icin beklenecek sure: sabit hedge_sn ya da gozlenen p95; ornek azsa None."""
+        with self.kilit:
+            return hedge_suresi(self.sureler, self.hedge_sn)
+
+    def _calistir(self, is_, gecikme):
+        if gecikme:
+            time.sleep(gecikme)
+        baslangic = time.monotonic()
+        try:
+            metin = self.uretici(*is_.args)
+        except Exception as e:
+            with self.kilit:
+                is_.devam_eden -= 1
+                is_.hata = str(e)
+                if is_.metin is None and is_.deneme < self.max_deneme:
+                    sayac("ai_yeniden_deneme")
+                    self._gonder(is_, gecikme=min(2.0, 0.25 * 2 ** is_.deneme))
+                elif is_.devam_eden == 0 and is_.metin is None:
+                    sayac("ai_hata")
+                    is_.bitti.set()
+            return
+        with self.kilit:
+            self.sureler.append(time.monotonic() - baslangic)
+            is_.devam_eden -= 1
+            if is_.metin is None:
+                is_.metin = metin
+                is_.bitti.set()
+
+    def bekle(self, is_, butce=AI_BUTCE_SN):
+        """En fazla butce kadar bekle; cevap gelmediyse None. Gerekirse hedge istegi gonderir."""
+        son = time.monotonic() + butce
+        hedge_sn = self.hedge_suresi()
+        hedge_zamani = is_.baslangic + (hedge_sn if hedge_sn is not None else float("inf"))
+        while not is_.bitti.is_set():
+            simdi = time.monotonic()
+            if simdi >= son:
+                sayac("ai_butce_asimi")
+                return None
+            if not is_.hedge and simdi >= hedge_zamani:
+                with self.kilit:
+                    if not is_.bitti.is_set() and is_.deneme < self.max_deneme:
+                        sayac("ai_hedge")
+                        self._gonder(is_)
+                    is_.hedge = True
+                continue
+            is_.bitti.wait((son if is_.hedge else min(son, hedge_zamani)) - simdi)
+        return is_.metin
+
+
+@st.cache_resource
+def ai_feedback_yoneticisi():
+    """Tum oturumlarin paylastigi AI feedback havuzu."""
+    if AI_BOLUMLU:
+        # Bolumlu uretici sadece son istegini hedge'ler (bkz. BolumluFeedback)
+        return AIFeedbackYoneticisi(uretici=bolumlu_feedback().olustur, hedge_sn=float("inf"))
+    return AIFeedbackYoneticisi()
+
+
+KURAL_ONERILERI = {
+    "keyword_match": (
+        "Ilandaki anahtar kelimeleri deneyim ve beceri satirlarina dogal bicimde ekle.",
+        "Work the job ad's keywords naturally into your experience and skills lines.",
+    ),
+    "section_structure": (
+        "Deneyim, Egitim, Beceriler ve Sertifikalar basliklarini acikca yaz; en uste kisa bir ozet ekle.",
+        "Use clear Experience, Education, Skills and Certifications headings and add a short summary.",
+    ),
+    "bullet_quality": (
+        "Deneyimleri '-' ile baslayan maddelere bol ve her maddeye guclu bir fiille basla (yonettim, gelistirdim...).",
+        "Split experience into '-' bullets and start each with a strong verb (led, built, delivered...).",
+    ),
+    "formatting": (
+        "Email, telefon ve LinkedIn bilgisini ekle; CV'yi 200-800 kelime araliginda tut.",
+        "Include email, phone and LinkedIn; keep the CV between 200 and 800 words.",
+    ),
+    "quantified_achievements": (
+        "Basarilarini sayilarla anlat: %, musteri sayisi, ciro, proje adedi gibi.",
+        "Quantify achievements: %, number of customers, revenue, projects delivered.",
+    ),
+}
+
+
+def kural_tabanli_feedback(puan, breakdown, eksik, format_sorunlari, tr=True, neden="zaman"):
+    """LLM yetismezse gosterilen, puanlama sonucundan uretilen deterministik feedback.
+
+    neden: "zaman" (butce doldu, cevap hala gelebilir) ya da "hata" (tum denemeler basarisiz).
+    """
+    etiketler = breakdown_etiketleri(tr)
+    oranlar = []
+    for anahtar, etiket in etiketler.items():
+        max_puan = int(re.search(r"\((\d+)\)", etiket).group(1))
+        oranlar.append((breakdown.get(anahtar, 0) / max_puan, anahtar, etiket, max_puan))
+    zayiflar = [o for o in sorted(oranlar) if o[0] < 0.8][:3]
+
+    if tr:
+        seviye = "guclu" if puan >= 75 else "orta" if puan >= 50 else "gelistirilmeli"
+        satirlar = [
+            "## 📋 Hizli Degerlendirme",
+            "_AI yorumu zamaninda hazirlanamadigi icin bu ozet puanlama kurallarindan uretildi._" if neden == "zaman"
+            else "_AI servisine su an ulasilamadigi icin bu ozet puanlama kurallarindan uretildi._",
+            "",
+            f"ATS puanin **{puan}/100**; ilana uyum seviyesi **{seviye}**.",
+            "",
+            "## ⚠️ Oncelikli Iyilestirmeler",
+        ]
+    else:
+        seviye = "strong" if puan >= 75 else "fair" if puan >= 50 else "needs work"
+        satirlar = [
+            "## 📋 Quick Assessment",
+            "_The AI review was not ready in time, so this summary is generated from the scoring rules._" if neden == "zaman"
+            else "_The AI service could not be reached, so this summary is generated from the scoring rules._",
+            "",
+            f"Your ATS score is **{puan}/100**; fit for this job is **{seviye}**.",
+            "",
+            "## ⚠️ Priority Improvements",
+        ]
+    for i, (_, anahtar, etiket, max_puan) in enumerate(zayiflar, 1):
+        oneri = KURAL_ONERILERI[anahtar][0 if tr else 1]
+        satirlar.append(f"{i}. **{etiket.rsplit(' (', 1)[0]}** ({breakdown.get(anahtar, 0)}/{max_puan}): {oneri}")
+    if not zayiflar:
+        satirlar.append("Tum kategorilerde iyi durumdasin." if tr else "You are doing well in every category.")
+    if eksik:
+        satirlar += ["", "## 🔑 Eklenecek Kelimeler" if tr else "## 🔑 Keywords to Add",
+                     ", ".join(f"`{k}`" for k in eksik[:10])]
+    if format_sorunlari:
+        satirlar += ["", "## 🧾 Format" if tr else "## 🧾 Formatting"]
+        satirlar += [f"- {format_sorunu_metni(sorun, tr)}" for sorun in format_sorunlari[:5]]
+    return "\n".join(satirlar)
+
+
+# ── PAYLASILAN ICERIK DEPOSU ──
+# Oturumlar sadece hash ve kucuk sonuc kayitlari tutar; CV/JD metinleri ve
+# LLM cevaplari burada, icerige gore tek kopya olarak saklanir.
+DEPO_MAX_MB = float(os.environ.get("ATS_DEPO_MAX_MB", "64"))
+OTURUM_ZAMAN_ASIMI = int(os.environ.get("ATS_OTURUM_ZAMAN_ASIMI", "1800"))
+
+
+class IcerikDeposu:
+    """Icerik adresli, boyut sinirli (LRU) metin deposu.
+
+    Aktif oturumlarin kullandigi metinler tahliyede en son sirada gelir;
+    OTURUM_ZAMAN_ASIMI boyunca hareketsiz kalan oturumlarin kayitlari dusurulur.
+    """
+
+    def __init__(self, max_bayt=int(DEPO_MAX_MB * 1024 * 1024), zaman_asimi=OTURUM_ZAMAN_ASIMI):
+        self.max_bayt = max_bayt
+        self.zaman_asimi = zaman_asimi
+        self.kilit = threading.Lock()
+        self.metinler = OrderedDict()  # hash -> metin
+        self.bayt = 0
+        self.ek_bayt = 0  # ayni sinira dahil diger yapilar (canli puanlayicilar)
+        self.oturumlar = {}  # oturum_id -> (son_aktivite, frozenset(hash))
+
+    def koy(self, metin):
+        h = metin_hash(metin)
+        with self.kilit:
+            if h in self.metinler:
+                self.metinler.move_to_end(h)
+                sayac("depo_tekrar")
+            else:
+                self.metinler[h] = metin
+                self.bayt += sys.getsizeof(metin)
+                self._sigdir()
+        return h
+
+    def al(self, h):
+        """Metni dondur; tahliye edildiyse None."""
+        with self.kilit:
+            metin = self.metinler.get(h)
+            if metin is not None:
+                self.metinler.move_to_end(h)
+        return metin
+
+    def oturum_bildir(self, oturum_id, hashler):
+        """Oturumun aktif oldugunu ve hangi metinleri kullandigini kaydet."""
+        with self.kilit:
+            self.oturumlar[oturum_id] = (time.time(), frozenset(hashler))
+            self._bostakileri_at()
+
+    def son_aktivite(self, oturum_id):
+        with self.kilit:
+            kayit = self.oturumlar.get(oturum_id)
+        return kayit[0] if kayit else None
+
+    def ek_bayt_ayarla(self, bayt):
+        """Sinira dahil dis yapilarin toplam boyutu; asilirsa kullanilmayan metinler atilir."""
+        with self.kilit:
+            self.ek_bayt = bayt
+            self._sigdir()
+
+    def _bostakileri_at(self):
+        sinir = time.time() - self.zaman_asimi
+        for oturum_id in [o for o, (t, _) in self.oturumlar.items() if t < sinir]:
+            del self.oturumlar[oturum_id]
+            sayac("oturum_bosta_atildi")
+
+    def _sil(self, h):
+        self.bayt -= sys.getsizeof(self.metinler.pop(h))
+        sayac("depo_tahliye")
+
+    def _sigdir(self):
+        if self.bayt + self.ek_bayt <= self.max_bayt:
+            return
+        self._bostakileri_at()
+        kullanilan = set()
+        for _, hashler in self.oturumlar.values():
+            kullanilan |= hashler
+        # Once hicbir aktif oturumun kullanmadigi en eski metinler
+        for h in list(self.metinler):
+            if self.bayt + self.ek_bayt <= self.max_bayt:
+                break
+            if h not in kullanilan:
+                self._sil(h)
+        # Hala sigmiyorsa aktif oturumlarin en eski metinleri (en yenisi kalir)
+        while self.bayt > self.max_bayt and len(self.metinler) > 1:
+            self._sil(next(iter(self.metinler)))
+
+    def istatistik(self):
+        with self.kilit:
+            return {
+                "metin": len(self.metinler),
+                "bayt": self.bayt,
+                "ek_bayt": self.ek_bayt,
+                "max_bayt": self.max_bayt,
+                "aktif_oturum": len(self.oturumlar),
+            }
+
+
+@st.cache_resource
+def icerik_deposu():
+    """Tum oturumlarin paylastigi icerik deposu."""
+    return IcerikDeposu()
+
+
+def derin_boyut(nesne, gorulen=None):
+    """Nesnenin ve icerdiklerinin yaklasik toplam bellek boyutu (bayt)."""
+    if gorulen is None:
+        gorulen = set()
+    if id(nesne) in gorulen:
+        return 0
+    gorulen.add(id(nesne))
+    boyut = sys.getsizeof(nesne)
+    if isinstance(nesne, dict):
+        boyut += sum(derin_boyut(k, gorulen) + derin_boyut(v, gorulen) for k, v in nesne.items())
+    elif isinstance(nesne, (list, tuple, set, frozenset)):
+        boyut += sum(derin_boyut(x, gorulen) for x in nesne)
+    elif hasattr(nesne, "__dict__"):
+        boyut += derin_boyut(vars(nesne), gorulen)
+    return boyut
+
+
+BREAKDOWN_ANAHTARLARI = ("keyword_match", "section_structure", "bullet_quality", "formatting",
+                         "quantified_achievements")
+SONUC_METINLERI = ("cv", "jd", "ai", "listeler")
+
+
+def sonuc_kaydi(depo, cv_text, jd_text, ai_feedback, puan, breakdown, bolumler, eslesen, eksik,
+                format_sorunlari, yakin_kopya, ai_bekleyen=None):
+    """Oturumda tutulan kompakt analiz kaydi; metinler ve kelime listeleri depoda."""
+    listeler = json.dumps([list(eslesen), list(eksik), list(format_sorunlari)], ensure_ascii=False)
+    return {
+        "cv": depo.koy(cv_text),
+        "jd": depo.koy(jd_text),
+        "ai": depo.koy(ai_feedback),
+        "listeler": depo.koy(listeler),
+        "puan": puan,
+        "breakdown": tuple(breakdown[k] for k in BREAKDOWN_ANAHTARLARI),
+        "bolumler": tuple(bolumler[k] for k in BOLUM_ANAHTARLARI),
+        # (benzerlik, ayni_ilan, feedback_tekrar_kullanildi)
+        "yakin_kopya": (
+            (yakin_kopya["benzerlik"], yakin_kopya["ayni_ilan"], bool(yakin_kopya["ai_feedback"]))
+            if yakin_kopya else None
+        ),
+        # Kural tabanli ozet gosteriliyorsa beklenen LLM isinin anahtari
+        "ai_bekleyen": ai_bekleyen,
+    }
+
+
+def oturum_hashleri(oturum):
+    """Oturumun depoda kullandigi tum hash'ler."""
+    hashler = {h for _, h, _ in oturum.get("sohbet", [])}
+    sonuc = oturum.get("sonuc")
+    if sonuc:
+        hashler.update(sonuc[k] for k in SONUC_METINLERI)
+    return hashler
+
+
+def oturum_bakimi(depo):
+    """Aktiviteyi depoya bildir; zaman asimina ugramis ya da tahliye edilmis oturumu sifirla."""
+    oturum = st.session_state
+    son = depo.son_aktivite(oturum.oturum_id)
+    sonuc = oturum.get("sonuc")
+    suresi_doldu = son is not None and time.time() - son > depo.zaman_asimi
+    if sonuc and (suresi_doldu or any(depo.al(h) is None for h in oturum_hashleri(oturum))):
+        oturum.sonuc = None
+        oturum.sohbet = []
+        oturum.oturum_suresi_doldu = True
+    if suresi_doldu:
+        canli_puanlayici_deposu().sil(oturum.oturum_id)
+    depo.oturum_bildir(oturum.oturum_id, oturum_hashleri(oturum))
+
+
+def sohbet_gecmisi(depo, sohbet):
+    """Birlesik sohbet listesinden LLM'e gidecek mesaj gecmisini uret."""
+    return [{"role": rol, "content": depo.al(h) or ""} for rol, h, gecmiste in sohbet if gecmiste]
+
+
+def sohbet_cevapla(depo, soru, tr, on_getirilmis=False):
+    """Soruyu cevapla ve birlesik sohbete ekle. Sohbet kaydi: (rol, hash, gecmise_dahil)."""
+    sonuc = st.session_state.sonuc
+    sohbet = st.session_state.sohbet
+    cv_text, jd_text = depo.al(sonuc["cv"]), depo.al(sonuc["jd"])
+    with st.spinner("AI cevap yaziyor..." if tr else "AI is typing..."):
+        try:
+            cevap = None
+            gecmis = sohbet_gecmisi(depo, sohbet)
+            if on_getirilmis and ON_GETIR_AKTIF:
+                cevap = on_getirme_deposu().al(cv_text, jd_text, soru, gecmis)
+            if cevap is None:
+                cevap = ai_soru_cevap(soru, cv_text, jd_text, gecmis, tr)
+            sohbet.append(("user", depo.koy(soru), True))
+            sohbet.append(("assistant", depo.koy(cevap), True))
+        except Exception:
+            # Hatali turlar gosterilir ama LLM gecmisine girmez
+            sohbet.append(("user", depo.koy(soru), False))
+            sohbet.append(("assistant", depo.koy("Hata olustu." if tr else "An error occurred."), False))
+    # Parca (fragment) calismalarinda main -> oturum_bakimi calismaz; yeni hash'leri burada bildir
+    depo.oturum_bildir(st.session_state.oturum_id, oturum_hashleri(st.session_state))
+
+
+def hizli_sorular(tr):
+    """Sohbetteki hazir soru butonlari: [(buton_etiketi, soru)]."""
+    if tr:
+        return [
+            ("📝 Cover Letter Yaz", "Bu is icin Turkce cover letter yazar misin?"),
+            ("🎯 Mulakat Sorulari", "Bu is icin hangi mulakat sorulari gelebilir?"),
+            ("💰 Maas Tavsiyesi", "Bu pozisyon icin ne kadar maas beklentisi olmali?"),
+        ]
+    return [
+        ("📝 Write Cover Letter", "Can you write a cover letter for this job in English?"),
+        ("🎯 Interview Questions", "What interview questions might come up for this job?"),
+        ("💰 Salary Advice", "What salary should I expect for this position?"),
+    ]
+
+
+# ── HAZIR SORULAR ICIN ON-GETIRME ──
+# Analizden hemen sonra hazir sorularin cevaplari arka planda uretilir;
+# butona basilinca cevap beklemeden gosterilir. Cevaplar bos sohbet gecmisiyle,
+# normal tiklamayla ayni token sinirinda (AI_SORU_TOKEN) uretilir; gecmis anahtarin
+# parcasi oldugundan sohbet baslamissa on-getirilmis cevap kullanilmaz. Bekleme
+# AI_BUTCE_SN ile sinirlidir. Tiklanmadan suresi dolan, oturumu yeni analizle
+# degisen ya da kapasite yuzunden atilan cevaplar "bosa" sayilir.
+ON_GETIR_AKTIF = os.environ.get("ATS_ON_GETIR", "") == "1"
+ON_GETIR_TOKEN_BUTCE = int(os.environ.get("ATS_ON_GETIR_TOKEN_BUTCE", "3000"))
+ON_GETIR_MAX_KAYIT = int(os.environ.get("ATS_ON_GETIR_MAX_KAYIT", "300"))
+BOS_GECMIS = metin_hash("[]")
+
+
+class OnGetirmeDeposu:
+    """(CV hash, JD hash, soru, gecmis hash) -> [oturum_id, zaman, Future].
+
+    Boyut ve sure sinirli; kullanilmadan atilanlar sayilir.
+    """
+
+    def __init__(self, isci=3, max_kayit=ON_GETIR_MAX_KAYIT, zaman_asimi=OTURUM_ZAMAN_ASIMI):
+        self.havuz = ThreadPoolExecutor(max_workers=isci, thread_name_prefix="on_getir")
+        self.max_kayit = max_kayit
+        self.zaman_asimi = zaman_asimi
+        self.kilit = threading.Lock()
+        self.isler = OrderedDict()
+        self.uretilen = 0
+        self.kullanilan = 0
+        self.bosa = 0
+
+    def _at(self, anahtar):
+        # kilit altinda cagrilir
+        _, _, is_ = self.isler.pop(anahtar)
+        is_.cancel()
+        self.bosa += 1
+        sayac("on_getir_bosa")
+
+    def _temizle(self):
+        # kilit altinda cagrilir; en eski kayit basta
+        sinir = time.time() - self.zaman_asimi
+        while self.isler and next(iter(self.isler.values()))[1] < sinir:
+            self._at(next(iter(self.isler)))
+        while len(self.isler) > self.max_kayit:
+            self._at(next(iter(self.isler)))
+
+    def baslat(self, cv_text, jd_text, sorular, tr, oturum_id=None, token_butcesi=ON_GETIR_TOKEN_BUTCE):
+        """Butceye sigan kadar soruyu arka planda baslat; oturumun onceki analizinden
+        kalan kullanilmamis cevaplar atilir."""
+        adet = min(len(sorular), token_butcesi // AI_SORU_TOKEN)
+        cv_hash, jd_hash = metin_hash(cv_text), metin_hash(jd_text)
+        anahtarlar = [(cv_hash, jd_hash, soru, BOS_GECMIS) for soru in sorular[:adet]]
+        with self.kilit:
+            if oturum_id is not None:
+                for anahtar in [a for a, (o, _, _) in self.isler.items() if o == oturum_id]:
+                    if anahtar not in anahtarlar:
+                        self._at(anahtar)
+            for anahtar in anahtarlar:
+                if anahtar in self.isler:
+                    continue
+                self.isler[anahtar] = [oturum_id, time.time(), self.havuz.submit(
+                    ai_soru_cevap, anahtar[2], cv_text, jd_text, [], tr, AI_SORU_TOKEN
+                )]
+                self.uretilen += 1
+                sayac("on_getir_baslatilan")
+            self._temizle()
+
+    def al(self, cv_text, jd_text, soru, gecmis=(), zaman_asimi=AI_BUTCE_SN):
+        """On-getirilmis cevabi dondur; yoksa, hata aldiysa ya da zamaninda bitmediyse None."""
+        gecmis_hash = metin_hash(json.dumps(list(gecmis), ensure_ascii=False))
+        with self.kilit:
+            self._temizle()
+            kayit = self.isler.pop((metin_hash(cv_text), metin_hash(jd_text), soru, gecmis_hash), None)
+        if kayit is None:
+            sayac("on_getir_iska")
+            return None
+        try:
+            cevap = kayit[2].result(timeout=zaman_asimi)
+        except Exception:
+            # Hata ya da butce asimi: cevap normal istekle uretilir, bu sonuc bosa gider
+            with self.kilit:
+                self.bosa += 1
+            sayac("on_getir_bosa")
+            return None
+        with self.kilit:
+            self.kullanilan += 1
+        sayac("on_getir_isabet")
+        return cevap
+
+    def istatistik(self):
+        with self.kilit:
+            self._temizle()
+            return {
+                "uretilen": self.uretilen,
+                "kullanilan": self.kullanilan,
+                "bosa": self.bosa,
+                "bekleyen": len(self.isler),
+                "isabet_orani": round(self.kullanilan / self.uretilen, 3) if self.uretilen else None,
+            }
+
+
+@st.cache_resource
+def on_getirme_deposu():
+    """Tum oturumlarin paylastigi on-getirme havuzu."""
+    return OnGetirmeDeposu()
+
+
 def score_color(score):
     if score >= 75:
         return "#2ecc71"
@@ -475,37 +2339,584 @@ def score_color(score):
         return "#e74c3c"
 
 
-def render_score_gauge(score):
+@functools.lru_cache(maxsize=101)
+def skor_gostergesi_html(score):
     color = score_color(score)
     label = "Guclu Esleme ✅" if score >= 75 else ("Orta Esleme ⚠️" if score >= 50 else "Zayif Esleme ❌")
     filled = int(score / 5)
     bar = "█" * filled + "░" * (20 - filled)
-    st.markdown(
+    return (
         f"<h1 style='color:{color}; font-size:3rem;'>{score}/100</h1>"
         f"<p style='font-family:monospace; letter-spacing:2px; color:{color};'>{bar}</p>"
-        f"<p style='font-size:1.2rem;'>{label}</p>",
-        unsafe_allow_html=True
+        f"<p style='font-size:1.2rem;'>{label}</p>"
     )
 
 
+def render_score_gauge(score):
+    st.markdown(skor_gostergesi_html(score), unsafe_allow_html=True)
+
+
+def breakdown_etiketleri(tr):
+    if tr:
+        return {
+            "keyword_match": "Keyword Eslesmesi (30)",
+            "section_structure": "Bolum Yapisi (20)",
+            "bullet_quality": "Bullet Kalitesi (20)",
+            "formatting": "Format (15)",
+            "quantified_achievements": "Sayisal Basarilar (15)"
+        }
+    return {
+        "keyword_match": "Keyword Match (30)",
+        "section_structure": "Section Structure (20)",
+        "bullet_quality": "Bullet Quality (20)",
+        "formatting": "Formatting (15)",
+        "quantified_achievements": "Quantified Achievements (15)"
+    }
+
+
+def render_canli_puan(cv_text, jd_text, tr):
+    """Canli modda artimli puani goster. LLM cagrilmaz; feedback icin Analiz butonu kullanilir."""
+    puanlayicilar = canli_puanlayici_deposu()
+    puanlayici = puanlayicilar.al(st.session_state.oturum_id)
+    yeni = (puanlayici is None or puanlayici.jd_text != jd_text
+            or puanlayici.paket_kimlik != veri_paketi()["kimlik"])
+    if yeni:
+        puanlayici = CanliPuanlayici(jd_text)
+    baslangic = time.perf_counter()
+    with olcum("canli_puan"):
+        islenen = puanlayici.guncelle(cv_text)
+        sonuc = puanlayici.sonuc()
+    sure_ms = (time.perf_counter() - baslangic) * 1000
+    if yeni or islenen:
+        puanlayicilar.koy(st.session_state.oturum_id, puanlayici)  # boyut depo sinirina yazilir
+
+    c_puan, c_detay = st.columns([1, 3])
+    with c_puan:
+        onceki = puanlayici.onceki_puan
+        st.metric(
+            "⚡ Canli ATS Puani" if tr else "⚡ Live ATS Score", f"{sonuc['puan']}/100",
+            delta=sonuc["puan"] - onceki if onceki is not None else None
+        )
+    with c_detay:
+        for key, label in breakdown_etiketleri(tr).items():
+            st.caption(f"{label}: **{sonuc['breakdown'].get(key, 0)}**")
+        st.caption(
+            f"{sure_ms:.1f} ms · {islenen} {'satir yeniden islendi' if tr else 'lines re-scored'}"
+            + (" · AI feedback icin Analiz Et'e basin." if tr else " · Press Analyze for AI feedback.")
+        )
+
+
+@st.fragment(run_every=AI_YOKLAMA_SN)
+def ai_feedback_yoklama(depo, tr):
+    """Bekleyen LLM feedback'i gelince kural tabanli ozetin yerine koy."""
+    sonuc = st.session_state.get("sonuc")
+    anahtar = sonuc and sonuc.get("ai_bekleyen")
+    if not anahtar:
+        # Sonuc degisti ya da temizlendi: tam yeniden calistirma fragment'i kaldirir
+        st.rerun()
+    is_ = ai_feedback_yoneticisi().al(anahtar)
+    if is_ is not None and not is_.bitti.is_set() and time.monotonic() - is_.baslangic < AI_YOKLAMA_MAX_SN:
+        st.caption("⏳ AI yorumu hazirlaniyor; hazir olunca bu ozetin yerine gelecek." if tr
+                   else "⏳ The AI review is on its way and will replace this summary.")
+        return
+    yeni = dict(sonuc, ai_bekleyen=None)
+    if is_ is not None and is_.metin is not None:
+        sayac("ai_gec_yukseltme")
+        yeni["ai"] = depo.koy(is_.metin)
+        cv_text, jd_text = depo.al(sonuc["cv"]), depo.al(sonuc["jd"])
+        if cv_text and jd_text:
+            yakin_kopya_kaydet(cv_text, jd_text, is_.metin, tr)
+    else:
+        # Tum denemeler basarisiz, is suresini asti ya da atildi: cevap artik gelmeyecek,
+        # ozetin aciklamasini duzelt
+        _, eksik, format_sorunlari = json.loads(depo.al(sonuc["listeler"]) or "[[], [], []]")
+        breakdown = dict(zip(BREAKDOWN_ANAHTARLARI, sonuc["breakdown"]))
+        yeni["ai"] = depo.koy(kural_tabanli_feedback(sonuc["puan"], breakdown, eksik, format_sorunlari, tr, neden="hata"))
+    st.session_state.sonuc = yeni
+    depo.oturum_bildir(st.session_state.oturum_id, oturum_hashleri(st.session_state))
+    st.rerun()
+
+
+def render_debug_panel(tr):
+    """ATS_OLCUM=1 iken sidebar'da asama sureleri ve sayaclari goster."""
+    kayit = metrik_kaydi()
+    ozet = kayit.ozet()
+    with st.expander("🛠️ Debug / Metrikler" if tr else "🛠️ Debug / Metrics"):
+        if ozet["sureler"]:
+            st.table([{"asama": a, **v} for a, v in sorted(ozet["sureler"].items())])
+        else:
+            st.caption("Henuz olcum yok." if tr else "No measurements yet.")
+        if ozet["sayaclar"]:
+            st.json(ozet["sayaclar"])
+        st.caption("Oturum / depo" if tr else "Session / store")
+        st.json({
+            "oturum_bayt": derin_boyut({k: st.session_state[k] for k in st.session_state}),
+            **icerik_deposu().istatistik(),
+        })
+        st.caption("Canli puanlayicilar" if tr else "Live scorers")
+        st.json(canli_puanlayici_deposu().istatistik())
+        st.caption("Veri paketi" if tr else "Data pack")
+        st.json(_VERI_DEPOSU.istatistik())
+        havuz = ayristirma_havuzu()
+        if havuz is not None:
+            st.caption("Ayristirma havuzu" if tr else "Parsing pool")
+            st.json(havuz.istatistik())
+        if ON_GETIR_AKTIF:
+            st.caption("On-getirme" if tr else "Prefetch")
+            st.json(on_getirme_deposu().istatistik())
+        if AI_BOLUMLU:
+            st.caption("Bolumlu AI feedback" if tr else "Sectioned AI feedback")
+            st.json(bolumlu_feedback().istatistik())
+        st.download_button(
+            "Prometheus (.txt)", kayit.prometheus(), file_name="ats_metrics.txt",
+            mime="text/plain", use_container_width=True
+        )
+        if st.button("Sifirla" if tr else "Reset", key="metrik_sifirla", use_container_width=True):
+            kayit.sifirla()
+            st.rerun()
+
+
+# ── SAYFA PARCALARI (FRAGMENT) ──
+# Sidebar, sonuc paneli ve sohbet ayri st.fragment'lar: bir sohbet turu ya da
+# tema tiklamasi sadece kendi parcasini yeniden calistirir. Her parcanin sunucu
+# suresi ATS_OLCUM=1 iken render_<parca> asamasi olarak olculur.
+TEMALAR = {
+    "lacivert": {"bg": "#f4f6fb", "sidebar": "linear-gradient(180deg, #1a1a2e 0%, #16213e 100%)", "header": "linear-gradient(135deg, #1a1a2e, #0f3460)", "accent": "#0f3460", "isim": "🌑 Lacivert"},
+    "yesil": {"bg": "#f0faf4", "sidebar": "linear-gradient(180deg, #0d2b1a 0%, #1a4a2e 100%)", "header": "linear-gradient(135deg, #0d2b1a, #1a6b3a)", "accent": "#1a6b3a", "isim": "🌿 Yeşil"},
+    "mor": {"bg": "#f5f0ff", "sidebar": "linear-gradient(180deg, #1a0a2e 0%, #2d1b4e 100%)", "header": "linear-gradient(135deg, #1a0a2e, #4a1a8e)", "accent": "#4a1a8e", "isim": "🔮 Mor"},
+    "kirmizi": {"bg": "#fff5f5", "sidebar": "linear-gradient(180deg, #2b0a0a 0%, #4a1a1a 100%)", "header": "linear-gradient(135deg, #2b0a0a, #8e1a1a)", "accent": "#8e1a1a", "isim": "🔴 Bordo"},
+    "turuncu": {"bg": "#fff8f0", "sidebar": "linear-gradient(180deg, #2b1a0a 0%, #4a2e0d 100%)", "header": "linear-gradient(135deg, #2b1a0a, #c45e0a)", "accent": "#c45e0a", "isim": "🟠 Turuncu"},
+    "gri": {"bg": "#f5f5f7", "sidebar": "linear-gradient(180deg, #1a1a1a 0%, #2d2d2d 100%)", "header": "linear-gradient(135deg, #1a1a1a, #3d3d3d)", "accent": "#3d3d3d", "isim": "⚫ Koyu Gri"},
+}
+
+
+@functools.lru_cache(maxsize=len(TEMALAR))
+def tema_css(tema_key):
+    tema = TEMALAR[tema_key]
+    bg = tema["bg"]
+    sidebar_bg = tema["sidebar"]
+    accent = tema["accent"]
+    header_grad = tema["header"]
+    return f"""
+    <style>
+    .stApp {{ background-color: {bg}; }}
+    [data-testid="stSidebar"] {{ background: {sidebar_bg} !important; }}
+    [data-testid="stSidebar"] * {{ color: #c8d0e7 !important; }}
+    [data-testid="stSidebar"] h1,
+    [data-testid="stSidebar"] h2,
+    [data-testid="stSidebar"] h3 {{ color: #ffffff !important; }}
+    [data-testid="stSidebar"] .stButton button {{
+        background: rgba(255,255,255,0.08) !important;
+        border: 1px solid rgba(255,255,255,0.2) !important;
+        color: #ffffff !important;
+        border-radius: 8px !important;
+        font-size: 0.82rem !important;
+    }}
+    [data-testid="stSidebar"] .stButton button:hover {{
+        background: rgba(255,255,255,0.15) !important;
+    }}
+    .main-header {{
+        background: {header_grad};
+        padding: 28px 35px;
+        border-radius: 16px;
+        margin-bottom: 24px;
+        display: flex;
+        align-items: center;
+        gap: 16px;
+        box-shadow: 0 8px 32px rgba(0,0,0,0.18);
+    }}
+    .main-header h1 {{ color: #ffffff !important; font-size: 2rem !important; font-weight: 800 !important; margin: 0 !important; letter-spacing: -0.5px; }}
+    .main-header p {{ color: #a8b2d8; font-size: 0.9rem; margin: 4px 0 0 0; }}
+    .stButton > button[kind="primary"] {{
+        background: {header_grad} !important;
+        color: white !important;
+        border: none !important;
+        border-radius: 10px !important;
+        font-weight: 700 !important;
+        font-size: 1rem !important;
+        padding: 14px !important;
+        transition: all 0.2s !important;
+    }}
+    .stButton > button[kind="primary"]:hover {{
+        opacity: 0.9 !important;
+        transform: translateY(-1px) !important;
+    }}
+    .step-card {{
+        background: rgba(255,255,255,0.05);
+        border: 1px solid rgba(255,255,255,0.1);
+        border-radius: 10px;
+        padding: 10px 14px;
+        margin: 6px 0;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+    }}
+    .step-num {{
+        background: {accent};
+        color: white;
+        width: 24px;
+        height: 24px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 0.75rem;
+        font-weight: 700;
+        flex-shrink: 0;
+    }}
+    </style>
+    """
+
+
+def tema_sec(tema_key):
+    st.session_state.tema = tema_key
+
+
+@st.fragment
+@olculu("render_sidebar")
+def render_sidebar(tr):
+    """Sidebar + tema CSS'i. Tema degisince sadece bu parca yeniden calisir; CSS global uygulanir."""
+    st.markdown(tema_css(st.session_state.tema), unsafe_allow_html=True)
+    st.markdown("""
+    <div style="padding:16px 0 8px 0; text-align:center;">
+        <p style="font-size:1.3rem; font-weight:800; color:#ffffff; margin:0; letter-spacing:-0.5px;">📄 ATS CV</p>
+        <p style="font-size:0.75rem; color:#6b7db3; margin:2px 0 0 0; letter-spacing:1px; text-transform:uppercase;">Optimizer</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    steps_tr = [
+        ("CV'nizi yukleyin", "PDF, DOCX veya metin"),
+        ("Is ilanini girin", "Kopyalayip yapistirin"),
+        ("Analiz edin", "Tek tiklama yeterli"),
+        ("Feedback alin", "AI destekli rapor"),
+        ("Bota sorun", "Cover letter, mulakat"),
+    ]
+    steps_en = [
+        ("Upload your CV", "PDF, DOCX or text"),
+        ("Enter job description", "Copy and paste"),
+        ("Analyze", "One click is enough"),
+        ("Get feedback", "AI-powered report"),
+        ("Ask the bot", "Cover letter, interview"),
+    ]
+    steps = steps_tr if tr else steps_en
+
+    st.markdown(f"<p style='color:#a8b2d8; font-size:0.7rem; letter-spacing:1.5px; text-transform:uppercase; margin-bottom:8px;'>{'NASIL KULLANILIR' if tr else 'HOW IT WORKS'}</p>", unsafe_allow_html=True)
+    for i, (title, desc) in enumerate(steps, 1):
+        st.markdown(f"""
+        <div class="step-card">
+            <div class="step-num">{i}</div>
+            <div>
+                <p style="margin:0; font-size:0.82rem; font-weight:600; color:#e0e6ff;">{title}</p>
+                <p style="margin:0; font-size:0.72rem; color:#6b7db3;">{desc}</p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    badges = [
+        ("✅", "Ucretsiz / Free"),
+        ("🔒", "Veri kaydetmez"),
+        ("🤖", "Groq AI powered"),
+        ("⚡", "Anlik analiz"),
+    ]
+    for icon, text in badges:
+        st.markdown(f"<p style='margin:4px 0; font-size:0.8rem; color:#a8b2d8;'>{icon} {text}</p>", unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.markdown(f"<p style='color:#a8b2d8; font-size:0.7rem; letter-spacing:1.5px; text-transform:uppercase; margin-bottom:8px;'>{'TEMA SEÇ' if tr else 'THEME'}</p>", unsafe_allow_html=True)
+    tema_secenekleri = {k: v["isim"] for k, v in TEMALAR.items()}
+    for tema_key, tema_isim in tema_secenekleri.items():
+        secili = "✦ " if tema_key == st.session_state.tema else ""
+        # on_click parca calismadan once uygulanir; ✦ isareti ve CSS ayni calismada guncellenir
+        st.button(f"{secili}{tema_isim}", key=f"tema_{tema_key}", use_container_width=True,
+                  on_click=tema_sec, args=(tema_key,))
+
+    st.markdown("---")
+    if st.button("🌐 Dil Degistir / Change Language", use_container_width=True):
+        st.session_state.dil = None
+        st.session_state.sonuc = None
+        st.rerun()
+
+    if OLCUM_AKTIF:
+        st.markdown("---")
+        render_debug_panel(tr)
+
+
+def sonuc_html(depo, ai_h, listeler_h):
+    """Bir analiz sonucunun HTML parcalari.
+
+    Onbellek depo hash'leriyle anahtarlanir ve sadece hash tutar; HTML'in kendisi depoda,
+    ATS_DEPO_MAX_MB sinirina dahil. Tahliye edilmis parcalar yeniden uretilip depoya geri
+    konur; icerik hash'i ayni oldugundan onbellekteki hash'ler yeniden gecerli olur.
+    """
+    ai_feedback, listeler = depo.al(ai_h), depo.al(listeler_h)
+    if ai_feedback is None or listeler is None:
+        # Kaynak tahliye edildi: bos sonucu onbellege alma
+        return _sonuc_html_uret(ai_feedback or "", listeler or "[[], [], []]")
+    try:
+        hashler, format_sorunlari = _sonuc_html_hashleri(depo, ai_h, listeler_h)
+    except LookupError:  # kaynak arada tahliye edildi
+        return _sonuc_html_uret(ai_feedback, listeler)
+    parcalar = {ad: depo.al(h) for ad, h in hashler.items()}
+    if None in parcalar.values():
+        parcalar = _sonuc_html_uret(ai_feedback, listeler)
+        for ad in hashler:
+            depo.koy(parcalar[ad])
+        return parcalar
+    return {**parcalar, "format_sorunlari": format_sorunlari}
+
+
+@functools.lru_cache(maxsize=256)
+def _sonuc_html_hashleri(depo, ai_h, listeler_h):
+    ai_feedback, listeler = depo.al(ai_h), depo.al(listeler_h)
+    if ai_feedback is None or listeler is None:
+        raise LookupError(ai_h if ai_feedback is None else listeler_h)
+    parcalar = _sonuc_html_uret(ai_feedback, listeler)
+    format_sorunlari = parcalar.pop("format_sorunlari")
+    return {ad: depo.koy(parca) for ad, parca in parcalar.items()}, format_sorunlari
+
+
+def _sonuc_html_uret(ai_feedback, listeler):
+    eslesen, eksik, format_sorunlari = json.loads(listeler)
+    return {
+        "feedback": f"<div style='background:#f8f9ff; border-left:4px solid #4a90e2; padding:20px; border-radius:8px; line-height:1.8;'>{ai_feedback}</div>",
+        "eksik": " ".join(
+            f"<span style='background:#fff3cd; border:1px solid #ffc107; border-radius:4px; padding:2px 8px; margin:2px; display:inline-block;'>🏷️ {kw}</span>"
+            for kw in eksik
+        ),
+        "eslesen": " ".join(
+            f"<span style='background:#d4edda; border:1px solid #28a745; border-radius:4px; padding:2px 8px; margin:2px; display:inline-block;'>✓ {kw}</span>"
+            for kw in eslesen[:20]
+        ),
+        "format_sorunlari": tuple(format_sorunlari),
+    }
+
+
+ISABET_STILLERI = {
+    ISABET_KELIME: "background:#d4edda;",
+    ISABET_ESANLAMLI: "background:#cce5ff;",
+    ISABET_BIGRAM: "background:#e2d9f3;",
+}
+BOLUM_ETIKETLERI = {
+    "giris": ("Giris / Iletisim", "Header / Contact"), "ozet": ("Ozet", "Summary"),
+    "experience": ("Deneyim", "Experience"), "education": ("Egitim", "Education"),
+    "skills": ("Beceriler", "Skills"), "certifications": ("Sertifikalar", "Certifications"),
+}
+
+
+def vurgulu_cv(cv_text, jd_text, listeler):
+    """Eslesmeleri isaretlenmis CV HTML'i ve bolum basina eslesme yogunlugu.
+
+    Isabetler ve bolum sinirlari baslangica gore sirali; ikisi tek gecisle birlestirilir.
+    Yogunluk: bolumdeki isabet / bolumdeki token.
+    """
+    eslesen = set(json.loads(listeler)[0])
+    indeks = KonumIndeksi(cv_text)
+    isabetler = indeks.isabetler(eslesen, jd_hazirla(jd_text)["bigramlar"])
+    bolumler = bolum_araliklari(cv_text)
+    # Ic ice / ardisik bigramlar tek isarette birlesir; ilk isabetin turu kalir
+    birlesik = []
+    for bas, bit, tur in isabetler:
+        if birlesik and bas < birlesik[-1][1]:
+            birlesik[-1][1] = max(birlesik[-1][1], bit)
+        else:
+            birlesik.append([bas, bit, tur])
+
+    yogunluk, parcalar, konum = [], [], 0
+    b, bolum_isabet = 0, 0
+    for bas, bit, tur in birlesik + [[len(cv_text), len(cv_text), None]]:
+        while b < len(bolumler) and bas >= bolumler[b][2]:
+            bolum, b_bas, b_bit = bolumler[b]
+            token = bisect.bisect_left(indeks.baslangic, b_bit) - bisect.bisect_left(indeks.baslangic, b_bas)
+            yogunluk.append((bolum, bolum_isabet, token))
+            b, bolum_isabet = b + 1, 0
+        if tur is None:
+            break
+        bolum_isabet += 1
+        parcalar.append(html.escape(cv_text[konum:bas]))
+        parcalar.append(f"<mark style='{ISABET_STILLERI[tur]} padding:0 2px; border-radius:3px;'>"
+                        f"{html.escape(cv_text[bas:bit])}</mark>")
+        konum = bit
+    parcalar.append(html.escape(cv_text[konum:]))
+    return "".join(parcalar), tuple(yogunluk)
+
+
+@functools.lru_cache(maxsize=64)
+def _vurgulu_cv_hashi(depo, cv_h, jd_h, listeler_h):
+    """Onbellek depo hash'leriyle anahtarlanir; HTML depoda (ATS_DEPO_MAX_MB sinirina dahil)."""
+    metinler = [depo.al(h) for h in (cv_h, jd_h, listeler_h)]
+    if None in metinler:
+        raise LookupError(cv_h)
+    cv_html, yogunluk = vurgulu_cv(*metinler)
+    return depo.koy(cv_html), yogunluk
+
+
+def render_vurgulu_cv(depo, sonuc, tr):
+    metinler = [depo.al(sonuc[ad]) for ad in ("cv", "jd", "listeler")]
+    if None in metinler:
+        return
+    try:
+        html_h, yogunluk = _vurgulu_cv_hashi(depo, sonuc["cv"], sonuc["jd"], sonuc["listeler"])
+        cv_html = depo.al(html_h)
+    except LookupError:  # kaynak arada tahliye edildi
+        cv_html = None
+    if cv_html is None:  # HTML tahliye edildi; ayni hash'le depoya geri konur
+        cv_html, yogunluk = vurgulu_cv(*metinler)
+        depo.koy(cv_html)
+    with st.expander("🔍 CV'de Eslesmeler" if tr else "🔍 Matches in Your CV"):
+        st.caption(
+            "🟩 kelime · 🟦 esanlamli · 🟪 ifade (bigram)" if tr else "🟩 keyword · 🟦 synonym · 🟪 phrase (bigram)"
+        )
+        for bolum, isabet, token in yogunluk:
+            etiket = BOLUM_ETIKETLERI[bolum][0 if tr else 1]
+            oran = isabet / token if token else 0.0
+            st.write(f"**{etiket}**: {isabet} / {token} ({oran:.0%})")
+            st.progress(min(1.0, oran * 4))  # %25 ve ustu dolu cubuk
+        st.markdown(
+            f"<div style='white-space:pre-wrap; font-family:monospace; font-size:0.85rem; line-height:1.6; "
+            f"background:#ffffff; border:1px solid #e8ecff; border-radius:8px; padding:16px;'>{cv_html}</div>",
+            unsafe_allow_html=True
+        )
+
+
+@st.fragment
+@olculu("render_sonuc")
+def render_sonuc(depo, tr):
+    """Analiz raporu. Sohbet / sidebar tiklamalarinda yeniden calismaz; tek widget'i
+    tekrar kullanilan feedback icin "yeni AI yorumu" dugmesi (tam yeniden calistirma)."""
+    sonuc = st.session_state.sonuc
+    puan = sonuc["puan"]
+    breakdown = dict(zip(BREAKDOWN_ANAHTARLARI, sonuc["breakdown"]))
+    parcalar = sonuc_html(depo, sonuc["ai"], sonuc["listeler"])
+
+    st.success("Analiz tamamlandi!" if tr else "Analysis complete!")
+    yakin_kopya = sonuc["yakin_kopya"]
+    if yakin_kopya:
+        benzerlik, ayni_ilan, tekrar = yakin_kopya
+        oran = int(benzerlik * 100)
+        if tekrar:
+            st.info("Bu CV bu ilan icin daha once analiz edildi; AI feedback tekrar kullanildi." if tr
+                    else "This CV was already analyzed for this job; the AI feedback was reused.")
+            if st.button("🔄 Yeni AI yorumu al" if tr else "🔄 Get fresh AI feedback", key="ai_yenile_btn"):
+                st.session_state.ai_yenile = True
+                st.rerun()
+        elif ayni_ilan:
+            st.info(f"Bu CV'nin benzeri (%{oran}) bu ilan icin daha once analiz edildi; AI feedback yeniden uretildi." if tr
+                    else f"A similar CV ({oran}%) was analyzed for this job before; the AI feedback was generated fresh.")
+        else:
+            st.info(f"Bu CV'nin neredeyse aynisi (%{oran}) baska bir ilan icin daha once analiz edildi." if tr
+                    else f"A near-identical CV ({oran}%) was previously analyzed for another job.")
+    st.divider()
+    st.header("📊 ATS Analiz Raporu" if tr else "📊 ATS Analysis Report")
+
+    r1, r2 = st.columns([1, 2])
+    with r1:
+        st.subheader("ATS Puani" if tr else "ATS Score")
+        render_score_gauge(puan)
+
+    with r2:
+        st.subheader("Puan Dagilimi" if tr else "Score Breakdown")
+        for key, label in breakdown_etiketleri(tr).items():
+            val = breakdown.get(key, 0)
+            max_val = int(re.search(r"\((\d+)\)", label).group(1))
+            pct = min(100, int((val / max_val) * 100)) if max_val else 0
+            st.write(f"**{label}**: {val}/{max_val}")
+            st.progress(pct)
+
+    st.divider()
+
+    st.subheader("🤖 AI Kariyer Kocu Feedback" if tr else "🤖 AI Career Coach Feedback")
+    if sonuc.get("ai_bekleyen"):
+        ai_feedback_yoklama(depo, tr)
+    st.markdown(parcalar["feedback"], unsafe_allow_html=True)
+
+    st.divider()
+
+    col_kw, col_fmt = st.columns(2)
+    with col_kw:
+        st.subheader("🔑 Eksik Kelimeler" if tr else "🔑 Missing Keywords")
+        if parcalar["eksik"]:
+            st.markdown(parcalar["eksik"], unsafe_allow_html=True)
+        else:
+            st.success("Kritik eksik kelime bulunamadi." if tr else "No critical missing keywords.")
+        st.markdown("---")
+        st.subheader("✅ Eslesen Kelimeler" if tr else "✅ Matched Keywords")
+        if parcalar["eslesen"]:
+            st.markdown(parcalar["eslesen"], unsafe_allow_html=True)
+
+    with col_fmt:
+        st.subheader("⚠️ Format Sorunlari" if tr else "⚠️ Formatting Issues")
+        if parcalar["format_sorunlari"]:
+            for sorun in parcalar["format_sorunlari"]:
+                st.warning(format_sorunu_metni(sorun, tr))
+        else:
+            st.success("Buyuk format sorunu bulunamadi." if tr else "No major formatting issues.")
+
+    render_vurgulu_cv(depo, sonuc, tr)
+
+    st.divider()
+
+
+@st.fragment
+@olculu("render_sohbet")
+def render_sohbet(depo, tr):
+    """Sohbet paneli: soru / hazir soru tiklamasi sadece bu parcayi yeniden calistirir."""
+    oturum_bakimi(depo)
+    if st.session_state.sonuc is None:
+        st.rerun()  # oturum zaman asimina ugradi: uyariyla birlikte sayfanin tamami cizilsin
+
+    st.subheader("💬 AI Kariyer Asistani" if tr else "💬 AI Career Assistant")
+    st.markdown(
+        "CV'niz hakkinda soru sorun!" if tr else "Ask questions about your CV!"
+    )
+
+    hizli_soru = None
+    for i, (hizli_col, (etiket, soru)) in enumerate(zip(st.columns(3), hizli_sorular(tr))):
+        with hizli_col:
+            if st.button(etiket, key=f"hizli_{i}", use_container_width=True):
+                hizli_soru = soru
+
+    # Mesajlar giris kutusunun ustundeki kaba yazilir; yeni tur ayni calismada cizilir (ek rerun yok)
+    mesajlar = st.container()
+    chat_placeholder = "Bir soru sorun..." if tr else "Ask a question..."
+    kullanici_sorusu = st.chat_input(chat_placeholder)
+
+    with mesajlar:
+        sohbet = st.session_state.sohbet
+        for rol, h, _ in sohbet:
+            with st.chat_message(rol):
+                st.markdown(depo.al(h) or "")
+        soru = hizli_soru or kullanici_sorusu
+        if soru:
+            onceki = len(sohbet)
+            sohbet_cevapla(depo, soru, tr, on_getirilmis=hizli_soru is not None)
+            for rol, h, _ in sohbet[onceki:]:
+                with st.chat_message(rol):
+                    st.markdown(depo.al(h) or "")
+
+
+@olculu("render_sayfa")
 def main():
     st.set_page_config(page_title="ATS CV Optimizer", page_icon="📄", layout="wide")
 
-    if "analiz_yapildi" not in st.session_state:
-        st.session_state.analiz_yapildi = False
-    if "cv_text" not in st.session_state:
-        st.session_state.cv_text = ""
-    if "jd_text" not in st.session_state:
-        st.session_state.jd_text = ""
-    if "mesaj_gecmisi" not in st.session_state:
-        st.session_state.mesaj_gecmisi = []
-    if "sohbet_mesajlari" not in st.session_state:
-        st.session_state.sohbet_mesajlari = []
+    if "oturum_id" not in st.session_state:
+        st.session_state.oturum_id = uuid.uuid4().hex
+    if "sonuc" not in st.session_state:
+        st.session_state.sonuc = None
+    if "sohbet" not in st.session_state:
+        st.session_state.sohbet = []
     if "dil" not in st.session_state:
         st.session_state.dil = None
     if "tema" not in st.session_state:
         st.session_state.tema = "lacivert"
 
+    depo = icerik_deposu()
+    oturum_bakimi(depo)
+    ayristirma_havuzu()  # ilk yuklemeden once surecleri isit
+
     # Dil secimi ekrani
     if st.session_state.dil is None:
         st.markdown("""
@@ -586,93 +2997,6 @@ def main():
 
     tr = st.session_state.dil == "tr"
 
-    # Renk temaları
-    TEMALAR = {
-        "lacivert": {"bg": "#f4f6fb", "sidebar": "linear-gradient(180deg, #1a1a2e 0%, #16213e 100%)", "header": "linear-gradient(135deg, #1a1a2e, #0f3460)", "accent": "#0f3460", "isim": "🌑 Lacivert"},
-        "yesil": {"bg": "#f0faf4", "sidebar": "linear-gradient(180deg, #0d2b1a 0%, #1a4a2e 100%)", "header": "linear-gradient(135deg, #0d2b1a, #1a6b3a)", "accent": "#1a6b3a", "isim": "🌿 Yeşil"},
-        "mor": {"bg": "#f5f0ff", "sidebar": "linear-gradient(180deg, #1a0a2e 0%, #2d1b4e 100%)", "header": "linear-gradient(135deg, #1a0a2e, #4a1a8e)", "accent": "#4a1a8e", "isim": "🔮 Mor"},
-        "kirmizi": {"bg": "#fff5f5", "sidebar": "linear-gradient(180deg, #2b0a0a 0%, #4a1a1a 100%)", "header": "linear-gradient(135deg, #2b0a0a, #8e1a1a)", "accent": "#8e1a1a", "isim": "🔴 Bordo"},
-        "turuncu": {"bg": "#fff8f0", "sidebar": "linear-gradient(180deg, #2b1a0a 0%, #4a2e0d 100%)", "header": "linear-gradient(135deg, #2b1a0a, #c45e0a)", "accent": "#c45e0a", "isim": "🟠 Turuncu"},
-        "gri": {"bg": "#f5f5f7", "sidebar": "linear-gradient(180deg, #1a1a1a 0%, #2d2d2d 100%)", "header": "linear-gradient(135deg, #1a1a1a, #3d3d3d)", "accent": "#3d3d3d", "isim": "⚫ Koyu Gri"},
-    }
-    tema = TEMALAR[st.session_state.tema]
-
-    # Global CSS - inject via helper to avoid f-string brace conflicts
-    bg = tema["bg"]
-    sidebar_bg = tema["sidebar"]
-    accent = tema["accent"]
-    header_grad = tema["header"]
-
-    css = f"""
-    <style>
-    .stApp {{ background-color: {bg}; }}
-    [data-testid="stSidebar"] {{ background: {sidebar_bg} !important; }}
-    [data-testid="stSidebar"] * {{ color: #c8d0e7 !important; }}
-    [data-testid="stSidebar"] h1,
-    [data-testid="stSidebar"] h2,
-    [data-testid="stSidebar"] h3 {{ color: #ffffff !important; }}
-    [data-testid="stSidebar"] .stButton button {{
-        background: rgba(255,255,255,0.08) !important;
-        border: 1px solid rgba(255,255,255,0.2) !important;
-        color: #ffffff !important;
-        border-radius: 8px !important;
-        font-size: 0.82rem !important;
-    }}
-    [data-testid="stSidebar"] .stButton button:hover {{
-        background: rgba(255,255,255,0.15) !important;
-    }}
-    .main-header {{
-        background: {header_grad};
-        padding: 28px 35px;
-        border-radius: 16px;
-        margin-bottom: 24px;
-        display: flex;
-        align-items: center;
-        gap: 16px;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.18);
-    }}
-    .main-header h1 {{ color: #ffffff !important; font-size: 2rem !important; font-weight: 800 !important; margin: 0 !important; letter-spacing: -0.5px; }}
-    .main-header p {{ color: #a8b2d8; font-size: 0.9rem; margin: 4px 0 0 0; }}
-    .stButton > button[kind="primary"] {{
-        background: {header_grad} !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 10px !important;
-        font-weight: 700 !important;
-        font-size: 1rem !important;
-        padding: 14px !important;
-        transition: all 0.2s !important;
-    }}
-    .stButton > button[kind="primary"]:hover {{
-        opacity: 0.9 !important;
-        transform: translateY(-1px) !important;
-    }}
-    .step-card {{
-        background: rgba(255,255,255,0.05);
-        border: 1px solid rgba(255,255,255,0.1);
-        border-radius: 10px;
-        padding: 10px 14px;
-        margin: 6px 0;
-        display: flex;
-        align-items: center;
-        gap: 10px;
-    }}
-    .step-num {{
-        background: {accent};
-        color: white;
-        width: 24px;
-        height: 24px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 0.75rem;
-        font-weight: 700;
-        flex-shrink: 0;
-    }}
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
 
     st.markdown(f"""
     <div class="main-header">
@@ -687,70 +3011,8 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
-    # Sidebar
     with st.sidebar:
-        st.markdown("""
-        <div style="padding:16px 0 8px 0; text-align:center;">
-            <p style="font-size:1.3rem; font-weight:800; color:#ffffff; margin:0; letter-spacing:-0.5px;">📄 ATS CV</p>
-            <p style="font-size:0.75rem; color:#6b7db3; margin:2px 0 0 0; letter-spacing:1px; text-transform:uppercase;">Optimizer</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("---")
-
-        steps_tr = [
-            ("CV'nizi yukleyin", "PDF, DOCX veya metin"),
-            ("Is ilanini girin", "Kopyalayip yapistirin"),
-            ("Analiz edin", "Tek tiklama yeterli"),
-            ("Feedback alin", "AI destekli rapor"),
-            ("Bota sorun", "Cover letter, mulakat"),
-        ]
-        steps_en = [
-            ("Upload your CV", "PDF, DOCX or text"),
-            ("Enter job description", "Copy and paste"),
-            ("Analyze", "One click is enough"),
-            ("Get feedback", "AI-powered report"),
-            ("Ask the bot", "Cover letter, interview"),
-        ]
-        steps = steps_tr if tr else steps_en
-
-        st.markdown(f"<p style='color:#a8b2d8; font-size:0.7rem; letter-spacing:1.5px; text-transform:uppercase; margin-bottom:8px;'>{'NASIL KULLANILIR' if tr else 'HOW IT WORKS'}</p>", unsafe_allow_html=True)
-        for i, (title, desc) in enumerate(steps, 1):
-            st.markdown(f"""
-            <div class="step-card">
-                <div class="step-num">{i}</div>
-                <div>
-                    <p style="margin:0; font-size:0.82rem; font-weight:600; color:#e0e6ff;">{title}</p>
-                    <p style="margin:0; font-size:0.72rem; color:#6b7db3;">{desc}</p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("---")
-
-        badges = [
-            ("✅", "Ucretsiz / Free"),
-            ("🔒", "Veri kaydetmez"),
-            ("🤖", "Groq AI powered"),
-            ("⚡", "Anlik analiz"),
-        ]
-        for icon, text in badges:
-            st.markdown(f"<p style='margin:4px 0; font-size:0.8rem; color:#a8b2d8;'>{icon} {text}</p>", unsafe_allow_html=True)
-
-        st.markdown("---")
-        st.markdown(f"<p style='color:#a8b2d8; font-size:0.7rem; letter-spacing:1.5px; text-transform:uppercase; margin-bottom:8px;'>{'TEMA SEÇ' if tr else 'THEME'}</p>", unsafe_allow_html=True)
-        tema_secenekleri = {k: v["isim"] for k, v in TEMALAR.items()}
-        for tema_key, tema_isim in tema_secenekleri.items():
-            secili = "✦ " if tema_key == st.session_state.tema else ""
-            if st.button(f"{secili}{tema_isim}", key=f"tema_{tema_key}", use_container_width=True):
-                st.session_state.tema = tema_key
-                st.rerun()
-
-        st.markdown("---")
-        if st.button("🌐 Dil Degistir / Change Language", use_container_width=True):
-            st.session_state.dil = None
-            st.session_state.analiz_yapildi = False
-            st.rerun()
+        render_sidebar(tr)
 
     col_cv, col_jd = st.columns(2)
 
@@ -759,17 +3021,29 @@ def main():
         input_options = ["Metin yapistir", "Dosya yukle (PDF / DOCX)"] if tr else ["Paste text", "Upload file (PDF / DOCX)"]
         input_method = st.radio("Giris yontemi" if tr else "Input method", input_options, horizontal=True)
         cv_text = ""
+        canli_mod = False
         if input_method in ["Metin yapistir", "Paste text"]:
             cv_text = st.text_area(
                 "CV'nizi buraya yapistirin" if tr else "Paste your CV here",
                 height=300,
                 placeholder="Ad Soyad\nemail@gmail.com\n\nDENEYIM\n..." if tr else "John Doe\njohn@email.com\n\nEXPERIENCE\n..."
             )
+            canli_mod = st.toggle(
+                "⚡ Canli puan (duzenledikce guncellenir)" if tr else "⚡ Live score (updates as you edit)",
+                key="canli_mod"
+            )
         else:
             uploaded = st.file_uploader("CV Yukle" if tr else "Upload CV", type=["pdf", "docx"], label_visibility="collapsed")
             if uploaded:
-                with st.spinner("Dosya okunuyor..." if tr else "Reading file..."):
-                    cv_text = extract_text_from_upload(uploaded)
+                # Her rerun'da yeniden ayristirma: ayni dosya icin depodaki metni kullan
+                onceki = st.session_state.get("yukleme")
+                if onceki and onceki[0] == uploaded.file_id:
+                    cv_text = depo.al(onceki[1]) or ""
+                if not cv_text:
+                    with st.spinner("Dosya okunuyor..." if tr else "Reading file..."):
+                        cv_text = extract_text_from_upload(uploaded, tr)
+                    if cv_text:
+                        st.session_state.yukleme = (uploaded.file_id, depo.koy(cv_text))
                 if cv_text:
                     st.success(f"{len(cv_text.split())} {'kelime okundu' if tr else 'words extracted'}.")
 
@@ -781,6 +3055,12 @@ def main():
             placeholder="Aradigimiz kisi en az 2 yil deneyimli..." if tr else "We are looking for a candidate with at least 2 years of experience..."
         )
 
+    # Streamlit text_area degeri odak kaybinda / Ctrl+Enter ile gelir; bu dogal debounce
+    if canli_mod and cv_text.strip() and jd_text.strip():
+        render_canli_puan(cv_text, jd_text, tr)
+    else:
+        canli_puanlayici_deposu().sil(st.session_state.oturum_id)
+
     st.divider()
     analyze_btn = st.button(
         "🔍 CV'yi Analiz Et" if tr else "🔍 Analyze CV",
@@ -788,7 +3068,9 @@ def main():
         use_container_width=True
     )
 
-    if analyze_btn:
+    # Sonuc ekranindaki "yeni AI yorumu" dugmesi: ayni girdilerle, onbellegi atlayarak analiz
+    yenile = st.session_state.pop("ai_yenile", False)
+    if analyze_btn or yenile:
         if not cv_text.strip():
             st.error("Lutfen CV'nizi girin." if tr else "Please provide your CV.")
             st.stop()
@@ -796,164 +3078,62 @@ def main():
             st.error("Lutfen is ilanini girin." if tr else "Please paste the Job Description.")
             st.stop()
 
-        st.session_state.cv_text = cv_text
-        st.session_state.jd_text = jd_text
-        st.session_state.mesaj_gecmisi = []
-        st.session_state.sohbet_mesajlari = []
+        st.session_state.sohbet = []
+        st.session_state.pop("oturum_suresi_doldu", None)
 
         with st.spinner("Analiz ediliyor..." if tr else "Analyzing..."):
             bolumler = bolum_tespit(cv_text)
-            eslesen, eksik = keyword_analizi(cv_text, jd_text)
+            indeks = KonumIndeksi(cv_text)
+            eslesen, eksik = keyword_analizi(cv_text, jd_text, indeks)
             format_sorunlari = format_sorunlari_tespit(cv_text)
-            puan, breakdown = puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari)
-
-        with st.spinner("AI feedback hazirlaniyor..." if tr else "Preparing AI feedback..."):
-            try:
-                ai_feedback = ai_feedback_olustur(cv_text, jd_text, puan, eksik, format_sorunlari, tr)
-            except Exception as e:
-                ai_feedback = "AI feedback su an hazirlanamadi." if tr else "AI feedback could not be generated."
-
-        st.session_state.analiz_yapildi = True
-        st.session_state.bolumler = bolumler
-        st.session_state.eslesen = eslesen
-        st.session_state.eksik = eksik
-        st.session_state.format_sorunlari = format_sorunlari
-        st.session_state.puan = puan
-        st.session_state.breakdown = breakdown
-        st.session_state.ai_feedback = ai_feedback
-
-    if st.session_state.analiz_yapildi:
-        puan = st.session_state.puan
-        breakdown = st.session_state.breakdown
-        bolumler = st.session_state.bolumler
-        eslesen = st.session_state.eslesen
-        eksik = st.session_state.eksik
-        format_sorunlari = st.session_state.format_sorunlari
-        ai_feedback = st.session_state.ai_feedback
-
-        st.success("Analiz tamamlandi!" if tr else "Analysis complete!")
-        st.divider()
-        st.header("📊 ATS Analiz Raporu" if tr else "📊 ATS Analysis Report")
-
-        r1, r2 = st.columns([1, 2])
-        with r1:
-            st.subheader("ATS Puani" if tr else "ATS Score")
-            render_score_gauge(puan)
-
-        with r2:
-            st.subheader("Puan Dagilimi" if tr else "Score Breakdown")
-            if tr:
-                labels = {
-                    "keyword_match": "Keyword Eslesmesi (30)",
-                    "section_structure": "Bolum Yapisi (20)",
-                    "bullet_quality": "Bullet Kalitesi (20)",
-                    "formatting": "Format (15)",
-                    "quantified_achievements": "Sayisal Basarilar (15)"
-                }
-            else:
-                labels = {
-                    "keyword_match": "Keyword Match (30)",
-                    "section_structure": "Section Structure (20)",
-                    "bullet_quality": "Bullet Quality (20)",
-                    "formatting": "Formatting (15)",
-                    "quantified_achievements": "Quantified Achievements (15)"
-                }
-            for key, label in labels.items():
-                val = breakdown.get(key, 0)
-                max_val = int(re.search(r"\((\d+)\)", label).group(1))
-                pct = min(100, int((val / max_val) * 100)) if max_val else 0
-                st.write(f"**{label}**: {val}/{max_val}")
-                st.progress(pct)
-
-        st.divider()
-
-        st.subheader("🤖 AI Kariyer Kocu Feedback" if tr else "🤖 AI Career Coach Feedback")
-        st.markdown(
-            f"<div style='background:#f8f9ff; border-left:4px solid #4a90e2; padding:20px; border-radius:8px; line-height:1.8;'>{ai_feedback}</div>",
-            unsafe_allow_html=True
-        )
-
-        st.divider()
-
-        col_kw, col_fmt = st.columns(2)
-        with col_kw:
-            st.subheader("🔑 Eksik Kelimeler" if tr else "🔑 Missing Keywords")
-            if eksik:
-                tags_html = " ".join(
-                    f"<span style='background:#fff3cd; border:1px solid #ffc107; border-radius:4px; padding:2px 8px; margin:2px; display:inline-block;'>🏷️ {kw}</span>"
-                    for kw in eksik
-                )
-                st.markdown(tags_html, unsafe_allow_html=True)
-            else:
-                st.success("Kritik eksik kelime bulunamadi." if tr else "No critical missing keywords.")
-            st.markdown("---")
-            st.subheader("✅ Eslesen Kelimeler" if tr else "✅ Matched Keywords")
-            if eslesen:
-                tags_html = " ".join(
-                    f"<span style='background:#d4edda; border:1px solid #28a745; border-radius:4px; padding:2px 8px; margin:2px; display:inline-block;'>✓ {kw}</span>"
-                    for kw in eslesen[:20]
-                )
-                st.markdown(tags_html, unsafe_allow_html=True)
-
-        with col_fmt:
-            st.subheader("⚠️ Format Sorunlari" if tr else "⚠️ Formatting Issues")
-            if format_sorunlari:
-                for sorun in format_sorunlari:
-                    st.warning(sorun)
+            puan, breakdown = puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari, indeks)
+
+            imza, yakin_kopya = yakin_kopya_bul(cv_text, jd_text, tr)
+            if yenile:
+                yakin_kopya = None
+
+        ai_basarili = False
+        ai_bekleyen = None
+        if yakin_kopya and yakin_kopya["ai_feedback"]:
+            # Ayni CV ayni ilan ve dil icin zaten yorumlandi; puanlar yeniden hesaplandi, LLM atlanir
+            sayac("onbellek_isabet")
+            ai_feedback = yakin_kopya["ai_feedback"]
+            ai_basarili = True
+        else:
+            yonetici = ai_feedback_yoneticisi()
+            anahtar = metin_hash("\0".join((cv_text, jd_text, "tr" if tr else "en")))
+            is_ = yonetici.baslat(anahtar, cv_text, jd_text, puan, eksik, format_sorunlari, tr, yenile=yenile)
+            with st.spinner("AI feedback hazirlaniyor..." if tr else "Preparing AI feedback..."):
+                ai_feedback = yonetici.bekle(is_)
+            if ai_feedback is not None:
+                if imza is not None:
+                    yakin_kopya_kaydet(cv_text, jd_text, ai_feedback, tr, imza)
+                ai_basarili = True
             else:
-                st.success("Buyuk format sorunu bulunamadi." if tr else "No major formatting issues.")
-
-        st.divider()
-
-        st.subheader("💬 AI Kariyer Asistani" if tr else "💬 AI Career Assistant")
-        st.markdown(
-            "CV'niz hakkinda soru sorun!" if tr else "Ask questions about your CV!"
+                # Butce doldu ya da tum denemeler basarisiz: aninda kural tabanli ozet
+                bekliyor = not is_.bitti.is_set()
+                ai_feedback = kural_tabanli_feedback(puan, breakdown, eksik, format_sorunlari, tr,
+                                                     neden="zaman" if bekliyor else "hata")
+                if bekliyor:
+                    ai_bekleyen = anahtar
+
+        if ON_GETIR_AKTIF and ai_basarili:
+            on_getirme_deposu().baslat(cv_text, jd_text, [soru for _, soru in hizli_sorular(tr)], tr,
+                                       st.session_state.oturum_id)
+
+        st.session_state.sonuc = sonuc_kaydi(
+            depo, cv_text, jd_text, ai_feedback, puan, breakdown, bolumler,
+            eslesen, eksik, format_sorunlari, yakin_kopya, ai_bekleyen
         )
+        depo.oturum_bildir(st.session_state.oturum_id, oturum_hashleri(st.session_state))
 
-        hizli_col1, hizli_col2, hizli_col3 = st.columns(3)
-        with hizli_col1:
-            btn1 = "📝 Cover Letter Yaz" if tr else "📝 Write Cover Letter"
-            if st.button(btn1, use_container_width=True):
-                st.session_state.hizli_soru = "Bu is icin Turkce cover letter yazar misin?" if tr else "Can you write a cover letter for this job in English?"
-        with hizli_col2:
-            btn2 = "🎯 Mulakat Sorulari" if tr else "🎯 Interview Questions"
-            if st.button(btn2, use_container_width=True):
-                st.session_state.hizli_soru = "Bu is icin hangi mulakat sorulari gelebilir?" if tr else "What interview questions might come up for this job?"
-        with hizli_col3:
-            btn3 = "💰 Maas Tavsiyesi" if tr else "💰 Salary Advice"
-            if st.button(btn3, use_container_width=True):
-                st.session_state.hizli_soru = "Bu pozisyon icin ne kadar maas beklentisi olmali?" if tr else "What salary should I expect for this position?"
-
-        for mesaj in st.session_state.sohbet_mesajlari:
-            with st.chat_message(mesaj["role"]):
-                st.markdown(mesaj["content"])
-
-        if "hizli_soru" in st.session_state and st.session_state.hizli_soru:
-            soru = st.session_state.hizli_soru
-            st.session_state.hizli_soru = ""
-            st.session_state.sohbet_mesajlari.append({"role": "user", "content": soru})
-            with st.spinner("AI cevap yaziyor..." if tr else "AI is typing..."):
-                try:
-                    cevap = ai_soru_cevap(soru, st.session_state.cv_text, st.session_state.jd_text, st.session_state.mesaj_gecmisi, tr)
-                    st.session_state.mesaj_gecmisi.append({"role": "user", "content": soru})
-                    st.session_state.mesaj_gecmisi.append({"role": "assistant", "content": cevap})
-                    st.session_state.sohbet_mesajlari.append({"role": "assistant", "content": cevap})
-                except:
-                    st.session_state.sohbet_mesajlari.append({"role": "assistant", "content": "Hata olustu." if tr else "An error occurred."})
-            st.rerun()
+    if st.session_state.get("oturum_suresi_doldu"):
+        st.warning("Oturum zaman asimina ugradi; lutfen tekrar analiz edin." if tr
+                   else "Your session expired; please analyze again.")
 
-        chat_placeholder = "Bir soru sorun..." if tr else "Ask a question..."
-        if kullanici_sorusu := st.chat_input(chat_placeholder):
-            st.session_state.sohbet_mesajlari.append({"role": "user", "content": kullanici_sorusu})
-            with st.spinner("AI cevap yaziyor..." if tr else "AI is typing..."):
-                try:
-                    cevap = ai_soru_cevap(kullanici_sorusu, st.session_state.cv_text, st.session_state.jd_text, st.session_state.mesaj_gecmisi, tr)
-                    st.session_state.mesaj_gecmisi.append({"role": "user", "content": kullanici_sorusu})
-                    st.session_state.mesaj_gecmisi.append({"role": "assistant", "content": cevap})
-                    st.session_state.sohbet_mesajlari.append({"role": "assistant", "content": cevap})
-                except:
-                    st.session_state.sohbet_mesajlari.append({"role": "assistant", "content": "Hata olustu." if tr else "An error occurred."})
-            st.rerun()
+    if st.session_state.sonuc:
+        render_sonuc(depo, tr)
+        render_sohbet(depo, tr)
 
         st.divider()
         st.caption("Groq AI (LLaMA 3.3 70B) ile analiz edilmistir. Sonuclar tavsiye niteligindedir.")
@@ -0,0 +1,326 @@
+"""
+Belge ayristirma: PDF/DOCX metin cikarma ve kaynak sinirli is parcacigi havuzu.
+
+Streamlit import etmez; havuzdaki her is parcacigi bu dosyayi ayri bir Python
+sureci olarak calistirir, pdfplumber / python-docx'i acilista yukler ve
+stdin/stdout uzerinden is alir:
+    istek : tur (1 bayt) + uzunluk (uint32) + dosya baytlari
+    cevap : durum (1 bayt) + uzunluk (uint32) + JSON
+Her is icin CPU suresi (RLIMIT_CPU) ve duvar saati, surec icin bellek
+(RLIMIT_AS) sinirlanir. Limite takilan ya da coken surec yenisiyle degistirilir.
+POSIX disinda (Windows) RLIMIT yoktur ve select borularda calismaz: sadece duvar
+saati uygulanir, cevap ayri bir is parcaciginda okunur.
+"""
+
+import io
+import json
+import os
+import queue
+import select
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+try:
+    import resource
+except ImportError:  # Windows: limitler uygulanmaz
+    resource = None
+
+try:
+    import pdfplumber
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+try:
+    from docx import Document
+    DOCX_SUPPORT = True
+except ImportError:
+    DOCX_SUPPORT = False
+
+
+def pdf_metni(file_bytes):
+    """(metin, sayfa_sayisi)"""
+    text_parts = []
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        sayfa = len(pdf.pages)
+        for page in pdf.pages:
+            t = page.extract_text()
+            if t:
+                text_parts.append(t)
+    return "\n".join(text_parts), sayfa
+
+
+def docx_metni(file_bytes):
+    """(metin, 0)"""
+    doc = Document(io.BytesIO(file_bytes))
+    return "\n".join([p.text for p in doc.paragraphs if p.text.strip()]), 0
+
+
+TURLER = ("pdf", "docx")
+AYRISTIRICILAR = {"pdf": pdf_metni, "docx": docx_metni}
+_ISTEK = struct.Struct("<BI")
+_CEVAP = struct.Struct("<BI")
+_TAMAM, _BOZUK, _BELLEK = 0, 1, 2
+# Bellek bitince json / yeni nesne uretilemeyebilir: cevap onceden hazir
+_BELLEK_GOVDE = b'{"hata": "bellek limiti"}'
+_BELLEK_CEVABI = _CEVAP.pack(_BELLEK, len(_BELLEK_GOVDE)) + _BELLEK_GOVDE
+# Coken surecin en yuksek RSS'i bellek sinirinin bu oranini gectiyse bellek
+# hatasi sayilir: C eklentileri malloc hatasinda SIGSEGV/SIGABRT ile, Python ise
+# hata islenirken ikinci bir MemoryError ile cikabilir.
+_BELLEK_YAKIN = 0.8
+
+
+class AyristirmaHatasi(Exception):
+    """neden: mesgul, zaman_asimi, cpu, bellek, cokme ya da bozuk (parse hatasi)."""
+
+    def __init__(self, neden, mesaj=""):
+        super().__init__(f"{neden}: {mesaj}" if mesaj else neden)
+        self.neden = neden
+
+
+# ── IS PARCACIGI (alt surec) ──
+def _bellek_hatasi_mi(hata):
+    """pdfminer MemoryError'u kendi istisnasina sarar; zinciri tara."""
+    while hata is not None:
+        if isinstance(hata, MemoryError):
+            return True
+        hata = hata.__cause__ or hata.__context__
+    return False
+
+
+def isci_dongusu(cpu_sn, bellek_mb):
+    """stdin'den is al, sonucu stdout'a yaz; stdin kapaninca cik."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    giris = sys.stdin.buffer
+    # Kutuphanelerin print'leri protokolu bozmasin: stdout -> stderr
+    cikis = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    if resource is not None and bellek_mb:
+        sinir = bellek_mb * 2 ** 20
+        resource.setrlimit(resource.RLIMIT_AS, (sinir, sinir))
+
+    def yaz(durum, veri):
+        govde = json.dumps(veri, ensure_ascii=False).encode("utf-8")
+        cikis.write(_CEVAP.pack(durum, len(govde)) + govde)
+        cikis.flush()
+
+    # Okuma, ayristirma ve cevap yazma dahil isin tamami; MemoryError'dan sonra
+    # parcalanmis heap ile devam edilmez, havuz yenisini baslatir
+    try:
+        while True:
+            baslik = giris.read(_ISTEK.size)
+            if len(baslik) < _ISTEK.size:
+                return
+            tur_no, uzunluk = _ISTEK.unpack(baslik)
+            veri = giris.read(uzunluk)
+            if resource is not None and cpu_sn:
+                # RLIMIT_CPU surec toplamidir: her is icin mevcut kullanimin ustune ekle
+                kullanim = resource.getrusage(resource.RUSAGE_SELF)
+                _, sert = resource.getrlimit(resource.RLIMIT_CPU)
+                resource.setrlimit(resource.RLIMIT_CPU,
+                                   (int(kullanim.ru_utime + kullanim.ru_stime + cpu_sn) + 1, sert))
+            baslangic = time.perf_counter()
+            try:
+                metin, sayfa = AYRISTIRICILAR[TURLER[tur_no]](veri)
+            except Exception as e:
+                if _bellek_hatasi_mi(e):
+                    raise MemoryError from None
+                yaz(_BOZUK, {"hata": f"{type(e).__name__}: {e}"[:300]})
+                continue
+            yaz(_TAMAM, {"metin": metin, "sayfa": sayfa, "sure": time.perf_counter() - baslangic})
+    except MemoryError:
+        cikis.write(_BELLEK_CEVABI)
+        cikis.flush()
+
+
+# ── HAVUZ (ana surec) ──
+def _oku_select(fd, n, son):
+    """fd'den tam n bayt oku; son (monotonic) gecerse TimeoutError, EOF'ta EOFError."""
+    parcalar = []
+    while n:
+        kalan = son - time.monotonic()
+        if kalan <= 0 or not select.select([fd], [], [], kalan)[0]:
+            raise TimeoutError
+        parca = os.read(fd, min(n, 1 << 20))
+        if not parca:
+            raise EOFError
+        parcalar.append(parca)
+        n -= len(parca)
+    return b"".join(parcalar)
+
+
+def _oku_is_parcacigi(fd, n, son):
+    """_oku_select ile ayni; bloklayan okuma ayri is parcaciginda. Zaman asiminda havuz
+    sureci oldurur, boru kapaninca okuyan is parcacigi EOF ile biter."""
+    sonuc = []
+
+    def oku():
+        parcalar, kalan = [], n
+        try:
+            while kalan:
+                parca = os.read(fd, min(kalan, 1 << 20))
+                if not parca:
+                    raise EOFError
+                parcalar.append(parca)
+                kalan -= len(parca)
+            sonuc.append(b"".join(parcalar))
+        except (EOFError, OSError) as e:
+            sonuc.append(e)
+
+    okuyucu = threading.Thread(target=oku, daemon=True, name="ayristirma_oku")
+    okuyucu.start()
+    okuyucu.join(max(0.0, son - time.monotonic()))
+    if not sonuc:
+        raise TimeoutError
+    if isinstance(sonuc[0], Exception):
+        raise sonuc[0]
+    return sonuc[0]
+
+
+_oku = _oku_select if os.name == "posix" else _oku_is_parcacigi
+
+
+def _bekle(surec):
+    """Sureci bekle; (cikis_kodu, en_yuksek_rss_mb). RSS wait4 olmayan sistemlerde None."""
+    if not hasattr(os, "wait4"):
+        return surec.wait(), None
+    try:
+        _, durum, kullanim = os.wait4(surec.pid, 0)
+    except ChildProcessError:  # baska yerde beklendi
+        return surec.wait(), None
+    surec.returncode = os.waitstatus_to_exitcode(durum)
+    # ru_maxrss Linux'ta KB, macOS'ta bayt
+    return surec.returncode, kullanim.ru_maxrss / (2 ** 20 if sys.platform == "darwin" else 1024)
+
+
+def _yuzdelik(degerler, p):
+    sirali = sorted(degerler)
+    if not sirali:
+        return None
+    return round(sirali[min(len(sirali) - 1, int(round(p / 100 * (len(sirali) - 1))))] * 1000, 1)
+
+
+class AyristirmaHavuzu:
+    """On-isitilmis, kaynak sinirli ayristirma surecleri.
+
+    Her is bos bir surece gider; bos surec yoksa kuyruk_sn kadar kuyrukta bekler.
+    Kuyruk suresi is suresinden (sure_sn) ayridir: yogunlukta normal dosyalar tek
+    bir isin suresi dolunca reddedilmez. Duvar saati asilirsa surec oldurulur;
+    olen surec hemen yenisiyle degistirilir.
+    """
+
+    def __init__(self, isci=2, cpu_sn=10, sure_sn=20, bellek_mb=512, kuyruk_sn=60):
+        self.cpu_sn = cpu_sn
+        self.sure_sn = sure_sn
+        self.kuyruk_sn = kuyruk_sn
+        self.bellek_mb = bellek_mb
+        self.kilit = threading.Lock()
+        self.sayaclar = Counter()
+        self.kuyruk_sureleri = deque(maxlen=1000)
+        self.ayristirma_sureleri = deque(maxlen=1000)
+        self.bos = queue.Queue()
+        self.isci = isci
+        for _ in range(isci):
+            self.bos.put(self._baslat())
+
+    def _baslat(self):
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(self.cpu_sn), str(self.bellek_mb)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0,
+        )
+
+    def _yenile(self, surec):
+        if surec.poll() is None:
+            surec.kill()
+        surec.wait()
+        with self.kilit:
+            self.sayaclar["yeniden_baslatma"] += 1
+        return self._baslat()
+
+    def _say(self, ad):
+        with self.kilit:
+            self.sayaclar[ad] += 1
+
+    def ayristir(self, tur, veri):
+        """{"metin", "sayfa", "kuyruk_sn", "sure_sn"} dondur; basarisizsa AyristirmaHatasi."""
+        baslangic = time.monotonic()
+        try:
+            surec = self.bos.get(timeout=self.kuyruk_sn)
+        except queue.Empty:
+            self._say("mesgul")
+            raise AyristirmaHatasi("mesgul") from None
+        kuyruk_sn = time.monotonic() - baslangic
+        self.kuyruk_sureleri.append(kuyruk_sn)
+        try:
+            sonuc = self._calistir(surec, tur, veri)
+        except AyristirmaHatasi as e:
+            self._say(e.neden)
+            if e.neden != "bozuk":
+                surec = self._yenile(surec)
+            raise
+        finally:
+            self.bos.put(surec)
+        self._say("tamamlanan")
+        self.ayristirma_sureleri.append(sonuc["sure"])
+        return {"metin": sonuc["metin"], "sayfa": sonuc["sayfa"], "kuyruk_sn": kuyruk_sn, "sure_sn": sonuc["sure"]}
+
+    def _calistir(self, surec, tur, veri):
+        son = time.monotonic() + self.sure_sn
+        try:
+            # Bos surecin borusu okunuyor olmali; yazma bloklanmasi kisa surer
+            mesaj = memoryview(_ISTEK.pack(TURLER.index(tur), len(veri)) + veri)
+            while mesaj:
+                mesaj = mesaj[surec.stdin.write(mesaj):]
+            baslik = _oku(surec.stdout.fileno(), _CEVAP.size, son)
+            durum, uzunluk = _CEVAP.unpack(baslik)
+            govde = json.loads(_oku(surec.stdout.fileno(), uzunluk, son))
+        except TimeoutError:
+            raise AyristirmaHatasi("zaman_asimi", f"{self.sure_sn} sn") from None
+        except (EOFError, OSError):
+            cikis_kodu, rss_mb = _bekle(surec)
+            if cikis_kodu and rss_mb is not None and self.bellek_mb and rss_mb >= _BELLEK_YAKIN * self.bellek_mb:
+                raise AyristirmaHatasi("bellek", f"{self.bellek_mb} MB (cikis kodu {cikis_kodu})") from None
+            sinyal = -cikis_kodu if cikis_kodu and cikis_kodu < 0 else None
+            if sinyal == getattr(signal, "SIGXCPU", None):
+                raise AyristirmaHatasi("cpu", f"{self.cpu_sn} sn") from None
+            raise AyristirmaHatasi("cokme", f"cikis kodu {cikis_kodu}") from None
+        if durum == _BELLEK:
+            raise AyristirmaHatasi("bellek", f"{self.bellek_mb} MB")
+        if durum == _BOZUK:
+            raise AyristirmaHatasi("bozuk", govde["hata"])
+        return govde
+
+    def istatistik(self):
+        with self.kilit:
+            sayaclar = dict(self.sayaclar)
+        kuyruk, sureler = list(self.kuyruk_sureleri), list(self.ayristirma_sureleri)
+        return {
+            "isci": self.isci,
+            "bos": self.bos.qsize(),
+            **sayaclar,
+            "kuyruk_p50_ms": _yuzdelik(kuyruk, 50),
+            "kuyruk_p95_ms": _yuzdelik(kuyruk, 95),
+            "ayristirma_p50_ms": _yuzdelik(sureler, 50),
+            "ayristirma_p95_ms": _yuzdelik(sureler, 95),
+        }
+
+    def kapat(self):
+        while True:
+            try:
+                surec = self.bos.get_nowait()
+            except queue.Empty:
+                return
+            surec.stdin.close()
+            try:
+                surec.wait(5)
+            except subprocess.TimeoutExpired:
+                surec.kill()
+
+
+if __name__ == "__main__":
+    isci_dongusu(float(sys.argv[1]), int(sys.argv[2]))
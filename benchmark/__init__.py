@@ -0,0 +1,12 @@
+"""
+ATS CV Optimizer - performans olcum araclari.
+korpus: seed'li sentetik CV/JD uretici, calistir: benchmark + regresyon kontrolu,
+bellek: oturum basina bellek olcumu,
+yuk: sahte LLM sunucusu ile eszamanli oturum yuk testi,
+ai_butce: AI feedback gecikme butcesi / hedge / kural tabanli yedek,
+ai_bolumlu: uzun CV'lerde bolum bazli paralel (map-reduce) AI feedback,
+ayristirma: kaynak sinirli belge ayristirma havuzu,
+render: etkilesim basina sunucu cizim maliyeti (st.fragment).
+
+yuk ve render icin ek bagimliliklar: pip install -r benchmark/requirements.txt
+"""
@@ -0,0 +1,123 @@
+"""
+Bolumlu (map-reduce) AI feedback: uzun CV'lerde tek istek vs. bolum bazli paralel istekler.
+
+Kullanim:
+    python -m benchmark.ai_bolumlu --istek 20 --token-hizi 250 --hedge 2
+
+Sahte LLM cevap suresi gecikme + max_tokens / token_hizi oldugundan tek istegin
+2000 token'lik cevabi ile bolum notlari (paralel) + kisa birlestirme karsilastirilir:
+  tek     : ai_feedback_olustur, cv_baglami ile 3000 karaktere sigdirilmis CV
+  bolumlu : BolumluFeedback.olustur, bos onbellek
+  duzenli : ayni CV'lerde tek bir bolum degistirilip bolumlu yeniden calistirilir
+Her analiz uygulamadaki gibi AIFeedbackYoneticisi uzerinden calisir (hedge, yeniden
+deneme, gecikme butcesi); bolumlu senaryolarda hedge yoneticide kapalidir, sadece
+birlestirme istegine uygulanir. Feedback gorunene kadar gecen sure (p50/p95/max), butce
+asiminda kural tabanli ozet sayisi, gonderilen istek sayisi ve kapsama (CV
+karakterlerinin LLM'e giden orani) raporlanir.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+from benchmark.ai_butce import _sahte_secrets
+from benchmark.korpus import korpus_uret
+from benchmark.yuk import sahte_llm_sunucusu, yuzdelik
+
+
+def uzun_cv(cv, kopya):
+    """Korpus CV'sinin bolum iceriklerini cogaltarak uzun (cok sayfali) CV uret."""
+    parcalar = []
+    for bolum, bas, bit in app.bolum_araliklari(cv):
+        metin = cv[bas:bit]
+        if bolum == "giris":
+            parcalar.append(metin)
+            continue
+        baslik, _, govde = metin.partition("\n")
+        parcalar.append(baslik + "\n" + "\n".join([govde.rstrip("\n")] * kopya) + "\n\n")
+    return "".join(parcalar)
+
+
+def kapsama(cv, jd, bolumlu):
+    """CV'nin LLM'e giden karakter orani."""
+    if not bolumlu:
+        return len(app.cv_baglami(cv, jd, 3000)) / len(cv)
+    parcalar, kisa = app.bolum_parcalari(cv)
+    gonderilen = len(kisa) + sum(len(app.cv_baglami(m, jd, app.AI_BOLUM_MAX_KARAKTER)) for _, m in parcalar)
+    return min(1.0, gonderilen / len(cv))
+
+
+def senaryo_calistir(girdiler, eszamanli, uretici, butce, hedge_sn):
+    yonetici = app.AIFeedbackYoneticisi(uretici=uretici, isci=eszamanli * app.AI_MAX_DENEME, hedge_sn=hedge_sn)
+    sureler, isler = [], []
+
+    def analiz(i, girdi):
+        baslangic = time.monotonic()
+        is_ = yonetici.baslat(f"{i}", *girdi)
+        metin = yonetici.bekle(is_, butce)
+        sureler.append(time.monotonic() - baslangic)
+        isler.append((is_, metin is None))
+
+    with ThreadPoolExecutor(max_workers=eszamanli) as havuz:
+        for is_ in [havuz.submit(analiz, i, girdi) for i, girdi in enumerate(girdiler)]:
+            is_.result()
+    # Hedge / gec gelen cevaplar bitsin ki istek sayisi bir sonraki senaryoya karismasin
+    for is_, _ in isler:
+        is_.bitti.wait(app.AI_ISTEK_ZAMAN_ASIMI * app.AI_MAX_DENEME)
+    yonetici.havuz.shutdown(wait=True)
+    return sureler, sum(1 for _, kural in isler if kural)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bolumlu AI feedback benchmark'i")
+    parser.add_argument("--istek", type=int, default=20, help="analiz sayisi")
+    parser.add_argument("--eszamanli", type=int, default=4)
+    parser.add_argument("--kopya", type=int, default=6, help="bolum iceriklerinin cogaltilma sayisi")
+    parser.add_argument("--gecikme", type=float, default=0.3, help="sahte LLM sabit gecikmesi (sn)")
+    parser.add_argument("--token-hizi", type=float, default=250.0)
+    parser.add_argument("--isci", type=int, default=app.AI_BOLUM_ISCI, help="ATS_AI_BOLUM_ISCI")
+    parser.add_argument("--butce", type=float, default=app.AI_BUTCE_SN, help="ATS_AI_BUTCE_SN")
+    parser.add_argument("--hedge", type=float, default=app.AI_HEDGE_SN,
+                        help="ATS_AI_HEDGE_SN (bos: gozlenen p95, ilk ornekler hedge'siz)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    sunucu, base_url = sahte_llm_sunucusu(args.gecikme, args.token_hizi, cevap_token=2000)
+    os.environ["GROQ_BASE_URL"] = base_url
+    _sahte_secrets()
+
+    girdiler = []
+    for cv, jd in korpus_uret(args.seed, args.istek):
+        cv = uzun_cv(cv, args.kopya)
+        eslesen, eksik = app.keyword_analizi(cv, jd)
+        format_sorunlari = app.format_sorunlari_tespit(cv)
+        puan, _ = app.puan_hesapla(cv, jd, app.bolum_tespit(cv), eslesen, format_sorunlari)
+        girdiler.append((cv, jd, puan, eksik, format_sorunlari, True))
+    duzenli = [(cv.replace("\n- ", "\n- Ekip ile ", 1), *girdi) for cv, *girdi in girdiler]
+
+    bolumlu = app.BolumluFeedback(isci=args.isci, hedge_sn=args.hedge)
+    senaryolar = {
+        "tek": (app.ai_feedback_olustur, girdiler, False),
+        "bolumlu": (bolumlu.olustur, girdiler, True),
+        "duzenli": (bolumlu.olustur, duzenli, True),
+    }
+    print(f"ortalama CV: {sum(len(g[0]) for g in girdiler) // len(girdiler)} karakter, "
+          f"{sum(len(app.bolum_parcalari(g[0])[0]) for g in girdiler) / len(girdiler):.1f} bolum")
+    print(f"{'senaryo':<10}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'kural':>7}{'istek':>7}{'kapsama':>9}")
+    for ad, (uretici, girdi, bolumlu_mu) in senaryolar.items():
+        once = sunucu.istek_sayisi
+        hedge_sn = float("inf") if bolumlu_mu else args.hedge
+        sureler, kural = senaryo_calistir(girdi, args.eszamanli, uretici, args.butce, hedge_sn)
+        oran = sum(kapsama(g[0], g[1], bolumlu_mu) for g in girdi) / len(girdi)
+        print(f"{ad:<10}" + "".join(f"{yuzdelik(sureler, p) * 1000:>9.0f}" for p in (50, 95, 100))
+              + f"{kural:>7}{sunucu.istek_sayisi - once:>7}{oran:>9.0%}")
+    print(f"bolumlu: {bolumlu.istatistik()}")
+    bolumlu.havuz.shutdown(wait=True)
+    bolumlu.son_havuz.shutdown(wait=True)
+    sunucu.shutdown()
+
+
+if __name__ == "__main__":
+    main()
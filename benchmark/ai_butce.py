@@ -0,0 +1,108 @@
+"""
+AI feedback gecikme butcesi: yavas / hatali sahte LLM'e karsi butceli vs. butcesiz.
+
+Kullanim:
+    python -m benchmark.ai_butce --istek 40 --yavas-orani 0.1 --hata-orani 0.1 --butce 3
+
+Her senaryo ayni sahte sunucu ayarlariyla AIFeedbackYoneticisi'ni calistirir:
+  butcesiz: tek istek, cevap gelene kadar bekle (eski davranis)
+  butceli : gozlenen p95 (ya da --hedge sn) sonra ikinci istek, hatada yeniden deneme, --butce sn sonra
+            kural tabanli ozet; LLM cevabi sonradan gelirse yukseltme sayilir
+Kullanicinin feedback gorene kadar bekledigi sure (p50/p95/p99/max), kural tabanli
+ozet orani (butcesizde: hata mesaji gosterilen analiz), sonunda LLM cevabi alinabilen
+analiz orani ve gonderilen istek sayisi raporlanir.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+from benchmark.korpus import korpus_uret
+from benchmark.yuk import sahte_llm_sunucusu, yuzdelik
+
+SINIRSIZ = 3600.0
+
+
+def _sahte_secrets():
+    """get_groq_client st.secrets okur; gecici dizinde sahte anahtar."""
+    dizin = tempfile.mkdtemp(prefix="ats_ai_butce_")
+    os.makedirs(os.path.join(dizin, ".streamlit"))
+    with open(os.path.join(dizin, ".streamlit", "secrets.toml"), "w") as f:
+        f.write('GROQ_API_KEY = "sahte"\n')
+    os.chdir(dizin)
+
+
+def senaryo_calistir(girdiler, eszamanli, butce, hedge_sn, max_deneme):
+    yonetici = app.AIFeedbackYoneticisi(isci=eszamanli * max_deneme, hedge_sn=hedge_sn, max_deneme=max_deneme)
+    bekleme, isler = [], []
+
+    def analiz(i, girdi):
+        baslangic = time.monotonic()
+        is_ = yonetici.baslat(f"{i}", *girdi)
+        metin = yonetici.bekle(is_, butce)
+        bekleme.append(time.monotonic() - baslangic)
+        isler.append((is_, metin is None))
+
+    with ThreadPoolExecutor(max_workers=eszamanli) as havuz:
+        for is_ in [havuz.submit(analiz, i, girdi) for i, girdi in enumerate(girdiler)]:
+            is_.result()
+    # Butce sonrasi gelen cevaplari bekle (yukseltme)
+    for is_, _ in isler:
+        is_.bitti.wait(app.AI_ISTEK_ZAMAN_ASIMI * max_deneme)
+    yonetici.havuz.shutdown(wait=True)
+    return {
+        "bekleme": bekleme,
+        "kural": sum(1 for _, kural in isler if kural),
+        "yukseltme": sum(1 for is_, kural in isler if kural and is_.metin is not None),
+        "llm_basarili": sum(1 for is_, _ in isler if is_.metin is not None),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI feedback gecikme butcesi benchmark'i")
+    parser.add_argument("--istek", type=int, default=40, help="analiz sayisi")
+    parser.add_argument("--eszamanli", type=int, default=8)
+    parser.add_argument("--gecikme", type=float, default=0.3, help="sahte LLM sabit gecikmesi (sn)")
+    parser.add_argument("--token-hizi", type=float, default=1000.0)
+    parser.add_argument("--cevap-token", type=int, default=700)
+    parser.add_argument("--hata-orani", type=float, default=0.1)
+    parser.add_argument("--yavas-orani", type=float, default=0.1)
+    parser.add_argument("--yavas-carpan", type=float, default=8.0)
+    parser.add_argument("--butce", type=float, default=3.0, help="ATS_AI_BUTCE_SN")
+    parser.add_argument("--hedge", type=float, default=app.AI_HEDGE_SN,
+                        help="ATS_AI_HEDGE_SN (bos: gozlenen p95, ilk ornekler hedge'siz)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    sunucu, base_url = sahte_llm_sunucusu(args.gecikme, args.token_hizi, args.cevap_token, args.hata_orani,
+                                          args.yavas_orani, args.yavas_carpan)
+    os.environ["GROQ_BASE_URL"] = base_url
+    _sahte_secrets()
+
+    girdiler = []
+    for cv, jd in korpus_uret(args.seed, args.istek):
+        eslesen, eksik = app.keyword_analizi(cv, jd)
+        format_sorunlari = app.format_sorunlari_tespit(cv)
+        puan, _ = app.puan_hesapla(cv, jd, app.bolum_tespit(cv), eslesen, format_sorunlari)
+        girdiler.append((cv, jd, puan, eksik, format_sorunlari, True))
+
+    senaryolar = {
+        "butcesiz": (SINIRSIZ, SINIRSIZ, 1),
+        "butceli": (args.butce, args.hedge, app.AI_MAX_DENEME),
+    }
+    print(f"{'senaryo':<10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'kural':>7}{'yukselt':>9}{'llm ok':>8}{'istek':>7}")
+    for ad, (butce, hedge_sn, max_deneme) in senaryolar.items():
+        once = sunucu.istek_sayisi
+        s = senaryo_calistir(girdiler, args.eszamanli, butce, hedge_sn, max_deneme)
+        print(f"{ad:<10}" + "".join(f"{yuzdelik(s['bekleme'], p) * 1000:>9.0f}" for p in (50, 95, 99, 100))
+              + f"{s['kural']:>7}{s['yukseltme']:>9}{s['llm_basarili']:>5}/{len(girdiler):<2}"
+              + f"{sunucu.istek_sayisi - once:>7}")
+    sunucu.shutdown()
+
+
+if __name__ == "__main__":
+    main()
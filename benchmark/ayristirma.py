@@ -0,0 +1,88 @@
+"""
+Ayristirma havuzu: normal yuklemeler arasina agir / bozuk dosyalar karistiginda
+kuyruk bekleme ve ayristirma sureleri.
+
+Kullanim:
+    python -m benchmark.ayristirma --istek 60 --agir 3 --isci 2
+
+Her senaryo ayni dosya karisimini --eszamanli kadar thread ile gonderir:
+  ayni_surec: app.parse_pdf/parse_docx dogrudan (eski davranis, limit yok)
+  havuz     : AyristirmaHavuzu (CPU / duvar saati / bellek limitli surecler)
+Normal dosyalarin toplam bekleme suresi (p50/p95/max), agir dosyalarin ne kadar
+surede reddedildigi ve hata nedenleri raporlanir.
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+from ayristirma import AyristirmaHatasi, AyristirmaHavuzu
+from benchmark.korpus import docx_olustur, korpus_uret, pdf_olustur
+from benchmark.yuk import yuzdelik
+
+
+def _dosyalar(istek, agir, seed):
+    rng = random.Random(seed)
+    cvler = [cv for cv, _ in korpus_uret(seed, max(10, istek))]
+    dosyalar = []
+    for i, cv in enumerate(cvler[:istek]):
+        dosyalar.append(("pdf", pdf_olustur(cv), False) if i % 3 else ("docx", docx_olustur(cv), False))
+    agir_pdf = pdf_olustur("\n".join(cvler[:10] * 12))  # ~120 sayfa, ayni surecte ~7 sn
+    for _ in range(agir):
+        dosyalar.insert(rng.randrange(len(dosyalar)), ("pdf", agir_pdf, True))
+    dosyalar.insert(rng.randrange(len(dosyalar)), ("pdf", b"%PDF-1.4 bozuk", False))
+    return dosyalar
+
+
+def senaryo_calistir(dosyalar, eszamanli, ayristir):
+    normal, agir, nedenler = [], [], Counter()
+
+    def tek(tur, veri, agir_mi):
+        baslangic = time.monotonic()
+        try:
+            ayristir(tur, veri)
+        except AyristirmaHatasi as e:
+            nedenler[e.neden] += 1
+        except Exception as e:
+            nedenler[type(e).__name__] += 1
+        (agir if agir_mi else normal).append(time.monotonic() - baslangic)
+
+    with ThreadPoolExecutor(max_workers=eszamanli) as havuz:
+        for is_ in [havuz.submit(tek, *d) for d in dosyalar]:
+            is_.result()
+    return normal, agir, nedenler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ayristirma havuzu benchmark'i")
+    parser.add_argument("--istek", type=int, default=60, help="normal dosya sayisi")
+    parser.add_argument("--agir", type=int, default=3, help="agir PDF sayisi")
+    parser.add_argument("--eszamanli", type=int, default=4)
+    parser.add_argument("--isci", type=int, default=app.AYRISTIRMA_ISCI or 2)
+    parser.add_argument("--cpu-sn", type=int, default=2, help="ATS_AYRISTIRMA_CPU_SN")
+    parser.add_argument("--sure-sn", type=float, default=5.0, help="ATS_AYRISTIRMA_SURE_SN")
+    parser.add_argument("--bellek-mb", type=int, default=app.AYRISTIRMA_BELLEK_MB)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    dosyalar = _dosyalar(args.istek, args.agir, args.seed)
+    havuz = AyristirmaHavuzu(isci=args.isci, cpu_sn=args.cpu_sn, sure_sn=args.sure_sn, bellek_mb=args.bellek_mb)
+
+    def ayni_surec(tur, veri):
+        return app.parse_pdf(veri) if tur == "pdf" else app.parse_docx(veri)
+
+    senaryolar = {"ayni_surec": ayni_surec, "havuz": havuz.ayristir}
+    print(f"{'senaryo':<12}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'agir max':>10}  nedenler")
+    for ad, ayristir in senaryolar.items():
+        normal, agir, nedenler = senaryo_calistir(dosyalar, args.eszamanli, ayristir)
+        print(f"{ad:<12}" + "".join(f"{yuzdelik(normal, p) * 1000:>9.0f}" for p in (50, 95, 100))
+              + f"{max(agir, default=0) * 1000:>10.0f}  {dict(nedenler)}")
+    print(f"havuz: {havuz.istatistik()}")
+    havuz.kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Oturum basina bellek olcumu: eski session_state duzeni vs. hash + paylasilan depo.
+
+Kullanim:
+    python -m benchmark.bellek --oturum 300
+
+Her simule oturum korpustan bir CV ve (cogunlukla ortak) bir ilan secer,
+bir AI feedback ve --tur kadar sohbet turu alir; --canli-oran kadari canli
+puanlama modunu da kullanir. Iki duzen tracemalloc ile olculur: eski duzende
+canli puanlayici session_state'te, yeni duzende paylasilan depo ve depo sinirina
+dahil canli puanlayici deposunda; ikisi de toplam maliyete dahildir.
+"""
+
+import argparse
+import random
+import tracemalloc
+
+import app
+from benchmark.korpus import korpus_uret
+
+
+def _kopya(metin):
+    """Her oturumun kendi string nesnesine sahip olmasi icin (yukleme/yapistirma gibi)."""
+    return metin.encode("utf-8").decode("utf-8")
+
+
+def _senaryolar(oturum, tur, seed, canli_oran):
+    rng = random.Random(seed)
+    ciftler = korpus_uret(seed, max(10, oturum // 3))
+    ilanlar = [jd for _, jd in ciftler[:5]]  # adaylarin cogu ayni birkac ilana basvurur
+    analizler = {}
+    senaryolar = []
+    for i in range(oturum):
+        cv = rng.choice(ciftler)[0]
+        jd = rng.choice(ilanlar)
+        if (cv, jd) not in analizler:
+            bolumler = app.bolum_tespit(cv)
+            eslesen, eksik = app.keyword_analizi(cv, jd)
+            format_sorunlari = app.format_sorunlari_tespit(cv)
+            puan, breakdown = app.puan_hesapla(cv, jd, bolumler, eslesen, format_sorunlari)
+            analizler[(cv, jd)] = (puan, breakdown, bolumler, eslesen, eksik, format_sorunlari)
+        feedback = f"## Oturum {i}\n" + cv[:1500] + "\n" + jd[:1500]
+        sohbet = [(soru, f"Cevap {i}/{j}: " + cv[j * 200:j * 200 + 1500])
+                  for j, (_, soru) in enumerate(app.hizli_sorular(True)[:tur])]
+        senaryolar.append((cv, jd, feedback, analizler[(cv, jd)], sohbet, rng.random() < canli_oran))
+    return senaryolar
+
+
+def eski_duzen(senaryolar):
+    oturumlar = []
+    for cv, jd, feedback, (puan, breakdown, bolumler, eslesen, eksik, format_sorunlari), sohbet, canli_mod in senaryolar:
+        durum = {
+            "analiz_yapildi": True, "cv_text": _kopya(cv), "jd_text": _kopya(jd),
+            "mesaj_gecmisi": [], "sohbet_mesajlari": [], "dil": "tr", "tema": "lacivert",
+            "bolumler": dict(bolumler), "eslesen": list(eslesen), "eksik": list(eksik),
+            "format_sorunlari": list(format_sorunlari), "puan": puan, "breakdown": dict(breakdown),
+            "ai_feedback": _kopya(feedback),
+        }
+        for soru, cevap in sohbet:
+            soru, cevap = _kopya(soru), _kopya(cevap)
+            durum["sohbet_mesajlari"].append({"role": "user", "content": soru})
+            durum["mesaj_gecmisi"].append({"role": "user", "content": soru})
+            durum["mesaj_gecmisi"].append({"role": "assistant", "content": cevap})
+            durum["sohbet_mesajlari"].append({"role": "assistant", "content": cevap})
+        if canli_mod:
+            durum["canli_puanlayici"] = app.CanliPuanlayici(_kopya(jd))
+            durum["canli_puanlayici"].guncelle(_kopya(cv))
+        oturumlar.append(durum)
+    return oturumlar
+
+
+def yeni_duzen(senaryolar, depo, canli):
+    oturumlar = []
+    for cv, jd, feedback, (puan, breakdown, bolumler, eslesen, eksik, format_sorunlari), sohbet, canli_mod in senaryolar:
+        durum = {
+            "oturum_id": app.uuid.uuid4().hex, "dil": "tr", "tema": "lacivert",
+            "sonuc": app.sonuc_kaydi(depo, _kopya(cv), _kopya(jd), _kopya(feedback), puan,
+                                     dict(breakdown), dict(bolumler), eslesen, eksik, format_sorunlari, None),
+            "sohbet": [],
+        }
+        for soru, cevap in sohbet:
+            durum["sohbet"].append(("user", depo.koy(_kopya(soru)), True))
+            durum["sohbet"].append(("assistant", depo.koy(_kopya(cevap)), True))
+        depo.oturum_bildir(durum["oturum_id"], app.oturum_hashleri(durum))
+        if canli_mod:
+            puanlayici = app.CanliPuanlayici(_kopya(jd))
+            puanlayici.guncelle(_kopya(cv))
+            canli.koy(durum["oturum_id"], puanlayici)
+        oturumlar.append(durum)
+    return oturumlar
+
+
+def _olc(fonk, *args):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    once = tracemalloc.get_traced_memory()[0]
+    sonuc = fonk(*args)
+    sonra = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sonuc, sonra - once
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Oturum basina bellek olcumu")
+    parser.add_argument("--oturum", type=int, default=300)
+    parser.add_argument("--tur", type=int, default=3, help="oturum basina sohbet turu")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--depo-mb", type=float, default=app.DEPO_MAX_MB)
+    parser.add_argument("--canli-oran", type=float, default=0.5, help="canli mod kullanan oturum orani")
+    parser.add_argument("--canli-max", type=int, default=app.CANLI_MAX_OTURUM, help="ATS_CANLI_MAX_OTURUM")
+    args = parser.parse_args(argv)
+
+    senaryolar = _senaryolar(args.oturum, args.tur, args.seed, args.canli_oran)
+    _, eski_bayt = _olc(eski_duzen, senaryolar)
+    depo = app.IcerikDeposu(max_bayt=int(args.depo_mb * 1024 * 1024))
+    canli = app.CanliPuanlayiciDeposu(depo, max_oturum=args.canli_max)
+    yeni, yeni_bayt = _olc(yeni_duzen, senaryolar, depo, canli)
+    oturum_bayt = sum(app.derin_boyut(d) for d in yeni) / len(yeni)
+    canli_ist = canli.istatistik()
+
+    print(f"oturum sayisi          : {args.oturum}")
+    print(f"eski duzen / oturum    : {eski_bayt / args.oturum / 1024:8.1f} KiB")
+    print(f"yeni duzen / oturum    : {yeni_bayt / args.oturum / 1024:8.1f} KiB  (depo payi dahil)")
+    print(f"  sadece session_state : {oturum_bayt / 1024:8.1f} KiB")
+    print(f"  depo                 : {depo.istatistik()}")
+    print(f"  canli puanlayicilar  : {canli_ist['oturum']} kayit, "
+          f"{canli_ist['bayt'] / max(canli_ist['oturum'], 1) / 1024:.1f} KiB / kayit")
+    print(f"azalma                 : %{100 * (1 - yeni_bayt / max(eski_bayt, 1)):.0f}")
+
+
+if __name__ == "__main__":
+    main()
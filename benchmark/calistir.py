@@ -0,0 +1,270 @@
+"""
+Mikro benchmark'lar + uctan uca throughput, kayitli baseline ile karsilastirma.
+
+Kullanim:
+    python -m benchmark.calistir                  # olc ve baseline ile karsilastir
+    python -m benchmark.calistir --kaydet         # baseline'da olmayan benchmark'lari ekle
+    python -m benchmark.calistir --kaydet --sadece vurgulu_cv   # sadece bunu yeniden kaydet
+    python -m benchmark.calistir --kaydet --yenile                # tum baseline + kalibrasyon
+    python -m benchmark.calistir --esik 1.5       # %50'den fazla yavaslama regresyon sayilir
+    python -m benchmark.calistir --sadece puan_hesapla parse_pdf
+
+Regresyon varsa cikis kodu 1 olur (CI icin). Baseline dosyasindaki "esikler"
+anahtari ile benchmark bazinda esik verilebilir; --esik varsayilani ezer.
+
+Sureler makineye bagli oldugundan her calistirmada sabit bir saf Python isi
+(kalibrasyon) da olculur. Karsilastirmada baseline degerleri iki makinenin
+kalibrasyon orani ile olceklenir; kaydedilen degerler de baseline'in
+kalibrasyonuna cevrilir. --kaydet mevcut degerleri ezmez, sadece --sadece ile
+verilenleri yeniden yazar; --yenile baseline'i bu makinede bastan olusturur.
+
+canli_duzenleme olculmeden once CanliPuanlayici rastgele satir duzenlemeleriyle
+tam pipeline'a (bolum_tespit, keyword_analizi, format_sorunlari_tespit,
+puan_hesapla) karsi dogrulanir; fark varsa AssertionError.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+import app
+from benchmark.korpus import korpus_uret, pdf_olustur, docx_olustur
+
+BASELINE_YOLU = os.path.join(os.path.dirname(__file__), "baseline.json")
+VARSAYILAN_ESIK = 1.25
+
+
+def _olc(fonk, girdiler, tekrar):
+    """Her tekrarda tum girdileri isle; en iyi tekrarin cagri basina suresini (us) dondur."""
+    en_iyi = float("inf")
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        for girdi in girdiler:
+            fonk(*girdi)
+        en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+    return en_iyi * 1e6 / max(len(girdiler), 1)
+
+
+def _kalibrasyon_isi():
+    """Makine hizi olcusu: uygulamadan bagimsiz, sabit regex + dict + sort isi."""
+    metin = " ".join(f"kelime{i * 7919 % 1000} Python-{i % 37}" for i in range(2000))
+    sayilar = {}
+    for kelime in re.findall(r"\w+", metin.lower()):
+        sayilar[kelime] = sayilar.get(kelime, 0) + 1
+    return sorted(sayilar.items(), key=lambda x: (-x[1], x[0]))
+
+
+def kalibrasyon_olc(tekrar=5):
+    return round(_olc(_kalibrasyon_isi, [()], tekrar), 2)
+
+
+def _uctan_uca(cv_text, jd_text):
+    bolumler = app.bolum_tespit(cv_text)
+    indeks = app.KonumIndeksi(cv_text)
+    eslesen, eksik = app.keyword_analizi(cv_text, jd_text, indeks)
+    format_sorunlari = app.format_sorunlari_tespit(cv_text)
+    return app.puan_hesapla(cv_text, jd_text, bolumler, eslesen, format_sorunlari, indeks)
+
+
+def _canli_duzenleme(puanlayici, metin, duzenlenmis):
+    """Tek satirlik duzenleme ve geri alma: iki artimli guncelleme."""
+    puanlayici.guncelle(duzenlenmis)
+    puanlayici.sonuc()
+    puanlayici.guncelle(metin)
+    return puanlayici.sonuc()
+
+
+CANLI_EKLER = (" python", " led team 20%", "", " SKILLS", "x")
+CANLI_SATIRLAR = ("- increased sales 30%", "", "linkedin.com/x", "EGITIM", "java sql")
+
+
+def canli_esdegerlik_kontrol(ciftler, adim=25, seed=5):
+    """Rastgele ekleme / silme / bolme / kesme duzenlemelerinde CanliPuanlayici tam pipeline ile ayni mi."""
+    rng = random.Random(seed)
+    for cv, jd in ciftler:
+        puanlayici = app.CanliPuanlayici(jd)
+        metin = cv
+        puanlayici.guncelle(metin)
+        for _ in range(adim):
+            satirlar = metin.split("\n")
+            r, i = rng.random(), rng.randrange(len(satirlar))
+            if r < 0.35:
+                satirlar[i] += rng.choice(CANLI_EKLER)
+            elif r < 0.5:
+                del satirlar[i]
+            elif r < 0.7:
+                satirlar.insert(i, rng.choice(CANLI_SATIRLAR))
+            elif r < 0.85:
+                # Satiri bosluktan bol: satir ici bigram satirlar arasi gecise doner
+                bas, _, son = satirlar[i].rpartition(" ")
+                satirlar[i:i + 1] = [bas, son] if bas else [son]
+            else:
+                satirlar[i] = satirlar[i][:len(satirlar[i]) // 2]
+            metin = "\n".join(satirlar) or "a"
+            puanlayici.guncelle(metin)
+            canli = puanlayici.sonuc()
+            bolumler = app.bolum_tespit(metin)
+            eslesen, eksik = app.keyword_analizi(metin, jd)
+            format_sorunlari = app.format_sorunlari_tespit(metin)
+            tam = {
+                "puan_breakdown": app.puan_hesapla(metin, jd, bolumler, eslesen, format_sorunlari),
+                "bolumler": bolumler, "eslesen": set(eslesen), "eksik": eksik,
+                "format_sorunlari": format_sorunlari,
+            }
+            artimli = {
+                "puan_breakdown": (canli["puan"], canli["breakdown"]),
+                "bolumler": canli["bolumler"], "eslesen": set(canli["eslesen"]), "eksik": canli["eksik"],
+                "format_sorunlari": canli["format_sorunlari"],
+            }
+            farkli = [ad for ad in tam if tam[ad] != artimli[ad]]
+            assert not farkli, f"CanliPuanlayici tam pipeline'dan farkli: {farkli}\n{metin[:200]!r}"
+
+
+def _paket_kaynaktan(kaynak):
+    return app.paket_olustur(*app.paket_kaynagi_oku(kaynak))
+
+
+def _paket_acilis(kaynak):
+    """Yeni surec acilisi: bos depo, ilk erisimde stat + derlenmis paketi yukle."""
+    return app.VeriPaketDeposu(kaynak).guncel()
+
+
+def benchmarklari_calistir(seed=42, adet=40, tekrar=5, sadece=None, kalibrasyonlar=None):
+    """Benchmark sonuclari (us); kalibrasyonlar listesi verilirse her benchmark'tan once
+    olculen kalibrasyon sureleri eklenir."""
+    ciftler = korpus_uret(seed, adet)
+    hazir, vurgu = [], []
+    for cv, jd in ciftler:
+        bolumler = app.bolum_tespit(cv)
+        eslesen, eksik = app.keyword_analizi(cv, jd)
+        hazir.append((cv, jd, bolumler, eslesen, app.format_sorunlari_tespit(cv)))
+        vurgu.append((cv, jd, json.dumps([eslesen, eksik, []], ensure_ascii=False)))
+    if not sadece or "canli_duzenleme" in sadece:
+        canli_esdegerlik_kontrol(ciftler)
+    canli = []
+    for cv, jd in ciftler:
+        puanlayici = app.CanliPuanlayici(jd)
+        puanlayici.guncelle(cv)
+        canli.append((puanlayici, cv, cv.replace("\n", "\n- python sql\n", 1)))
+    app.veri_paketi()  # derlenmis paket yoksa olustur
+    paket_girdileri = [(app.PAKET_KAYNAK,)] * 50
+    # Dosya parse'i pahali; daha kucuk bir alt kume yeterli
+    dosya_alt = [cv for cv, _ in ciftler[:max(1, adet // 4)]]
+
+    benchler = {
+        "temizle": (app.temizle, [(cv,) for cv, _ in ciftler]),
+        "kelimeleri_cikar": (app.kelimeleri_cikar, [(cv,) for cv, _ in ciftler]),
+        "keyword_analizi": (app.keyword_analizi, ciftler),
+        "puan_hesapla": (app.puan_hesapla, hazir),
+        "uctan_uca": (_uctan_uca, ciftler),
+        "minhash_imza": (app.minhash_imza, [(cv,) for cv, _ in ciftler]),
+        "konum_indeksi": (app.KonumIndeksi, [(cv,) for cv, _ in ciftler]),
+        # Onbelleksiz: her cagri indeks + isabet + HTML + yogunluk
+        "vurgulu_cv": (app.vurgulu_cv, vurgu),
+        "cv_baglami": (app.cv_baglami, [("\n".join((cv,) * 3), jd, 3000) for cv, jd in ciftler]),
+        "canli_duzenleme": (_canli_duzenleme, canli),
+        "paket_kaynak_yukle": (_paket_kaynaktan, paket_girdileri),
+        "paket_derlenmis_yukle": (app.paket_yukle, [(app.paket_yolu(k),) for k, in paket_girdileri]),
+        "paket_acilis": (_paket_acilis, paket_girdileri),
+    }
+    if app.PDF_SUPPORT:
+        benchler["parse_pdf"] = (app.parse_pdf, [(pdf_olustur(cv),) for cv in dosya_alt])
+    if app.DOCX_SUPPORT:
+        benchler["parse_docx"] = (app.parse_docx, [(docx_olustur(cv),) for cv in dosya_alt])
+
+    sonuclar = {}
+    for ad, (fonk, girdiler) in benchler.items():
+        if sadece and ad not in sadece:
+            continue
+        if kalibrasyonlar is not None:
+            kalibrasyonlar.append(kalibrasyon_olc(tekrar))
+        sonuclar[ad] = round(_olc(fonk, girdiler, tekrar), 2)
+    if "uctan_uca" in sonuclar:
+        sonuclar["uctan_uca_cv_per_sn"] = round(1e6 / max(sonuclar["uctan_uca"], 1e-9), 1)
+    return sonuclar
+
+
+def olcek_hesapla(baseline, kalibrasyon):
+    """Bu makinenin baseline makinesine gore yavaslik orani; kalibrasyon yoksa 1."""
+    onceki = baseline.get("kalibrasyon_us")
+    return kalibrasyon / onceki if onceki else 1.0
+
+
+def karsilastir(sonuclar, baseline, esik, olcek=1.0):
+    """(ad, simdiki, onceki, oran, regresyon_mu) listesi dondur; onceki bu makineye olceklenir."""
+    esikler = baseline.get("esikler", {})
+    onceki_sonuclar = baseline.get("sonuclar", {})
+    satirlar = []
+    for ad, simdiki in sonuclar.items():
+        onceki = onceki_sonuclar.get(ad)
+        if onceki is None:
+            satirlar.append((ad, simdiki, None, None, False))
+            continue
+        if ad.endswith("_per_sn"):
+            # Throughput: buyuk olan iyi
+            onceki = onceki / olcek
+            oran = onceki / max(simdiki, 1e-9)
+        else:
+            onceki = onceki * olcek
+            oran = simdiki / max(onceki, 1e-9)
+        satirlar.append((ad, simdiki, onceki, oran, oran > esikler.get(ad, esik)))
+    return satirlar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATS CV Optimizer benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--adet", type=int, default=40, help="korpustaki (cv, jd) cifti sayisi")
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--esik", type=float, default=VARSAYILAN_ESIK,
+                        help="simdiki/baseline orani bunu asarsa regresyon")
+    parser.add_argument("--baseline", default=BASELINE_YOLU)
+    parser.add_argument("--kaydet", action="store_true", help="sonuclari baseline olarak yaz")
+    parser.add_argument("--yenile", action="store_true",
+                        help="--kaydet ile: tum degerleri ve kalibrasyonu bu makineye gore yeniden yaz")
+    parser.add_argument("--sadece", nargs="*", help="sadece bu benchmark'lari calistir")
+    args = parser.parse_args(argv)
+
+    # Benchmark'lar arasina serpistirilmis olcumlerin en iyisi (_olc gibi, gurultu en az)
+    kalibrasyonlar = []
+    sonuclar = benchmarklari_calistir(args.seed, args.adet, args.tekrar, args.sadece, kalibrasyonlar)
+    kalibrasyon = min(kalibrasyonlar + [kalibrasyon_olc(args.tekrar)])
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    if not baseline.get("kalibrasyon_us") or (args.kaydet and args.yenile):
+        baseline["kalibrasyon_us"] = kalibrasyon
+    olcek = olcek_hesapla(baseline, kalibrasyon)
+
+    if args.kaydet:
+        eski_sonuclar = baseline.get("sonuclar", {})
+        # Baseline makinesinin birimine cevir; throughput ters olceklenir
+        yeni = {ad: round(deger * olcek if ad.endswith("_per_sn") else deger / olcek, 2)
+                for ad, deger in sonuclar.items() if args.sadece or args.yenile or ad not in eski_sonuclar}
+        baseline = {"seed": args.seed, "adet": args.adet, "kalibrasyon_us": baseline["kalibrasyon_us"],
+                    "sonuclar": {**eski_sonuclar, **yeni}, "esikler": baseline.get("esikler", {})}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline yazildi: {args.baseline} ({', '.join(sorted(yeni)) or 'degisiklik yok'})")
+
+    regresyon = False
+    print(f"kalibrasyon: {kalibrasyon:.1f} us (baseline {baseline['kalibrasyon_us']:.1f} us, olcek {olcek:.2f})")
+    print(f"{'benchmark':<24}{'simdiki':>18}{'baseline':>12}{'oran':>8}")
+    for ad, simdiki, onceki, oran, kotu in karsilastir(sonuclar, baseline, args.esik, olcek):
+        birim = "cv/sn" if ad.endswith("_per_sn") else "us"
+        onceki_str = f"{onceki:.1f}" if onceki is not None else "-"
+        oran_str = f"{oran:.2f}" if oran is not None else "-"
+        print(f"{ad:<24}{simdiki:>11.1f} {birim:<6}{onceki_str:>12}{oran_str:>8}{'  REGRESYON' if kotu else ''}")
+        regresyon = regresyon or kotu
+    return 1 if regresyon else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
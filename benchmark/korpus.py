@@ -0,0 +1,225 @@
+"""
+Seed'li sentetik CV / is ilani uretici.
+Ayni seed her zaman ayni korpusu uretir; benchmark sonuclari karsilastirilabilir kalir.
+
+Kullanim:
+    python -m benchmark.korpus fikstur/      # ornek PDF/DOCX/TXT dosyalarini yaz
+"""
+
+import io
+import os
+import random
+import sys
+
+ISIMLER = ["Ahmet Yilmaz", "Elif Kaya", "Mehmet Demir", "Zeynep Celik", "Can Sahin",
+           "Ayse Arslan", "John Carter", "Emily Stone", "David Miller", "Sarah Brooks"]
+
+SIRKETLER = ["Anadolu Holding", "Marmara Teknoloji", "Ege Gida", "Bosphorus Retail",
+             "Delta Finans", "Atlas Lojistik", "Nova Software", "Kuzey Enerji"]
+
+OKULLAR = ["Istanbul Universitesi", "Orta Dogu Teknik Universitesi", "Ege Universitesi",
+           "Bogazici Universitesi", "Ankara Universitesi"]
+
+SEKTORLER = {
+    "satis": {
+        "unvan": {"tr": "Saha Satis Temsilcisi", "en": "Field Sales Representative"},
+        "terimler": ["satis hedefi", "musteri portfoyu", "kota", "pipeline", "crm", "teklif",
+                     "sozlesme", "b2b", "b2c", "saha ziyareti", "demo", "komisyon", "ikna"],
+    },
+    "it": {
+        "unvan": {"tr": "Yazilim Gelistirici", "en": "Software Engineer"},
+        "terimler": ["python", "java", "sql", "api", "cloud", "aws", "docker", "git", "agile",
+                     "scrum", "javascript", "react", "backend", "frontend", "database"],
+    },
+    "finans": {
+        "unvan": {"tr": "Muhasebe Uzmani", "en": "Financial Analyst"},
+        "terimler": ["muhasebe", "butce", "mali", "vergi", "excel", "erp", "sap", "fatura",
+                     "raporlama", "denetim"],
+    },
+    "pazarlama": {
+        "unvan": {"tr": "Dijital Pazarlama Uzmani", "en": "Digital Marketing Specialist"},
+        "terimler": ["sosyal medya", "seo", "dijital", "kampanya", "marka", "analitik",
+                     "google ads", "instagram", "linkedin", "icerik"],
+    },
+}
+
+FIILLER = {
+    "tr": ["yonettim", "gelistirdim", "olusturdum", "artirdim", "sagladim", "koordine ettim",
+           "tasarladim", "kurdum", "azalttim", "teslim ettim", "egittim"],
+    "en": ["led", "managed", "developed", "created", "achieved", "improved", "implemented",
+           "designed", "launched", "built", "increased", "reduced", "delivered"],
+}
+
+DOLGU = {
+    "tr": ["ekip ile birlikte", "musteri memnuniyeti odakli", "gunluk operasyon surecinde",
+           "bolge genelinde", "yeni surecler ile", "departmanlar arasi iletisim kurarak"],
+    "en": ["together with the team", "with a focus on customer satisfaction",
+           "across the region", "through new processes", "in daily operations",
+           "by coordinating across departments"],
+}
+
+BASLIKLAR = {
+    "tr": {"ozet": "OZET", "deneyim": "IS DENEYIMI", "egitim": "EGITIM",
+           "beceri": "YETENEKLER", "sertifika": "SERTIFIKALAR"},
+    "en": {"ozet": "SUMMARY", "deneyim": "WORK EXPERIENCE", "egitim": "EDUCATION",
+           "beceri": "SKILLS", "sertifika": "CERTIFICATIONS"},
+}
+
+UZUNLUKLAR = {"kisa": (1, 2), "orta": (2, 4), "uzun": (4, 8)}
+
+
+def _cumle(rng, dil, terimler):
+    fiil = rng.choice(FIILLER[dil])
+    terim = rng.choice(terimler)
+    dolgu = rng.choice(DOLGU[dil])
+    if rng.random() < 0.5:
+        sayi = f"%{rng.randint(5, 60)}" if dil == "tr" else f"{rng.randint(5, 60)}%"
+        return f"{terim} {dolgu} {fiil}, {sayi} artis" if dil == "tr" else f"{fiil} {terim} {dolgu}, {sayi} growth"
+    return f"{terim} {dolgu} {fiil}" if dil == "tr" else f"{fiil} {terim} {dolgu}"
+
+
+def cv_uret(rng, dil="tr", sektor="satis", uzunluk="orta", bullet_yogunlugu=0.7):
+    """Tek bir CV metni uret. bullet_yogunlugu: deneyim satirlarinin bullet olma orani."""
+    b = BASLIKLAR[dil]
+    bilgi = SEKTORLER[sektor]
+    terimler = rng.sample(bilgi["terimler"], k=min(len(bilgi["terimler"]), rng.randint(4, 9)))
+    isim = rng.choice(ISIMLER)
+    satirlar = [
+        isim,
+        f"{isim.split()[0].lower()}@example.com | +90 5{rng.randint(10, 59)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}",
+        f"linkedin.com/in/{isim.replace(' ', '').lower()}",
+        "",
+        b["ozet"],
+        f"{rng.randint(2, 12)} yillik deneyime sahip {bilgi['unvan']['tr']}." if dil == "tr"
+        else f"{bilgi['unvan']['en']} with {rng.randint(2, 12)} years of experience.",
+        "",
+        b["deneyim"],
+    ]
+    alt, ust = UZUNLUKLAR[uzunluk]
+    yil = 2024
+    for _ in range(rng.randint(alt, ust)):
+        sure = rng.randint(1, 4)
+        satirlar.append(f"{bilgi['unvan'][dil]} - {rng.choice(SIRKETLER)} ({yil - sure}-{yil})")
+        yil -= sure
+        for _ in range(rng.randint(3, 6)):
+            cumle = _cumle(rng, dil, terimler)
+            satirlar.append(f"- {cumle}" if rng.random() < bullet_yogunlugu else cumle.capitalize() + ".")
+        satirlar.append("")
+    satirlar += [
+        b["egitim"],
+        f"{rng.choice(OKULLAR)} - {'Lisans' if dil == 'tr' else 'Bachelor degree'} ({yil - 4}-{yil})",
+        "",
+        b["beceri"],
+        ", ".join(terimler),
+    ]
+    if rng.random() < 0.6:
+        satirlar += ["", b["sertifika"], f"{rng.choice(terimler).upper()} sertifikasi ({yil + 1})"]
+    return "\n".join(satirlar)
+
+
+def jd_uret(rng, dil="tr", sektor="satis", uzunluk="orta"):
+    """Tek bir is ilani metni uret."""
+    bilgi = SEKTORLER[sektor]
+    alt, ust = UZUNLUKLAR[uzunluk]
+    terimler = rng.sample(bilgi["terimler"], k=min(len(bilgi["terimler"]), rng.randint(5, 10)))
+    if dil == "tr":
+        satirlar = [f"{rng.choice(SIRKETLER)} ekibine {bilgi['unvan']['tr']} ariyoruz.",
+                    "", "Aranan nitelikler:"]
+        for _ in range(rng.randint(alt * 2, ust * 2)):
+            satirlar.append(f"- {rng.choice(terimler)} konusunda en az {rng.randint(1, 5)} yil deneyim")
+        satirlar += ["- Iyi derecede iletisim ve ekip calismasi becerisi",
+                     "- B sinifi ehliyet sahibi", "- Askerlik hizmetini tamamlamis"]
+    else:
+        satirlar = [f"{rng.choice(SIRKETLER)} is looking for a {bilgi['unvan']['en']}.",
+                    "", "Requirements:"]
+        for _ in range(rng.randint(alt * 2, ust * 2)):
+            satirlar.append(f"- At least {rng.randint(1, 5)} years of experience with {rng.choice(terimler)}")
+        satirlar += ["- Strong communication and team skills",
+                     "- Valid driving license", "- Customer focused mindset"]
+    return "\n".join(satirlar)
+
+
+def korpus_uret(seed=42, adet=40):
+    """Farkli dil, sektor, uzunluk ve bullet yogunlugunda (cv, jd) ciftleri uret."""
+    rng = random.Random(seed)
+    ciftler = []
+    for _ in range(adet):
+        dil = rng.choice(["tr", "en"])
+        sektor = rng.choice(list(SEKTORLER))
+        uzunluk = rng.choice(list(UZUNLUKLAR))
+        cv = cv_uret(rng, dil, sektor, uzunluk, bullet_yogunlugu=rng.choice([0.2, 0.6, 1.0]))
+        jd = jd_uret(rng, dil, rng.choice([sektor, sektor, rng.choice(list(SEKTORLER))]), uzunluk)
+        ciftler.append((cv, jd))
+    return ciftler
+
+
+def _pdf_kacis(satir):
+    return satir.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_olustur(metin, sayfa_basina_satir=50):
+    """Harici bagimlilik olmadan, Helvetica ile cok sayfali basit bir PDF uret."""
+    satirlar = metin.split("\n")
+    sayfalar = [satirlar[i:i + sayfa_basina_satir] for i in range(0, len(satirlar), sayfa_basina_satir)] or [[]]
+    nesneler = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    sayfa_idleri = []
+    for sayfa in sayfalar:
+        akis = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for satir in sayfa:
+            akis.append(f"({_pdf_kacis(satir)}) Tj T*")
+        akis.append("ET")
+        icerik = "\n".join(akis).encode("latin-1", "replace")
+        nesneler.append(b"<< /Length %d >>\nstream\n" % len(icerik) + icerik + b"\nendstream")
+        icerik_id = len(nesneler)
+        nesneler.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % icerik_id
+        )
+        sayfa_idleri.append(len(nesneler))
+    nesneler[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    nesneler[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in sayfa_idleri), len(sayfa_idleri))
+
+    cikti = io.BytesIO()
+    cikti.write(b"%PDF-1.4\n")
+    ofsetler = []
+    for no, govde in enumerate(nesneler, 1):
+        ofsetler.append(cikti.tell())
+        cikti.write(b"%d 0 obj\n" % no + govde + b"\nendobj\n")
+    xref = cikti.tell()
+    cikti.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(nesneler) + 1))
+    for ofset in ofsetler:
+        cikti.write(b"%010d 00000 n \n" % ofset)
+    cikti.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(nesneler) + 1, xref))
+    return cikti.getvalue()
+
+
+def docx_olustur(metin):
+    """python-docx ile her satiri bir paragraf olan DOCX uret."""
+    from docx import Document
+    doc = Document()
+    for satir in metin.split("\n"):
+        doc.add_paragraph(satir)
+    cikti = io.BytesIO()
+    doc.save(cikti)
+    return cikti.getvalue()
+
+
+def fikstur_yaz(dizin, seed=42, adet=6):
+    """Ornek CV'leri PDF, DOCX ve TXT olarak; ilanlari TXT olarak diske yaz."""
+    os.makedirs(dizin, exist_ok=True)
+    for i, (cv, jd) in enumerate(korpus_uret(seed, adet)):
+        with open(os.path.join(dizin, f"cv_{i:02d}.pdf"), "wb") as f:
+            f.write(pdf_olustur(cv))
+        with open(os.path.join(dizin, f"cv_{i:02d}.docx"), "wb") as f:
+            f.write(docx_olustur(cv))
+        with open(os.path.join(dizin, f"cv_{i:02d}.txt"), "w", encoding="utf-8") as f:
+            f.write(cv)
+        with open(os.path.join(dizin, f"jd_{i:02d}.txt"), "w", encoding="utf-8") as f:
+            f.write(jd)
+
+
+if __name__ == "__main__":
+    hedef = sys.argv[1] if len(sys.argv) > 1 else "fikstur"
+    fikstur_yaz(hedef)
+    print(f"Fiksturler yazildi: {hedef}")
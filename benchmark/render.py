@@ -0,0 +1,83 @@
+"""
+Etkilesim basina sunucu cizim maliyeti: tam sayfa calismasi vs. st.fragment.
+
+Kullanim:
+    python -m benchmark.render --oturum 5
+    python -m benchmark.render --uygulama /tmp/eski/app.py   # onceki surumle karsilastirma
+
+Sahte LLM aninda cevap verir; boylece olculen gecikme neredeyse tamamen sunucunun
+betigi (ya da parcayi) calistirip ForwardMsg gondermesidir. Her oturum analizden
+sonra hazir sorulara tiklar, sohbete yazar ve tema degistirir; etkilesim turu
+basina gecikme (p50/p95), alinan bayt ve delta (eleman) sayisi raporlanir.
+"""
+
+import argparse
+import asyncio
+import shutil
+
+from benchmark.korpus import korpus_uret
+from benchmark.yuk import APP_YOLU, StreamlitIstemcisi, sahte_llm_sunucusu, uygulama_sunucusu, yuzdelik
+
+TEMALAR = ("yesil", "mor", "lacivert")
+
+
+async def _olc(ist, olcumler, tur, coro):
+    baslangic = asyncio.get_running_loop().time()
+    await coro
+    sure = asyncio.get_running_loop().time() - baslangic
+    olcumler.setdefault(tur, []).append((sure, ist.son_bayt, ist.son_delta))
+
+
+async def oturum_calistir(port, cv, jd, olcumler, tekrar, zaman_asimi):
+    ist = StreamlitIstemcisi(port, zaman_asimi)
+    try:
+        await ist.baglan()
+        await ist.calistir()
+        await ist.tikla("Türkçe")
+        await ist.deger_ver("text_area", "CV'nizi", "string_value", cv)
+        await ist.deger_ver("text_area", "Is ilanini", "string_value", jd)
+        await _olc(ist, olcumler, "analiz", ist.tikla("Analiz"))
+        for i in range(tekrar):
+            await _olc(ist, olcumler, "hizli_soru", ist.tikla(anahtar=f"hizli_{i % 3}"))
+            await _olc(ist, olcumler, "sohbet", ist.sohbet_yaz(f"Soru {i}: bu CV'yi nasil gelistiririm?"))
+            await _olc(ist, olcumler, "tema", ist.tikla(anahtar=f"tema_{TEMALAR[i % len(TEMALAR)]}"))
+    finally:
+        await ist.kapat()
+    return ist.hatalar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Etkilesim basina cizim maliyeti")
+    parser.add_argument("--oturum", type=int, default=5)
+    parser.add_argument("--tekrar", type=int, default=3, help="oturum basina soru / sohbet / tema turu")
+    parser.add_argument("--uygulama", default=APP_YOLU, help="olculecek app.py")
+    parser.add_argument("--zaman-asimi", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    sunucu, base_url = sahte_llm_sunucusu(gecikme=0.0, token_hizi=1e9, cevap_token=300)
+    surec, port, dizin = uygulama_sunucusu(base_url, app_yolu=args.uygulama)
+    olcumler, hatalar = {}, []
+    try:
+        for cv, jd in korpus_uret(args.seed, args.oturum):
+            hatalar += asyncio.run(oturum_calistir(port, cv, jd, olcumler, args.tekrar, args.zaman_asimi))
+    finally:
+        surec.terminate()
+        surec.wait(10)
+        sunucu.shutdown()
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    print(f"uygulama: {args.uygulama}  hata: {len(hatalar)}")
+    print(f"{'etkilesim':<12}{'adet':>6}{'p50 ms':>9}{'p95 ms':>9}{'ort KB':>9}{'ort delta':>11}")
+    for tur, degerler in olcumler.items():
+        sureler = [d[0] for d in degerler]
+        print(f"{tur:<12}{len(degerler):>6}{yuzdelik(sureler, 50) * 1000:>9.1f}{yuzdelik(sureler, 95) * 1000:>9.1f}"
+              f"{sum(d[1] for d in degerler) / len(degerler) / 1024:>9.1f}"
+              f"{sum(d[2] for d in degerler) / len(degerler):>11.1f}")
+    for hata in hatalar[:5]:
+        print("HATA:", hata[:200])
+    return 1 if hatalar else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
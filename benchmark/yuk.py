@@ -0,0 +1,484 @@
+"""
+Eszamanli oturum yuk testi: sahte LLM sunucusu + gercek Streamlit sunucusu.
+
+Kullanim:
+    python -m benchmark.yuk --oturum 40 --eszamanli 10 --gecikme 0.8 --token-hizi 250
+
+app.py ayri bir `streamlit run` sureci olarak baslatilir; her simule oturum
+tarayici gibi websocket (/_stcore/stream) uzerinden BackMsg gonderip ForwardMsg
+okur: dil sec -> PDF yukle -> ilan gir -> Analiz -> hazir sorular.
+Groq istemcisi GROQ_BASE_URL ile yereldeki sahte sunucuya yonlenir; sunucu
+gecikme + token/sn hizina gore cevap verir.
+Asama bazinda p50/p95/p99 gecikme, throughput ve zaman icinde sunucu surecinin
+ve alt sureclerinin (ayristirma havuzu) CPU/RSS degerleri raporlanir.
+
+Not: streamlit.testing.AppTest ayni surecte thread-safe degil (Runtime tekili,
+st.secrets degisimi), bu yuzden gercek sunucu kullanilir.
+
+Websocket istemcisi icin `websockets` gerekir (uygulama bagimliligi degil):
+    pip install -r benchmark/requirements.txt
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark.korpus import korpus_uret, pdf_olustur
+
+try:
+    import websockets
+except ImportError:  # benchmark/requirements.txt
+    websockets = None
+
+APP_YOLU = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+# ── SAHTE LLM SUNUCUSU ──
+def sahte_llm_sunucusu(gecikme=0.5, token_hizi=200.0, cevap_token=400, hata_orani=0.0,
+                       yavas_orani=0.0, yavas_carpan=10.0):
+    """OpenAI uyumlu /openai/v1/chat/completions sunan yerel sunucu. (sunucu, base_url) dondurur.
+
+    yavas_orani olasilikla istek yavas_carpan kat yavas cevaplanir (kuyruk gecikmesi).
+    sunucu.istek_sayisi gelen istek sayisini tutar.
+    """
+    import random
+    rng = random.Random(0)
+    kilit = threading.Lock()
+
+    class Isleyici(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            uzunluk = int(self.headers.get("Content-Length", 0))
+            istek = json.loads(self.rfile.read(uzunluk) or b"{}")
+            with kilit:
+                sunucu.istek_sayisi += 1
+                hata = rng.random() < hata_orani
+                carpan = yavas_carpan if rng.random() < yavas_orani else 1.0
+            token = min(int(istek.get("max_tokens") or cevap_token), cevap_token)
+            prompt_token = sum(len(str(m.get("content", ""))) for m in istek.get("messages", [])) // 4
+            time.sleep((gecikme + token / max(token_hizi, 1e-9)) * carpan)
+            if hata:
+                govde = json.dumps({"error": {"message": "sahte hata", "type": "server_error"}}).encode()
+                self.send_response(500)
+            else:
+                govde = json.dumps({
+                    "id": "sahte", "object": "chat.completion", "created": int(time.time()),
+                    "model": istek.get("model", "sahte"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "## Sahte cevap\n" + "kelime " * token}}],
+                    "usage": {"prompt_tokens": prompt_token, "completion_tokens": token,
+                              "total_tokens": prompt_token + token},
+                }).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(govde)))
+            self.end_headers()
+            self.wfile.write(govde)
+
+    sunucu = ThreadingHTTPServer(("127.0.0.1", 0), Isleyici)
+    sunucu.daemon_threads = True
+    sunucu.istek_sayisi = 0
+    threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+    return sunucu, f"http://127.0.0.1:{sunucu.server_address[1]}"
+
+
+# ── UYGULAMA SUNUCUSU ──
+def _bos_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def uygulama_sunucusu(llm_url, bekleme=60.0, app_yolu=APP_YOLU):
+    """app.py'yi sahte secrets ile ayri surecte baslat. (surec, port, calisma_dizini) dondurur.
+
+    app_yolu: karsilastirma icin baska bir surumun app.py'si (orn. git worktree).
+    """
+    dizin = tempfile.mkdtemp(prefix="ats_yuk_")
+    os.makedirs(os.path.join(dizin, ".streamlit"))
+    with open(os.path.join(dizin, ".streamlit", "secrets.toml"), "w") as f:
+        f.write('GROQ_API_KEY = "sahte"\n')
+    port = _bos_port()
+    surec = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.abspath(app_yolu), "--server.headless", "true",
+         "--server.port", str(port), "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        cwd=dizin, env={**os.environ, "GROQ_BASE_URL": llm_url},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    son = time.monotonic() + bekleme
+    while time.monotonic() < son:
+        if surec.poll() is not None:
+            raise RuntimeError("streamlit sureci baslarken kapandi")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return surec, port, dizin
+        except OSError:
+            time.sleep(0.2)
+    surec.kill()
+    raise RuntimeError("streamlit sunucusu zamaninda acilmadi")
+
+
+# ── KAYNAK ORNEKLEYICI ──
+def _surec_kaynak(pid, sayfa, saat_tiki):
+    """(/proc) -> (cpu_saniye, rss_mb)"""
+    with open(f"/proc/{pid}/stat") as f:
+        alanlar = f.read().rsplit(")", 1)[1].split()
+    with open(f"/proc/{pid}/statm") as f:
+        rss = int(f.read().split()[1])
+    # utime, stime: comm sonrasi 12. ve 13. alanlar
+    return (int(alanlar[11]) + int(alanlar[12])) / saat_tiki, rss * sayfa / 2 ** 20
+
+
+def _alt_surecler(pid):
+    """pid'in tum alt surecleri (torunlar dahil); /proc taranir."""
+    ebeveyn = {}
+    for ad in os.listdir("/proc"):
+        if not ad.isdigit():
+            continue
+        try:
+            with open(f"/proc/{ad}/stat") as f:
+                ebeveyn[int(ad)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue  # arada kapanan surec
+    alt, bakilacak = [], [pid]
+    while bakilacak:
+        ust = bakilacak.pop()
+        cocuklar = [p for p, e in ebeveyn.items() if e == ust]
+        alt += cocuklar
+        bakilacak += cocuklar
+    return alt
+
+
+class KaynakOrnekleyici(threading.Thread):
+    """Belirli araliklarla verilen surecin ve alt sureclerinin
+    (t, cpu_yuzde, rss_mb, alt_cpu_yuzde, alt_rss_mb, alt_surec) degerlerini kaydeder.
+
+    Alt surec CPU'su surec basina farktir; araliktaki yeni surecin tum CPU'su sayilir,
+    oldurulen surecin son araligi kaybolur. /proc ve os.sysconf olmayan
+    sistemlerde ornek toplanmaz.
+    """
+
+    def __init__(self, pid, aralik=0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.aralik = aralik
+        self.ornekler = []
+        self.dur = threading.Event()
+        try:
+            self.sayfa, self.saat_tiki = os.sysconf("SC_PAGE_SIZE"), os.sysconf("SC_CLK_TCK")
+        except (AttributeError, ValueError, OSError):
+            self.sayfa = self.saat_tiki = None
+
+    def _surec_kaynak(self, pid):
+        return _surec_kaynak(pid, self.sayfa, self.saat_tiki)
+
+    def _alt_kaynak(self):
+        """{pid: (cpu_saniye, rss_mb)} alt surecler icin."""
+        kaynak = {}
+        for pid in _alt_surecler(self.pid):
+            try:
+                kaynak[pid] = self._surec_kaynak(pid)
+            except OSError:
+                continue
+        return kaynak
+
+    def run(self):
+        if self.sayfa is None:
+            return
+        baslangic = time.perf_counter()
+        try:
+            onceki_cpu, _ = self._surec_kaynak(self.pid)
+            onceki_alt = self._alt_kaynak()
+        except OSError:
+            return  # Linux disi / surec yok: ornek toplanmaz
+        onceki_t = baslangic
+        while not self.dur.wait(self.aralik):
+            try:
+                cpu, rss = self._surec_kaynak(self.pid)
+            except OSError:
+                return
+            alt = self._alt_kaynak()
+            t = time.perf_counter()
+            sure = max(t - onceki_t, 1e-9)
+            alt_cpu = sum(c - onceki_alt.get(pid, (0.0, 0.0))[0] for pid, (c, _) in alt.items())
+            self.ornekler.append((
+                round(t - baslangic, 2), round(100 * (cpu - onceki_cpu) / sure, 1), round(rss, 1),
+                round(100 * alt_cpu / sure, 1), round(sum(r for _, r in alt.values()), 1), len(alt),
+            ))
+            onceki_t, onceki_cpu, onceki_alt = t, cpu, alt
+
+
+# ── OTURUM SENARYOSU ──
+class StreamlitIstemcisi:
+    """Tarayicinin yaptigini taklit eden minimal websocket istemcisi."""
+
+    def __init__(self, port, zaman_asimi):
+        self.port = port
+        self.zaman_asimi = zaman_asimi
+        self.ws = None
+        self.oturum_id = None
+        self.degerler = {}     # widget id -> WidgetState (kalici degerler)
+        self.widgetler = []    # gorunen (tur, id, etiket, secenekler, fragment_id)
+        self.hatalar = []
+        self.son_bayt = 0      # son calismada alinan ForwardMsg baytlari
+        self.son_delta = 0     # son calismada alinan delta (eleman) sayisi
+
+    async def baglan(self):
+        if websockets is None:
+            raise RuntimeError("websockets kurulu degil: pip install -r benchmark/requirements.txt")
+        self.ws = await websockets.connect(
+            f"ws://127.0.0.1:{self.port}/_stcore/stream", subprotocols=["streamlit"], max_size=None)
+
+    async def kapat(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _mesaj(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        ham = await asyncio.wait_for(self.ws.recv(), self.zaman_asimi)
+        self.son_bayt += len(ham)
+        msg = ForwardMsg()
+        msg.ParseFromString(ham)
+        return msg
+
+    async def calistir(self, tetik=None, fragment_id=""):
+        """Mevcut widget degerleri (+ tek seferlik tetik) ile betigi yeniden calistir.
+
+        fragment_id verilirse tarayici gibi sadece o st.fragment yeniden calistirilir.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.page_script_hash = ""
+        back.rerun_script.fragment_id = fragment_id
+        for durum in self.degerler.values():
+            back.rerun_script.widget_states.widgets.append(durum)
+        if tetik is not None:
+            back.rerun_script.widget_states.widgets.append(tetik)
+        self.son_bayt = self.son_delta = 0
+        await self.ws.send(back.SerializeToString())
+
+        widgetler = []
+        while True:
+            msg = await self._mesaj()
+            tur = msg.WhichOneof("type")
+            if tur == "new_session":
+                self.oturum_id = msg.new_session.initialize.session_id
+                widgetler = []  # st.rerun() sonrasi yeni calisma
+            elif tur == "delta":
+                self.son_delta += 1
+                if msg.delta.WhichOneof("type") != "new_element":
+                    continue
+                el = msg.delta.new_element
+                el_tur = el.WhichOneof("type")
+                if el_tur == "exception":
+                    self.hatalar.append(f"{el.exception.type}: {el.exception.message}")
+                alt = getattr(el, el_tur)
+                if getattr(alt, "id", ""):
+                    widgetler.append((el_tur, alt.id, getattr(alt, "label", ""),
+                                      list(getattr(alt, "options", []) or []), msg.delta.fragment_id))
+            elif tur == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                    # Parca calismasi: diger parcalarin widget'lari ekranda kalir
+                    self.widgetler = [w for w in self.widgetler if w[4] != fragment_id] + widgetler
+                    return
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    self.widgetler = widgetler
+                    return
+
+    def bul(self, tur, etiket=None, anahtar=None):
+        return self._bul(tur, etiket, anahtar)[:2]
+
+    def _bul(self, tur, etiket=None, anahtar=None):
+        """(id, secenekler, fragment_id)"""
+        for el_tur, wid, lbl, secenekler, fragment_id in self.widgetler:
+            if el_tur != tur:
+                continue
+            if etiket is not None and etiket not in lbl:
+                continue
+            if anahtar is not None and not wid.endswith("-" + anahtar):
+                continue
+            return wid, secenekler, fragment_id
+        raise LookupError(f"widget bulunamadi: {tur} {etiket or anahtar}")
+
+    async def tikla(self, etiket=None, anahtar=None):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        wid, _, fragment_id = self._bul("button", etiket, anahtar)
+        await self.calistir(WidgetState(id=wid, trigger_value=True), fragment_id)
+
+    async def sohbet_yaz(self, metin):
+        """st.chat_input'a mesaj gonder (tek seferlik deger)."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        wid, _, fragment_id = self._bul("chat_input")
+        durum = WidgetState(id=wid)
+        durum.chat_input_value.data = metin
+        await self.calistir(durum, fragment_id)
+
+    async def deger_ver(self, tur, etiket, alan, deger):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        wid, _ = self.bul(tur, etiket)
+        durum = WidgetState(id=wid)
+        setattr(durum, alan, deger)
+        self.degerler[wid] = durum
+        await self.calistir()
+
+    async def dosya_yukle(self, ad, icerik, mime):
+        """file_urls_request -> multipart PUT -> file_uploader_state_value."""
+        import httpx
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        wid, _ = self.bul("file_uploader")
+        istek_id = uuid.uuid4().hex
+        back = BackMsg()
+        back.file_urls_request.request_id = istek_id
+        back.file_urls_request.file_names.append(ad)
+        back.file_urls_request.session_id = self.oturum_id
+        await self.ws.send(back.SerializeToString())
+        while True:
+            msg = await self._mesaj()
+            if msg.WhichOneof("type") == "file_urls_response" and msg.file_urls_response.response_id == istek_id:
+                break
+        if msg.file_urls_response.error_msg:
+            raise RuntimeError(msg.file_urls_response.error_msg)
+        urller = msg.file_urls_response.file_urls[0]
+        adres = urller.upload_url
+        if adres.startswith("/"):
+            adres = f"http://127.0.0.1:{self.port}{adres}"
+        async with httpx.AsyncClient(timeout=self.zaman_asimi) as http:
+            cevap = await http.put(adres, files={"file": (ad, icerik, mime)})
+            cevap.raise_for_status()
+        durum = WidgetState(id=wid)
+        bilgi = durum.file_uploader_state_value.uploaded_file_info.add()
+        bilgi.name, bilgi.size, bilgi.file_id = ad, len(icerik), urller.file_id
+        bilgi.file_urls.CopyFrom(urller)
+        self.degerler[wid] = durum
+        await self.calistir()
+
+
+async def _olcerek(sureler, asama, coro):
+    baslangic = time.perf_counter()
+    sonuc = await coro
+    sureler.setdefault(asama, []).append(time.perf_counter() - baslangic)
+    return sonuc
+
+
+async def oturum_calistir(port, cv, jd, sureler, hizli_soru, zaman_asimi):
+    """Tek bir kullanicinin uctan uca akisi; hata olursa mesajini dondurur."""
+    ist = StreamlitIstemcisi(port, zaman_asimi)
+    try:
+        await _olcerek(sureler, "baglanti", ist.baglan())
+        await _olcerek(sureler, "acilis", ist.calistir())
+        await _olcerek(sureler, "dil_secimi", ist.tikla("Türkçe"))
+        _, secenekler = ist.bul("radio", "Giris yontemi")
+        await _olcerek(sureler, "yukleme_secimi",
+                       ist.deger_ver("radio", "Giris yontemi", "string_value", secenekler[1]))
+        await _olcerek(sureler, "pdf_yukleme", ist.dosya_yukle("cv.pdf", pdf_olustur(cv), "application/pdf"))
+        await _olcerek(sureler, "ilan_girisi", ist.deger_ver("text_area", None, "string_value", jd))
+        await _olcerek(sureler, "analiz", ist.tikla("Analiz"))
+        for i in range(hizli_soru):
+            if ist.hatalar:
+                break
+            await _olcerek(sureler, "hizli_soru", ist.tikla(anahtar=f"hizli_{i}"))
+    finally:
+        await ist.kapat()
+    return ist.hatalar[0] if ist.hatalar else None
+
+
+async def oturumlari_calistir(port, ciftler, eszamanli, hizli_soru, zaman_asimi, sureler):
+    sinir = asyncio.Semaphore(eszamanli)
+
+    async def tek(cv, jd):
+        async with sinir:
+            try:
+                return await oturum_calistir(port, cv, jd, sureler, hizli_soru, zaman_asimi)
+            except Exception as e:
+                return repr(e)
+
+    return [h for h in await asyncio.gather(*(tek(cv, jd) for cv, jd in ciftler)) if h]
+
+
+def yuzdelik(degerler, p):
+    sirali = sorted(degerler)
+    if not sirali:
+        return 0.0
+    return sirali[min(len(sirali) - 1, int(round(p / 100 * (len(sirali) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ATS CV Optimizer eszamanli yuk testi")
+    parser.add_argument("--oturum", type=int, default=20, help="toplam simule oturum")
+    parser.add_argument("--eszamanli", type=int, default=5, help="ayni anda aktif oturum")
+    parser.add_argument("--gecikme", type=float, default=0.5, help="sahte LLM sabit gecikmesi (sn)")
+    parser.add_argument("--token-hizi", type=float, default=200.0, help="sahte LLM token/sn")
+    parser.add_argument("--cevap-token", type=int, default=400, help="sahte LLM cevap uzunlugu")
+    parser.add_argument("--hata-orani", type=float, default=0.0, help="sahte LLM 500 dondurme olasiligi")
+    parser.add_argument("--yavas-orani", type=float, default=0.0, help="sahte LLM kuyruk gecikmesi olasiligi")
+    parser.add_argument("--hizli-soru", type=int, default=3, help="oturum basina hazir soru tiklamasi")
+    parser.add_argument("--zaman-asimi", type=float, default=300.0, help="tek adim icin (sn)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="ham sonuclari bu dosyaya yaz")
+    args = parser.parse_args(argv)
+
+    sunucu, base_url = sahte_llm_sunucusu(args.gecikme, args.token_hizi, args.cevap_token, args.hata_orani,
+                                          args.yavas_orani)
+    surec, port, dizin = uygulama_sunucusu(base_url)
+
+    ciftler = korpus_uret(args.seed, args.oturum)
+    sureler = {}
+    ornekleyici = KaynakOrnekleyici(surec.pid)
+    ornekleyici.start()
+    baslangic = time.perf_counter()
+    try:
+        hatalar = asyncio.run(oturumlari_calistir(
+            port, ciftler, args.eszamanli, args.hizli_soru, args.zaman_asimi, sureler))
+    finally:
+        toplam = time.perf_counter() - baslangic
+        ornekleyici.dur.set()
+        ornekleyici.join()
+        surec.terminate()
+        surec.wait(10)
+        sunucu.shutdown()
+        shutil.rmtree(dizin, ignore_errors=True)
+
+    print(f"oturum: {args.oturum}  eszamanli: {args.eszamanli}  sure: {toplam:.1f} sn  "
+          f"throughput: {args.oturum / toplam:.2f} oturum/sn  hata: {len(hatalar)}")
+    print(f"{'asama':<16}{'adet':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for asama, degerler in sureler.items():
+        print(f"{asama:<16}{len(degerler):>6}" + "".join(
+            f"{yuzdelik(degerler, p) * 1000:>10.0f}" for p in (50, 95, 99, 100)))
+    if ornekleyici.ornekler:
+        cpu = [o[1] for o in ornekleyici.ornekler]
+        rss = [o[2] for o in ornekleyici.ornekler]
+        print(f"sunucu CPU %: ort {sum(cpu) / len(cpu):.0f}  max {max(cpu):.0f}   "
+              f"RSS MB: baslangic {rss[0]:.0f}  max {max(rss):.0f}  son {rss[-1]:.0f}")
+        alt_cpu = [o[3] for o in ornekleyici.ornekler]
+        alt_rss = [o[4] for o in ornekleyici.ornekler]
+        print(f"alt surecler ({max(o[5] for o in ornekleyici.ornekler)} max) CPU %: "
+              f"ort {sum(alt_cpu) / len(alt_cpu):.0f}  max {max(alt_cpu):.0f}   "
+              f"RSS MB: baslangic {alt_rss[0]:.0f}  max {max(alt_rss):.0f}  son {alt_rss[-1]:.0f}")
+    for hata in hatalar[:5]:
+        print("HATA:", hata[:200])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"ayarlar": vars(args), "toplam_sn": toplam, "hatalar": hatalar,
+                       "sureler": sureler, "kaynak": ornekleyici.ornekler}, f, indent=1)
+    return 1 if hatalar else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
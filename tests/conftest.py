@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Depo kokunden: python -m pytest -q
+# app.py ve ayristirma.py depo kokunde; paket olarak kurulmaz
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
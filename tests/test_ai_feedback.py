@@ -0,0 +1,86 @@
+import threading
+import time
+
+import app
+
+
+class SahteUretici:
+    """Sirayla verilen gecikmelerle cevap veren ya da hata atan uretici."""
+
+    def __init__(self, *adimlar):
+        self.adimlar = list(adimlar)
+        self.cagri = 0
+        self.kilit = threading.Lock()
+
+    def __call__(self, *args):
+        with self.kilit:
+            adim = self.adimlar[min(self.cagri, len(self.adimlar) - 1)]
+            self.cagri += 1
+            no = self.cagri
+        if isinstance(adim, Exception):
+            raise adim
+        time.sleep(adim)
+        return f"cevap {no}"
+
+
+def _yonetici(uretici, **ayarlar):
+    return app.AIFeedbackYoneticisi(uretici=uretici, isci=4, **ayarlar)
+
+
+def test_butce_dolunca_none_cevap_sonra_gelir():
+    yonetici = _yonetici(SahteUretici(0.3), hedge_sn=float("inf"))
+    is_ = yonetici.baslat("a")
+    baslangic = time.monotonic()
+    assert yonetici.bekle(is_, butce=0.05) is None
+    assert time.monotonic() - baslangic < 0.25
+    assert is_.bitti.wait(2) and is_.metin == "cevap 1"
+
+
+def test_hedge_yavas_istegi_ikiler_ilk_gelen_kazanir():
+    uretici = SahteUretici(1.0, 0.01)
+    yonetici = _yonetici(uretici, hedge_sn=0.05)
+    is_ = yonetici.baslat("a")
+    assert yonetici.bekle(is_, butce=0.5) == "cevap 2"
+    assert is_.deneme == 2 and is_.hedge
+
+
+def test_hedge_kapaliyken_tek_istek():
+    uretici = SahteUretici(0.2)
+    yonetici = _yonetici(uretici, hedge_sn=float("inf"))
+    assert yonetici.bekle(yonetici.baslat("a"), butce=1) == "cevap 1"
+    assert uretici.cagri == 1
+
+
+def test_hata_yeniden_denenir_surekli_hatada_bitti():
+    yonetici = _yonetici(SahteUretici(RuntimeError("500"), 0.0), hedge_sn=float("inf"))
+    assert yonetici.bekle(yonetici.baslat("a"), butce=2) == "cevap 2"
+
+    yonetici = _yonetici(SahteUretici(RuntimeError("500")), hedge_sn=float("inf"), max_deneme=2)
+    is_ = yonetici.baslat("b")
+    assert yonetici.bekle(is_, butce=2) is None
+    assert is_.bitti.is_set() and is_.metin is None and is_.deneme == 2
+
+
+def test_ayni_anahtar_devam_eden_isi_paylasir():
+    uretici = SahteUretici(0.1)
+    yonetici = _yonetici(uretici, hedge_sn=float("inf"))
+    assert yonetici.baslat("a") is yonetici.baslat("a")
+    assert yonetici.bekle(yonetici.baslat("a"), butce=1) == "cevap 1"
+    assert uretici.cagri == 1
+
+
+def test_hedge_suresi_p95_ve_az_ornek():
+    assert app.hedge_suresi([1.0] * (app.AI_HEDGE_MIN_ORNEK - 1)) is None
+    sureler = [i / 100 for i in range(100)]
+    assert app.hedge_suresi(sureler) == 0.95
+    assert app.hedge_suresi(sureler, hedge_sn=2.0) == 2.0
+
+
+def test_kural_tabanli_ozet_ingilizcede_turkce_karismaz():
+    format_sorunlari = app.format_sorunlari_tespit("kisa cv ★")
+    assert format_sorunlari
+    metin = app.kural_tabanli_feedback(40, {}, ["sql"], format_sorunlari, tr=False, neden="hata")
+    assert "could not be reached" in metin
+    assert not any(sorun in metin for sorun in format_sorunlari)
+    assert all(app.FORMAT_SORUNU_INGILIZCE[sorun] in metin for sorun in format_sorunlari[:5])
+    assert format_sorunlari[0] in app.kural_tabanli_feedback(40, {}, [], format_sorunlari, tr=True)
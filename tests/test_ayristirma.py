@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from ayristirma import AyristirmaHatasi, AyristirmaHavuzu, resource
+from benchmark.korpus import korpus_uret, pdf_olustur
+
+posix = pytest.mark.skipif(resource is None, reason="RLIMIT yalnizca POSIX'te")
+
+
+@pytest.fixture(scope="module")
+def cvler():
+    return [cv for cv, _ in korpus_uret(1, 12)]
+
+
+@pytest.fixture
+def havuz_kur():
+    havuzlar = []
+
+    def kur(**ayarlar):
+        havuzlar.append(AyristirmaHavuzu(isci=1, **ayarlar))
+        return havuzlar[-1]
+
+    yield kur
+    for havuz in havuzlar:
+        havuz.kapat()
+
+
+def _neden(havuz, tur, veri):
+    with pytest.raises(AyristirmaHatasi) as hata:
+        havuz.ayristir(tur, veri)
+    return hata.value.neden
+
+
+def test_normal_pdf(havuz_kur, cvler):
+    sonuc = havuz_kur().ayristir("pdf", pdf_olustur(cvler[0]))
+    assert sonuc["sayfa"] >= 1
+    assert cvler[0].split("\n")[0] in sonuc["metin"]
+
+
+def test_bozuk_pdf_sureci_korur(havuz_kur, cvler):
+    havuz = havuz_kur()
+    assert _neden(havuz, "pdf", b"%PDF-1.4 cop") == "bozuk"
+    assert havuz.istatistik().get("yeniden_baslatma", 0) == 0
+    assert havuz.ayristir("pdf", pdf_olustur(cvler[1]))["metin"]
+
+
+def test_duvar_saati(havuz_kur, cvler):
+    havuz = havuz_kur(sure_sn=0.3)
+    assert _neden(havuz, "pdf", pdf_olustur("\n".join(cvler * 20))) == "zaman_asimi"
+    havuz.sure_sn = 20
+    assert havuz.ayristir("pdf", pdf_olustur(cvler[2]))["metin"]
+    assert havuz.istatistik()["yeniden_baslatma"] == 1
+
+
+@posix
+def test_cpu_siniri(havuz_kur, cvler):
+    havuz = havuz_kur(cpu_sn=1, sure_sn=60, bellek_mb=2048)
+    assert _neden(havuz, "pdf", pdf_olustur("\n".join(cvler * 40))) == "cpu"
+
+
+@posix
+@pytest.mark.parametrize("bellek_mb,kat", [(90, 10), (150, 25), (260, 40)])
+def test_bellek_siniri(havuz_kur, cvler, bellek_mb, kat):
+    # Sinira gore Python MemoryError'u ya da C eklentisinin cokmesi; ikisi de "bellek"
+    havuz = havuz_kur(cpu_sn=10, sure_sn=30, bellek_mb=bellek_mb)
+    assert _neden(havuz, "pdf", pdf_olustur("\n".join(cvler * kat))) == "bellek"
+    assert havuz.ayristir("pdf", pdf_olustur(cvler[3]))["metin"]
+
+
+def test_kuyruk_suresi_is_suresinden_ayri(havuz_kur, cvler):
+    havuz = havuz_kur(sure_sn=30, kuyruk_sn=0.1)
+    surec = havuz.bos.get()  # tek surec mesgul
+    try:
+        baslangic = time.monotonic()
+        assert _neden(havuz, "pdf", pdf_olustur(cvler[0])) == "mesgul"
+        assert time.monotonic() - baslangic < 5
+    finally:
+        havuz.bos.put(surec)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+import app
+from benchmark.ai_bolumlu import uzun_cv
+from benchmark.korpus import korpus_uret
+
+
+@pytest.mark.parametrize("kopya", [1, 3, 6, 12])
+def test_parca_sayisi_sinirli_ve_metin_kaybolmaz(kopya):
+    for cv, _ in korpus_uret(42, 8):
+        cv = uzun_cv(cv, kopya)
+        parcalar, kisa = app.bolum_parcalari(cv)
+        assert len(parcalar) <= app.AI_BOLUM_MAX_PARCA
+        birlesik = " ".join([metin for _, metin in parcalar] + [kisa])
+        assert sorted(birlesik.split()) == sorted(cv.split())
+        for bolum, _ in parcalar:
+            assert all(ad in app.BOLUM_ADLARI for ad in bolum.split("+"))
+
+
+class SahteLLM:
+    def __init__(self, not_sn=0.05, birlestirme_sn=(0.05,)):
+        self.not_sn = not_sn
+        self.birlestirme_sn = list(birlestirme_sn)
+        self.notlar = []
+        self.birlestirmeler = 0
+        self.kilit = threading.Lock()
+
+    def not_(self, bolum, metin, jd_text, tr):
+        with self.kilit:
+            self.notlar.append(bolum)
+        time.sleep(self.not_sn)
+        return f"not {bolum}"
+
+    def birlestir(self, notlar, *args):
+        with self.kilit:
+            sure = self.birlestirme_sn[min(self.birlestirmeler, len(self.birlestirme_sn) - 1)]
+            self.birlestirmeler += 1
+            no = self.birlestirmeler
+        time.sleep(sure)
+        return f"rapor {no}: " + ", ".join(n for _, n in notlar)
+
+
+@pytest.fixture(scope="module")
+def girdi():
+    cv, jd = korpus_uret(42, 1)[0]
+    return uzun_cv(cv, 6), jd, 60, ["sql"], [], True
+
+
+def _bolumlu(llm, **ayarlar):
+    return app.BolumluFeedback(isci=4, not_uretici=llm.not_, birlestirici=llm.birlestir, **ayarlar)
+
+
+def test_degismeyen_bolumler_yeniden_istenmez(girdi):
+    llm = SahteLLM()
+    bolumlu = _bolumlu(llm)
+    bolumlu.olustur(*girdi)
+    ilk = len(llm.notlar)
+    assert 2 <= ilk <= app.AI_BOLUM_MAX_PARCA and llm.birlestirmeler == 1
+    cv, *diger = girdi
+    bolumlu.olustur(cv.replace("\n- ", "\n- Ekip ile ", 1), *diger)
+    assert len(llm.notlar) == ilk + 1 and llm.birlestirmeler == 2
+
+
+def test_sadece_birlestirme_hedge_edilir(girdi):
+    llm = SahteLLM(birlestirme_sn=(1.0, 0.01))
+    bolumlu = _bolumlu(llm, hedge_sn=0.1)
+    rapor = bolumlu.olustur(*girdi)
+    assert rapor.startswith("rapor 2")
+    assert llm.birlestirmeler == 2 and bolumlu.istatistik()["birlestirme_hedge"] == 1
+    assert len(llm.notlar) == len(app.bolum_parcalari(girdi[0])[0])  # notlar ikilenmez
+
+
+def test_yonetici_bolumlu_ureticiyi_hedge_etmez(girdi):
+    llm = SahteLLM(not_sn=0.3)
+    bolumlu = _bolumlu(llm)
+    yonetici = app.AIFeedbackYoneticisi(uretici=bolumlu.olustur, hedge_sn=float("inf"))
+    is_ = yonetici.baslat("a", *girdi)
+    assert yonetici.bekle(is_, butce=5).startswith("rapor 1")
+    assert is_.deneme == 1 and llm.birlestirmeler == 1
+    assert len(llm.notlar) == len(app.bolum_parcalari(girdi[0])[0])
@@ -0,0 +1,33 @@
+import pytest
+
+import app
+from benchmark.calistir import canli_esdegerlik_kontrol
+from benchmark.korpus import korpus_uret
+
+
+@pytest.mark.parametrize("seed", [5, 7, 9])
+def test_rastgele_duzenlemeler_tam_pipeline_ile_ayni(seed):
+    canli_esdegerlik_kontrol(korpus_uret(seed, 4), adim=40, seed=seed)
+
+
+def test_sadece_degisen_satirlar_yeniden_islenir():
+    cv, jd = korpus_uret(11, 1)[0]
+    puanlayici = app.CanliPuanlayici(jd)
+    assert puanlayici.guncelle(cv) == len(cv.split("\n"))
+    satirlar = cv.split("\n")
+    satirlar[3] += " python sql"
+    assert puanlayici.guncelle("\n".join(satirlar)) == 1
+    assert puanlayici.guncelle("\n".join(satirlar)) == 0
+
+
+def test_satir_bolunmesi_gecis_bigramini_korur():
+    jd = "Aranan: project management ve team leadership deneyimi."
+    puanlayici = app.CanliPuanlayici(jd)
+    puanlayici.guncelle("DENEYIM\n- Led project management for team leadership")
+    once = set(puanlayici.sonuc()["eslesen"])
+    # "project" satir sonunda, "management" sonraki satirda: gecis bigrami
+    metin = "DENEYIM\n- Led project\nmanagement for team leadership"
+    puanlayici.guncelle(metin)
+    eslesen, _ = app.keyword_analizi(metin, jd)
+    assert set(puanlayici.sonuc()["eslesen"]) == set(eslesen)
+    assert once == set(app.keyword_analizi("DENEYIM\n- Led project management for team leadership", jd)[0])
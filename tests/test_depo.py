@@ -0,0 +1,41 @@
+import app
+from benchmark.korpus import korpus_uret
+
+
+def _puanlayici(cv, jd):
+    puanlayici = app.CanliPuanlayici(jd)
+    puanlayici.guncelle(cv)
+    return puanlayici
+
+
+def test_depo_metinleri_tek_kopya_tutar():
+    depo = app.IcerikDeposu(max_bayt=10 ** 6)
+    h = depo.koy("ayni metin")
+    assert depo.koy("ayni metin") == h == app.metin_hash("ayni metin")
+    assert depo.al(h) == "ayni metin"
+    assert depo.istatistik()["metin"] == 1
+
+
+def test_canli_puanlayicilar_depo_sinirina_dahil():
+    (cv, jd), = korpus_uret(42, 1)
+    depo = app.IcerikDeposu(max_bayt=10 ** 6)
+    canli = app.CanliPuanlayiciDeposu(depo, max_oturum=100)
+    boyut = _puanlayici(cv, jd).boyut()
+    depo.max_bayt = int(2.5 * boyut)
+    for i in range(5):
+        canli.koy(f"o{i}", _puanlayici(cv, jd))
+    ist = canli.istatistik()
+    # Sadece sinira sigan en yeni puanlayicilar kalir; depo ayni bayti gorur
+    assert ist["oturum"] == 2 and canli.al("o4") is not None and canli.al("o0") is None
+    assert depo.istatistik()["ek_bayt"] == ist["bayt"] <= depo.max_bayt
+    canli.sil("o4")
+    assert depo.istatistik()["ek_bayt"] == canli.istatistik()["bayt"]
+
+
+def test_kullanilmayan_metin_puanlayici_icin_atilir():
+    (cv, jd), = korpus_uret(42, 1)
+    boyut = _puanlayici(cv, jd).boyut()
+    depo = app.IcerikDeposu(max_bayt=boyut + 2000)
+    h = depo.koy("x" * 3000)
+    app.CanliPuanlayiciDeposu(depo).koy("o", _puanlayici(cv, jd))
+    assert depo.al(h) is None
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import app
+from benchmark.korpus import korpus_uret
+
+
+@pytest.mark.parametrize("metin", [
+    "Ali Veli\nali.veli@ornek.com, +90 555 555 55 55\n- C++/C# gelistirici (2019–2023)",
+    "İSTANBUL ÜNİVERSİTESİ\nİş deneyimi: Satış, müşteri ilişkileri",
+    "",
+    "   \n\t",
+    "tek_kelime",
+])
+def test_konum_indeksi_token_dizisi_temizle_ile_ayni(metin):
+    indeks = app.KonumIndeksi(metin)
+    tokenler = [indeks.kelimeler[k] for k in indeks.kimlikler]
+    assert tokenler == app.temizle(metin).split()
+    assert len(indeks) == len(tokenler)
+    for bas, bit in zip(indeks.baslangic, indeks.bitis):
+        assert 0 <= bas < bit <= len(metin)
+
+
+def test_konum_indeksi_korpusta_ayni():
+    for cv, _ in korpus_uret(7, 20):
+        indeks = app.KonumIndeksi(cv)
+        assert [indeks.kelimeler[k] for k in indeks.kimlikler] == app.temizle(cv).split()
+        assert indeks.kelime_seti() == set(app.kelimeleri_cikar(cv))
+
+
+@pytest.mark.parametrize("limit", [60, 200, 800, 3000])
+def test_cv_baglami_limit_ve_bos_degil(limit):
+    for cv, jd in korpus_uret(13, 10):
+        uzun = cv * 3
+        baglam = app.cv_baglami(uzun, jd, limit)
+        assert 0 < len(baglam.strip()) and len(baglam) <= limit
+
+
+def test_cv_baglami_tek_satirlik_cv():
+    cv = "python " * 1000
+    baglam = app.cv_baglami(cv, "python developer", 500)
+    assert baglam.strip() and len(baglam) <= 500
+    assert app.cv_baglami("kisa cv", "ilan", 500) == "kisa cv"
+
+
+def _bolumler(cv):
+    return [(bolum, cv[bas:bit].split("\n")[0]) for bolum, bas, bit in app.bolum_araliklari(cv)]
+
+
+def test_bolum_araliklari_bicimli_basliklar():
+    cv = ("Ali Veli\nTechnical Lead\n\nDENEYIM\n- Kariyer gelisimi programi kurdum\nBilgi guvenligi\n"
+          "Bogazici Universitesi\n\nEGITIM\nBogazici Universitesi\n\nBeceriler:\npython, sql\n")
+    assert _bolumler(cv) == [
+        ("giris", "Ali Veli"), ("experience", "DENEYIM"), ("education", "EGITIM"), ("skills", "Beceriler:"),
+    ]
+
+
+def test_bolum_araliklari_bicimsiz_basliklar_bos_satirdan_sonra():
+    cv = ("Ali Veli\n\nIs Deneyimi\nSatis Muduru, Acme\nTechnical Lead\n\nEgitim\nBogazici Universitesi\n\n"
+          "Sertifikalar\nPMP\n")
+    assert _bolumler(cv) == [
+        ("giris", "Ali Veli"), ("experience", "Is Deneyimi"), ("education", "Egitim"),
+        ("certifications", "Sertifikalar"),
+    ]
+
+
+@pytest.mark.parametrize("satir", [
+    "- Kariyer gelisimi programi kurdum", "Bilgisayar muhendisligi", "Teknik bilgi ve uzmanlik alanlari",
+    "Egitim 2015-2019", "deneyim@ornek.com", "• Beceriler",
+])
+def test_icerik_satiri_bolum_acmaz(satir):
+    cv = f"Ali Veli\n\n{satir}\nbir satir daha\n"
+    assert [b for b, _, _ in app.bolum_araliklari(cv)] == ["giris"]
+
+
+def test_bolum_araliklari_tum_metni_kapsar():
+    for cv, _ in korpus_uret(21, 20):
+        araliklar = app.bolum_araliklari(cv)
+        assert araliklar[0][1] == 0 and araliklar[-1][2] == len(cv)
+        assert all(a[2] == b[1] for a, b in zip(araliklar, araliklar[1:]))
+
+
+def test_vurgulu_cv_tahliye_edilen_html_depoya_geri_konur():
+    (cv, jd), = korpus_uret(5, 1)
+    eslesen, eksik = app.keyword_analizi(cv, jd)
+    depo = app.IcerikDeposu(max_bayt=10 ** 7)
+    sonuc = {"cv": depo.koy(cv), "jd": depo.koy(jd),
+             "listeler": depo.koy(json.dumps([sorted(eslesen), eksik, []]))}
+    app.render_vurgulu_cv(depo, sonuc, True)
+    html_h, _ = app._vurgulu_cv_hashi(depo, sonuc["cv"], sonuc["jd"], sonuc["listeler"])
+    depo._sil(html_h)
+    app.render_vurgulu_cv(depo, sonuc, True)
+    assert depo.al(html_h) == app.vurgulu_cv(cv, jd, depo.al(sonuc["listeler"]))[0]
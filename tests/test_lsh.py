@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+import app
+from benchmark.korpus import korpus_uret
+
+
+@pytest.fixture
+def indeks(monkeypatch):
+    yeni = app.LSHIndeksi()
+    monkeypatch.setattr(app, "lsh_indeksi", lambda: yeni)
+    return yeni
+
+
+@pytest.fixture(scope="module")
+def cv_jd():
+    return korpus_uret(3, 2)
+
+
+def test_sadece_birebir_cv_ilan_dil_tekrar_kullanilir(indeks, cv_jd):
+    (cv, jd), (_, baska_jd) = cv_jd
+    app.yakin_kopya_kaydet(cv, jd, "FEEDBACK", tr=True)
+
+    _, eslesme = app.yakin_kopya_bul(cv, jd, tr=True)
+    assert eslesme["ai_feedback"] == "FEEDBACK" and eslesme["ayni_ilan"]
+
+    # Ingilizce istek, baska ilan ya da degismis CV: isaret var, feedback yok
+    assert app.yakin_kopya_bul(cv, jd, tr=False)[1]["ai_feedback"] is None
+    _, eslesme = app.yakin_kopya_bul(cv, baska_jd, tr=True)
+    assert eslesme["ai_feedback"] is None and not eslesme["ayni_ilan"]
+    _, eslesme = app.yakin_kopya_bul(cv + "\nGonullu calisma", jd, tr=True)
+    assert eslesme is not None and eslesme["ai_feedback"] is None
+
+
+def _imza(rng):
+    return tuple(rng.randrange(1 << 60) for _ in range(app.MINHASH_PERM))
+
+
+def test_gunluk_yeniden_yukleme(tmp_path):
+    dosya = str(tmp_path / "lsh.jsonl")
+    rng = random.Random(1)
+    ix = app.LSHIndeksi(dosya=dosya, max_kayit=10)
+    imzalar = [_imza(rng) for _ in range(15)]
+    for i, imza in enumerate(imzalar):
+        ix.ekle(f"k{i}", imza, {"ai_feedback": f"f{i}"})
+    ix.ekle("k3", imzalar[3], {"ai_feedback": "yeni"})  # ayni kayit tekrar
+
+    yuklenen = app.LSHIndeksi(dosya=dosya, max_kayit=10)
+    assert list(yuklenen.kayitlar) == list(ix.kayitlar)
+    assert yuklenen.sorgula(imzalar[-1])[0][1] == "k14"
+    assert yuklenen.kayitlar["k3"]["veri"]["ai_feedback"] == "yeni"
+
+
+def test_yarim_satir_atlanir_ve_temizlenir(tmp_path):
+    dosya = tmp_path / "lsh.jsonl"
+    rng = random.Random(2)
+    ix = app.LSHIndeksi(dosya=str(dosya))
+    ix.ekle("a", _imza(rng), {})
+    with open(dosya, "a") as f:
+        f.write('{"id": "yarim", "imza": [1, 2')
+
+    yuklenen = app.LSHIndeksi(dosya=str(dosya))
+    assert list(yuklenen.kayitlar) == ["a"]
+    assert len(dosya.read_text().splitlines()) == 1
+
+
+def test_okunamayan_dosya_bos_indeksle_devam(tmp_path):
+    dosya = tmp_path / "lsh.jsonl"
+    dosya.write_bytes(bytes(range(256)) * 20)
+    ix = app.LSHIndeksi(dosya=str(dosya))
+    assert not ix.kayitlar
+    ix.ekle("b", _imza(random.Random(3)), {})
+    assert list(app.LSHIndeksi(dosya=str(dosya)).kayitlar) == ["b"]
@@ -0,0 +1,28 @@
+import json
+
+import app
+
+
+def _depo_ve_hashler():
+    depo = app.IcerikDeposu(max_bayt=10 ** 7)
+    ai_h = depo.koy("## Degerlendirme\niyi")
+    listeler_h = depo.koy(json.dumps([["python"], ["sql"], ["CV'de email adresi bulunamadi."]]))
+    return depo, ai_h, listeler_h
+
+
+def test_tahliye_edilen_html_depoya_geri_konur():
+    depo, ai_h, listeler_h = _depo_ve_hashler()
+    ilk = app.sonuc_html(depo, ai_h, listeler_h)
+    hashler, _ = app._sonuc_html_hashleri(depo, ai_h, listeler_h)
+    for h in hashler.values():
+        depo._sil(h)
+    assert app.sonuc_html(depo, ai_h, listeler_h) == ilk
+    assert all(depo.al(h) is not None for h in hashler.values())
+
+
+def test_kaynak_tahliye_edilince_bos_sonuc_onbellege_girmez():
+    depo, ai_h, listeler_h = _depo_ve_hashler()
+    depo._sil(ai_h)
+    assert app.sonuc_html(depo, ai_h, listeler_h)["feedback"].endswith("></div>")
+    depo.koy("## Degerlendirme\niyi")
+    assert "iyi" in app.sonuc_html(depo, ai_h, listeler_h)["feedback"]
@@ -0,0 +1,67 @@
+import json
+import shutil
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def kaynak(tmp_path):
+    yol = tmp_path / "anahtar_kelimeler.json"
+    shutil.copy(app.PAKET_KAYNAK, yol)
+    return yol
+
+
+def test_derlenmis_paket_kaynakla_ayni(kaynak):
+    hedef = app.paket_derle(str(kaynak))
+    paket = app.paket_yukle(hedef, app.kaynak_hash(str(kaynak)))
+    assert paket == app.paket_olustur(*app.paket_kaynagi_oku(str(kaynak)))
+
+
+def test_hash_uyusmazligi_ve_bozuk_paket(kaynak, tmp_path):
+    hedef = app.paket_derle(str(kaynak))
+    with pytest.raises(ValueError, match="Eski paket"):
+        app.paket_yukle(hedef, b"\0" * 20)
+    bozuk = tmp_path / "bozuk.paket"
+    veri = open(hedef, "rb").read()
+    bozuk.write_bytes(veri[:len(veri) // 2])
+    with pytest.raises(ValueError):
+        app.paket_yukle(str(bozuk))
+    bozuk.write_bytes(b"ATSPAKET" + b"x" * 40)
+    with pytest.raises(ValueError, match="Uyumsuz"):
+        app.paket_yukle(str(bozuk))
+
+
+def test_kaynak_degisince_yeniden_derlenir(kaynak):
+    depo = app.VeriPaketDeposu(str(kaynak), kontrol_araligi=0)
+    eski = depo.guncel()["kimlik"]
+    veri = json.loads(kaynak.read_text(encoding="utf-8"))
+    veri["surum"] = str(veri["surum"]) + "b"
+    kaynak.write_text(json.dumps(veri), encoding="utf-8")
+    assert depo.guncel()["kimlik"] != eski
+    assert depo.guncel()["surum"] == veri["surum"]
+
+
+def test_bozuk_derlenmis_paket_kaynaktan_kurulur(kaynak):
+    beklenen = app.paket_olustur(*app.paket_kaynagi_oku(str(kaynak)))
+    with open(app.paket_yolu(str(kaynak)), "wb") as f:
+        f.write(b"ATSPAKET" + b"\xff" * 40)
+    assert app.VeriPaketDeposu(str(kaynak)).guncel() == beklenen
+
+
+def test_bozuk_kaynakta_son_derlenmis_paket_kullanilir(kaynak):
+    beklenen = app.VeriPaketDeposu(str(kaynak)).guncel()
+    kaynak.write_text("{bozuk", encoding="utf-8")
+    depo = app.VeriPaketDeposu(str(kaynak))
+    assert depo.guncel() == beklenen
+
+
+def test_ikisi_de_bozuksa_eski_paketle_devam(kaynak):
+    depo = app.VeriPaketDeposu(str(kaynak), kontrol_araligi=0)
+    eski = depo.guncel()
+    kaynak.write_text("{bozuk", encoding="utf-8")
+    with open(app.paket_yolu(str(kaynak)), "wb") as f:
+        f.write(b"cop")
+    assert depo.guncel() is eski
+    assert depo.son_hata